@@ -9,3 +9,9 @@ This package provides:
 
 __version__ = "1.0.0"
 __author__ = "SMC Trading Engine Team"
+
+import logging
+
+# library logging stays silent unless the application configures handlers
+# (main.py does, via basicConfig); avoids "no handler" fallbacks on import
+logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -2,5 +2,6 @@
 
 from .backtester import Backtester
 from .metrics import calculate_metrics, MetricsResult
+from .parallel import run_many
 
-__all__ = ["Backtester", "calculate_metrics", "MetricsResult"]
+__all__ = ["Backtester", "calculate_metrics", "MetricsResult", "run_many"]
@@ -0,0 +1,313 @@
+"""
+Numba kernel for the bar-by-bar backtest simulation.
+
+The kernel mirrors the reference Python loop in ``Backtester`` exactly:
+exits are checked first (stop loss before take profit), then pending
+signals for the bar are entered, then equity is marked to the close.
+All state lives in flat NumPy arrays so the loop compiles to native code.
+Explicit signatures compile it eagerly at import (or load it from the
+on-disk cache) rather than on the first backtest of each process, and
+it releases the GIL so concurrent backtests on threads run in parallel.
+"""
+
+import numpy as np
+from numba import njit
+
+from ..core._kernels import _ro
+
+# side codes
+BUY = 0
+SELL = 1
+
+# exit reason codes
+EXIT_STOP_LOSS = 0
+EXIT_TAKE_PROFIT = 1
+EXIT_END_OF_DATA = 2
+
+EXIT_REASONS = ("stop_loss", "take_profit", "end_of_data")
+
+# column layout of the float trade buffer
+T_ENTRY_PRICE = 0
+T_EXIT_PRICE = 1
+T_SIZE = 2
+T_PNL = 3
+T_FEES = 4
+T_CUM_EQUITY = 5
+T_ENTRY_BALANCE = 6
+T_RISK_AMOUNT = 7
+T_RISK_PCT = 8
+T_MAX_DD = 9
+N_TRADE_FLOAT_COLS = 10
+
+# column layout of the int trade buffer
+T_SIGNAL = 0
+T_ENTRY_BAR = 1
+T_EXIT_BAR = 2
+T_REASON = 3
+N_TRADE_INT_COLS = 4
+
+
+@njit("float64(float64, int64, int8[:], float64[:], float64[:], float64)", cache=True, nogil=True)
+def _open_pnl(price, n_open, pos_side, pos_entry, pos_size, multiplier):
+    total = 0.0
+    for j in range(n_open):
+        if pos_side[j] == BUY:
+            total += (price - pos_entry[j]) * pos_size[j] * multiplier
+        else:
+            total += (pos_entry[j] - price) * pos_size[j] * multiplier
+    return total
+
+
+@njit(
+    "Tuple((float64[:], int64, int64[:, :], float64[:, :], int64, float64, boolean, int64, float64, float64))"
+    "({F}, {F}, {F}, {I},"
+    " {I}, {K}, {F}, {F}, {F},"
+    " {F},"
+    " float64, float64, float64, float64,"
+    " float64, int64, float64)".format(F=_ro("float64"), I=_ro("int64"), K=_ro("int8")),
+    cache=True, nogil=True,
+)
+def simulate(
+    high, low, close, day,
+    sig_bar, sig_side, sig_price, sig_stop, sig_tp,
+    slip_mult,
+    initial_balance, commission, slippage, half_spread,
+    position_size, max_positions, multiplier,
+):
+    """
+    Run the simulation over contiguous OHLC arrays.
+
+    Signals must be sorted by ``sig_bar`` (stable, so same-bar signals keep
+    their original order). ``slip_mult`` holds one pre-drawn slippage
+    multiplier per simulated fill, consumed in order. ``day`` is the
+    calendar day number of each bar; the last equity of each day feeds a
+    streaming (Welford) accumulator of daily returns.
+
+    Returns:
+        (equity, n_bars, trade_int, trade_float, n_trades, balance, depleted,
+         ret_count, ret_mean, ret_m2)
+    """
+    n = close.shape[0]
+    n_sig = sig_bar.shape[0]
+
+    equity = np.empty(n, dtype=np.float64)
+    trade_int = np.empty((n_sig, N_TRADE_INT_COLS), dtype=np.int64)
+    trade_float = np.empty((n_sig, N_TRADE_FLOAT_COLS), dtype=np.float64)
+
+    pos_sig = np.empty(max_positions, dtype=np.int64)
+    pos_bar = np.empty(max_positions, dtype=np.int64)
+    pos_side = np.empty(max_positions, dtype=np.int8)
+    pos_entry = np.empty(max_positions, dtype=np.float64)
+    pos_size = np.empty(max_positions, dtype=np.float64)
+    pos_stop = np.empty(max_positions, dtype=np.float64)
+    pos_tp = np.empty(max_positions, dtype=np.float64)
+    pos_comm = np.empty(max_positions, dtype=np.float64)
+    pos_risk = np.empty(max_positions, dtype=np.float64)
+    pos_risk_pct = np.empty(max_positions, dtype=np.float64)
+    n_open = 0
+
+    balance = initial_balance
+    n_trades = 0
+    n_bars = 0
+    slip_ptr = 0
+    sig_ptr = 0
+    depleted = False
+
+    # running drawdown over the equity points recorded so far
+    eq_peak = -np.inf
+    max_dd = 0.0
+
+    # daily return accumulators
+    ret_count = 0
+    ret_mean = 0.0
+    ret_m2 = 0.0
+    day_close = 0.0
+    have_close = False
+
+    for i in range(n):
+        # ---- exits first ----
+        j = 0
+        while j < n_open:
+            reason = -1
+            if pos_side[j] == BUY and low[i] <= pos_stop[j]:
+                reason = EXIT_STOP_LOSS
+            elif pos_side[j] == SELL and high[i] >= pos_stop[j]:
+                reason = EXIT_STOP_LOSS
+            elif pos_side[j] == BUY and high[i] >= pos_tp[j]:
+                reason = EXIT_TAKE_PROFIT
+            elif pos_side[j] == SELL and low[i] <= pos_tp[j]:
+                reason = EXIT_TAKE_PROFIT
+
+            if reason < 0:
+                j += 1
+                continue
+
+            entry_balance = balance + _open_pnl(close[i], n_open, pos_side, pos_entry, pos_size, multiplier)
+            exit_price = pos_stop[j] if reason == EXIT_STOP_LOSS else pos_tp[j]
+            if pos_side[j] == BUY:
+                pnl = (exit_price - pos_entry[j]) * pos_size[j] * multiplier
+            else:
+                pnl = (pos_entry[j] - exit_price) * pos_size[j] * multiplier
+            exit_commission = commission * exit_price * pos_size[j]
+            pnl -= exit_commission
+            balance += pnl
+
+            trade_int[n_trades, T_SIGNAL] = pos_sig[j]
+            trade_int[n_trades, T_ENTRY_BAR] = pos_bar[j]
+            trade_int[n_trades, T_EXIT_BAR] = i
+            trade_int[n_trades, T_REASON] = reason
+            trade_float[n_trades, T_ENTRY_PRICE] = pos_entry[j]
+            trade_float[n_trades, T_EXIT_PRICE] = exit_price
+            trade_float[n_trades, T_SIZE] = pos_size[j]
+            trade_float[n_trades, T_PNL] = pnl
+            trade_float[n_trades, T_FEES] = pos_comm[j] + exit_commission
+            trade_float[n_trades, T_CUM_EQUITY] = balance
+            trade_float[n_trades, T_ENTRY_BALANCE] = entry_balance
+            trade_float[n_trades, T_RISK_AMOUNT] = pos_risk[j]
+            trade_float[n_trades, T_RISK_PCT] = pos_risk_pct[j]
+            trade_float[n_trades, T_MAX_DD] = abs(max_dd)
+            n_trades += 1
+
+            # drop slot j, keeping entry order
+            for k in range(j, n_open - 1):
+                pos_sig[k] = pos_sig[k + 1]
+                pos_bar[k] = pos_bar[k + 1]
+                pos_side[k] = pos_side[k + 1]
+                pos_entry[k] = pos_entry[k + 1]
+                pos_size[k] = pos_size[k + 1]
+                pos_stop[k] = pos_stop[k + 1]
+                pos_tp[k] = pos_tp[k + 1]
+                pos_comm[k] = pos_comm[k + 1]
+                pos_risk[k] = pos_risk[k + 1]
+                pos_risk_pct[k] = pos_risk_pct[k + 1]
+            n_open -= 1
+
+        # ---- entries ----
+        while sig_ptr < n_sig and sig_bar[sig_ptr] < i:
+            sig_ptr += 1
+        while sig_ptr < n_sig and sig_bar[sig_ptr] == i:
+            s = sig_ptr
+            sig_ptr += 1
+            if n_open >= max_positions:
+                continue
+
+            side = sig_side[s]
+            slip = slippage * slip_mult[slip_ptr]
+            slip_ptr += 1
+            if side == BUY:
+                fill_price = sig_price[s] + slip + half_spread
+            else:
+                fill_price = sig_price[s] - slip - half_spread
+
+            stop_distance = abs(fill_price - sig_stop[s])
+            if stop_distance <= 0:
+                continue
+
+            if position_size <= 1.0:
+                risk_amount = balance * position_size
+                risk_per_unit = stop_distance * multiplier
+                if risk_per_unit <= 0:
+                    continue
+                size = risk_amount / risk_per_unit
+            else:
+                size = position_size
+                risk_amount = stop_distance * size * multiplier
+
+            if not np.isfinite(size) or size <= 0:
+                continue
+
+            commission_cost = commission * fill_price * size
+            balance -= commission_cost
+
+            pos_sig[n_open] = s
+            pos_bar[n_open] = i
+            pos_side[n_open] = side
+            pos_entry[n_open] = fill_price
+            pos_size[n_open] = size
+            pos_stop[n_open] = sig_stop[s]
+            pos_tp[n_open] = sig_tp[s]
+            pos_comm[n_open] = commission_cost
+            pos_risk[n_open] = risk_amount
+            pos_risk_pct[n_open] = (risk_amount / max(balance, 1e-12)) if balance > 0 else 0.0
+            n_open += 1
+
+        # ---- mark to market ----
+        eq = balance + _open_pnl(close[i], n_open, pos_side, pos_entry, pos_size, multiplier)
+        equity[i] = eq
+        n_bars = i + 1
+        if eq > eq_peak:
+            eq_peak = eq
+        if eq - eq_peak < max_dd:
+            max_dd = eq - eq_peak
+
+        # previous bar closed its calendar day
+        if i > 0 and day[i] != day[i - 1]:
+            if have_close:
+                r = equity[i - 1] / day_close - 1.0
+                ret_count += 1
+                delta = r - ret_mean
+                ret_mean += delta / ret_count
+                ret_m2 += delta * (r - ret_mean)
+            day_close = equity[i - 1]
+            have_close = True
+
+        if balance <= 0 or eq <= 0:
+            depleted = True
+            break
+
+    # the last simulated bar closes the final (possibly partial) day
+    if n_bars > 0 and have_close:
+        r = equity[n_bars - 1] / day_close - 1.0
+        ret_count += 1
+        delta = r - ret_mean
+        ret_mean += delta / ret_count
+        ret_m2 += delta * (r - ret_mean)
+
+    # ---- force close everything on the final bar ----
+    if n > 0:
+        last = n - 1
+        while n_open > 0:
+            entry_balance = balance + _open_pnl(close[last], n_open, pos_side, pos_entry, pos_size, multiplier)
+            slip = slippage * slip_mult[slip_ptr]
+            slip_ptr += 1
+            if pos_side[0] == BUY:
+                exit_price = close[last] - slip - half_spread
+                pnl = (exit_price - pos_entry[0]) * pos_size[0] * multiplier
+            else:
+                exit_price = close[last] + slip + half_spread
+                pnl = (pos_entry[0] - exit_price) * pos_size[0] * multiplier
+            exit_commission = commission * exit_price * pos_size[0]
+            pnl -= exit_commission
+            balance += pnl
+
+            trade_int[n_trades, T_SIGNAL] = pos_sig[0]
+            trade_int[n_trades, T_ENTRY_BAR] = pos_bar[0]
+            trade_int[n_trades, T_EXIT_BAR] = last
+            trade_int[n_trades, T_REASON] = EXIT_END_OF_DATA
+            trade_float[n_trades, T_ENTRY_PRICE] = pos_entry[0]
+            trade_float[n_trades, T_EXIT_PRICE] = exit_price
+            trade_float[n_trades, T_SIZE] = pos_size[0]
+            trade_float[n_trades, T_PNL] = pnl
+            trade_float[n_trades, T_FEES] = pos_comm[0] + exit_commission
+            trade_float[n_trades, T_CUM_EQUITY] = balance
+            trade_float[n_trades, T_ENTRY_BALANCE] = entry_balance
+            trade_float[n_trades, T_RISK_AMOUNT] = pos_risk[0]
+            trade_float[n_trades, T_RISK_PCT] = pos_risk_pct[0]
+            trade_float[n_trades, T_MAX_DD] = abs(max_dd)
+            n_trades += 1
+
+            for k in range(n_open - 1):
+                pos_sig[k] = pos_sig[k + 1]
+                pos_bar[k] = pos_bar[k + 1]
+                pos_side[k] = pos_side[k + 1]
+                pos_entry[k] = pos_entry[k + 1]
+                pos_size[k] = pos_size[k + 1]
+                pos_stop[k] = pos_stop[k + 1]
+                pos_tp[k] = pos_tp[k + 1]
+                pos_comm[k] = pos_comm[k + 1]
+                pos_risk[k] = pos_risk[k + 1]
+                pos_risk_pct[k] = pos_risk_pct[k + 1]
+            n_open -= 1
+
+    return (equity, n_bars, trade_int, trade_float, n_trades, balance, depleted,
+            ret_count, ret_mean, ret_m2)
@@ -2,15 +2,19 @@
 Backtesting engine with realistic order simulation.
 """
 
+import copy
+import math
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict
+from array import array
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass
 import logging
 
 from ..core.strategy import Strategy
 from .simulator import OrderSimulator
-from .metrics import calculate_metrics, MetricsResult
+from . import _core
+from .metrics import calculate_metrics, MetricsResult, ReturnStats
 
 logger = logging.getLogger(__name__)
 
@@ -38,13 +42,122 @@ class Trade:
     max_drawdown_at_exit: float = 0.0
 
     def to_dict(self) -> dict:
-        """Convert to dictionary."""
-        d = asdict(self)
-        d['entry_ts'] = str(self.entry_ts)
-        d['exit_ts'] = str(self.exit_ts)
+        """Convert to dictionary (shallow: ``meta`` is shared with the trade)."""
+        return {
+            'index': self.index,
+            'entry_ts': str(self.entry_ts),
+            'exit_ts': str(self.exit_ts),
+            'side': self.side,
+            'entry_price': self.entry_price,
+            'exit_price': self.exit_price,
+            'size': self.size,
+            'pnl': self.pnl,
+            'fees': self.fees,
+            'cum_equity': self.cum_equity,
+            'exit_reason': self.exit_reason,
+            'meta': self.meta,
+            'entry_balance': self.entry_balance,
+            'exit_balance': self.exit_balance,
+            'risk_amount': self.risk_amount,
+            'risk_pct': self.risk_pct,
+            'max_drawdown_at_exit': self.max_drawdown_at_exit
+        }
+
+    def to_json_dict(self) -> dict:
+        """Convert to dictionary with an independent deep copy of ``meta``, for serialization."""
+        d = self.to_dict()
+        d['meta'] = copy.deepcopy(self.meta)
         return d
 
 
+class OpenPositions:
+    """
+    Open positions stored as parallel arrays (struct of arrays).
+
+    Slots ``[0, n_open)`` are live and kept in entry order. Numeric fields
+    live in fixed-size arrays sized to ``max_positions``, so exit checks
+    and open PnL are array expressions instead of per-dict lookups; entry
+    timestamps and signal meta stay in plain lists aligned with the slots.
+    """
+
+    def __init__(self, capacity: int):
+        capacity = max(int(capacity), 0)
+        self.n_open = 0
+        self.side = np.empty(capacity, dtype=np.int8)
+        self.entry_price = np.empty(capacity, dtype=np.float64)
+        self.size = np.empty(capacity, dtype=np.float64)
+        self.stop = np.empty(capacity, dtype=np.float64)
+        self.tp = np.empty(capacity, dtype=np.float64)
+        self.commission = np.empty(capacity, dtype=np.float64)
+        self.multiplier = np.empty(capacity, dtype=np.float64)
+        self.risk_amount = np.empty(capacity, dtype=np.float64)
+        self.risk_pct = np.empty(capacity, dtype=np.float64)
+        self.entry_ts: List[pd.Timestamp] = []
+        self.meta: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return self.n_open
+
+    def _columns(self):
+        return (self.side, self.entry_price, self.size, self.stop, self.tp,
+                self.commission, self.multiplier, self.risk_amount, self.risk_pct)
+
+    def add(
+        self,
+        side: int,
+        entry_ts: pd.Timestamp,
+        entry_price: float,
+        size: float,
+        stop: float,
+        tp: float,
+        commission: float,
+        multiplier: float,
+        risk_amount: float,
+        risk_pct: float,
+        meta: Dict[str, Any]
+    ):
+        j = self.n_open
+        self.side[j] = side
+        self.entry_price[j] = entry_price
+        self.size[j] = size
+        self.stop[j] = stop
+        self.tp[j] = tp
+        self.commission[j] = commission
+        self.multiplier[j] = multiplier
+        self.risk_amount[j] = risk_amount
+        self.risk_pct[j] = risk_pct
+        self.entry_ts.append(entry_ts)
+        self.meta.append(meta)
+        self.n_open += 1
+
+    def remove(self, j: int):
+        """Drop slot ``j``, shifting later slots down to keep entry order."""
+        n = self.n_open
+        for col in self._columns():
+            col[j:n - 1] = col[j + 1:n]
+        del self.entry_ts[j]
+        del self.meta[j]
+        self.n_open -= 1
+
+    def open_pnl(self, price: float) -> float:
+        n = self.n_open
+        if n == 0:
+            return 0.0
+        entry = self.entry_price[:n]
+        move = np.where(self.side[:n] == _core.BUY, price - entry, entry - price)
+        pnl = move * self.size[:n] * self.multiplier[:n]
+        # accumulate left to right, matching the compiled kernel bit for bit
+        return float(np.cumsum(pnl)[-1])
+
+    def exit_reasons(self, high: float, low: float) -> np.ndarray:
+        """Exit reason code per live slot (-1 = stays open); stop loss wins over take profit."""
+        n = self.n_open
+        is_buy = self.side[:n] == _core.BUY
+        hit_stop = np.where(is_buy, low <= self.stop[:n], high >= self.stop[:n])
+        hit_tp = np.where(is_buy, high >= self.tp[:n], low <= self.tp[:n])
+        return np.where(hit_stop, _core.EXIT_STOP_LOSS, np.where(hit_tp, _core.EXIT_TAKE_PROFIT, -1))
+
+
 class Backtester:
     """
     Backtesting engine for trading strategies.
@@ -54,7 +167,10 @@ class Backtester:
     - Position sizing based on risk fraction (if position_size <= 1.0)
     - Stop loss and take profit management
     - Per-trade and aggregate metrics
-    - Equity curve tracking
+    - Equity curve tracking (stored as float32; ``use_float32=False`` keeps
+      float64 for exact audit runs)
+    - Numba-compiled simulation loop (``use_numba=False`` runs the
+      pure-Python reference loop instead)
     """
 
     def __init__(
@@ -66,7 +182,10 @@ class Backtester:
         spread: float = 0.0002,
         position_size: float = 0.01,
         max_positions: int = 1,
-        instrument_multiplier: float = 100000.0
+        instrument_multiplier: float = 100000.0,
+        use_numba: bool = True,
+        use_float32: bool = True,
+        rng: Optional[np.random.Generator] = None
     ):
         self.strategy = strategy
         self.initial_balance = float(initial_balance)
@@ -76,14 +195,33 @@ class Backtester:
         self.position_size = float(position_size)
         self.max_positions = int(max_positions)
         self.instrument_multiplier = float(instrument_multiplier)
+        self.use_numba = bool(use_numba)
+        self.use_float32 = bool(use_float32)
+        # balances are always simulated in float64; only the stored curve is downcast
+        self._equity_dtype = np.float32 if self.use_float32 else np.float64
 
-        self.simulator = OrderSimulator(commission, slippage, spread)
+        self.simulator = OrderSimulator(commission, slippage, spread, rng=rng)
+
+        # sizing mode is fixed per instance, so bind the specialised sizer once;
+        # non-finite sizes take the checked fractional path and are rejected there
+        if self.position_size <= 1.0 or not math.isfinite(self.position_size):
+            self._size_position = self._size_fractional
+        else:
+            self._size_position = self._size_fixed
 
         self.balance = float(initial_balance)
         self.equity = float(initial_balance)
         self.trades: List[Trade] = []
-        self.open_positions: List[Dict[str, Any]] = []
-        self.equity_curve_points: List[Dict[str, Any]] = []
+        # metric inputs kept as flat columns alongside self.trades
+        self._trade_pnl = array("d")
+        self._trade_exit_ts: List[pd.Timestamp] = []
+        self.open_positions = OpenPositions(self.max_positions)
+        self._equity = np.empty(0, dtype=np.float64)
+        # running drawdown state, updated wherever an equity point is recorded
+        self._equity_running_max = -np.inf
+        self._max_drawdown_so_far = 0.0
+        # daily returns streamed from the simulation, for Sharpe
+        self._daily_returns = ReturnStats()
 
     # ------------------------------------------------------------
     # Main backtest loop
@@ -97,55 +235,198 @@ class Backtester:
 
         self.balance = self.initial_balance
         self.trades = []
-        self.open_positions = []
-        self.equity_curve_points = []
+        self._trade_pnl = array("d")
+        self._trade_exit_ts = []
+        self.open_positions = OpenPositions(self.max_positions)
+        self._equity_running_max = -np.inf
+        self._max_drawdown_so_far = 0.0
+        self._daily_returns = ReturnStats()
+
+        if self.use_numba and isinstance(signals, pd.DataFrame):
+            equity_df = self._run_kernel(ohlc, signals)
+        else:
+            equity_df = self._run_python(ohlc, signals)
+
+        equity_series = equity_df["equity"] if "equity" in equity_df else pd.Series(dtype=float)
+        metrics = self._calculate_metrics(ohlc, equity_series, self._daily_returns)
+
+        return {"trades": self.trades, "metrics": metrics, "equity_curve": equity_df}
 
-        signals_by_ts = {}
+    def _run_kernel(self, ohlc: pd.DataFrame, signals: pd.DataFrame) -> pd.DataFrame:
+        """Compiled simulation path; see ``_core.simulate``."""
+        index = ohlc.index
+        bar_idx, order = self._resolve_signal_bars(index, signals)
+
+        side_codes = signals["signal"].map({"buy": _core.BUY, "sell": _core.SELL}).to_numpy()[order]
+        if pd.isna(side_codes).any():
+            raise ValueError("Invalid order side: must be 'buy' or 'sell'")
+        side_codes = side_codes.astype(np.int8)
+
+        (equity, n_run, trade_int, trade_float, n_trades, balance, depleted,
+         ret_count, ret_mean, ret_m2) = _core.simulate(
+            np.ascontiguousarray(ohlc["high"].to_numpy(dtype=np.float64)),
+            np.ascontiguousarray(ohlc["low"].to_numpy(dtype=np.float64)),
+            np.ascontiguousarray(ohlc["close"].to_numpy(dtype=np.float64)),
+            self._bar_days(index),
+            bar_idx[order],
+            side_codes,
+            signals["price"].to_numpy(dtype=np.float64)[order],
+            signals["stop"].to_numpy(dtype=np.float64)[order],
+            signals["tp"].to_numpy(dtype=np.float64)[order],
+            self.simulator.slippage_multipliers(len(order) + self.max_positions),
+            float(self.initial_balance),
+            float(self.simulator.commission),
+            float(self.simulator.slippage),
+            float(self.simulator._half_spread),
+            float(self.position_size),
+            int(self.max_positions),
+            float(self.instrument_multiplier),
+        )
+
+        if depleted:
+            logger.warning("Account depleted — ending early.")
+        self._daily_returns = ReturnStats(count=ret_count, mean=ret_mean, m2=ret_m2)
+
+        # unpack the trade buffers into Python scalars once, not row by row
+        trade_int = trade_int[:n_trades]
+        entry_ts = index[trade_int[:, _core.T_ENTRY_BAR]]
+        exit_ts = index[trade_int[:, _core.T_EXIT_BAR]]
+        metas = signals["meta"].tolist() if "meta" in signals else None
+        sides = ("buy", "sell")
+        side_list = side_codes.tolist()
+        order_list = order.tolist()
+        for k, ((sig_k, _, _, reason), floats) in enumerate(
+            zip(trade_int.tolist(), trade_float[:n_trades].tolist())
+        ):
+            row = order_list[sig_k]
+            (entry_price, exit_price, size, pnl, fees, cum_equity,
+             entry_balance, risk_amount, risk_pct, max_dd) = floats
+            self.trades.append(Trade(
+                index=k,
+                entry_ts=entry_ts[k],
+                exit_ts=exit_ts[k],
+                side=sides[side_list[sig_k]],
+                entry_price=entry_price,
+                exit_price=exit_price,
+                size=size,
+                pnl=pnl,
+                fees=fees,
+                cum_equity=cum_equity,
+                exit_reason=_core.EXIT_REASONS[reason],
+                meta=metas[row] if metas is not None else {},
+                entry_balance=entry_balance,
+                exit_balance=cum_equity,
+                risk_amount=risk_amount,
+                risk_pct=risk_pct,
+                max_drawdown_at_exit=max_dd
+            ))
+        self._trade_pnl.extend(trade_float[:n_trades, _core.T_PNL])
+        self._trade_exit_ts.extend(exit_ts)
+
+        self.balance = float(balance)
+        if n_run > 0:
+            self.equity = float(equity[n_run - 1])
+        equity = equity[:n_run].astype(self._equity_dtype, copy=False)
+        return pd.DataFrame({"equity": equity}, index=index[:n_run].rename("time"))
+
+    @staticmethod
+    def _bar_days(index: pd.Index) -> np.ndarray:
+        """Calendar day number of each bar in the index's own timezone (zeros if not datetime)."""
+        if not isinstance(index, pd.DatetimeIndex):
+            return np.zeros(len(index), dtype=np.int64)
+        local = index.tz_localize(None) if index.tz is not None else index
+        return local.values.astype("datetime64[D]").astype(np.int64)
+
+    @staticmethod
+    def _resolve_signal_bars(index: pd.Index, signals: pd.DataFrame):
+        """
+        Resolve every signal to the bar it fires on (exact timestamp matches only).
+
+        Returns ``(bar_idx, order)``: the bar of each signal, and the positions
+        of matched signals sorted by bar (stable, so same-bar signals keep
+        their original order).
+        """
+        signal_ts = pd.to_datetime(signals["ts"])
+        bar_idx = np.asarray(index.searchsorted(signal_ts), dtype=np.int64)
+        in_range = bar_idx < len(index)
+        matched = np.zeros(len(signals), dtype=bool)
+        matched[in_range] = index.values[bar_idx[in_range]] == signal_ts.values[in_range]
+        order = np.flatnonzero(matched)
+        order = order[np.argsort(bar_idx[order], kind="stable")]
+        return bar_idx, order
+
+    def _run_python(self, ohlc: pd.DataFrame, signals: pd.DataFrame) -> pd.DataFrame:
+        """Reference bar-by-bar loop, kept for audit runs (``use_numba=False``)."""
+        # signals sorted by bar index, consumed through a pointer as the loop advances;
+        # plain dict records avoid a Series per row
+        sig_bars: List[int] = []
+        sig_records: List[Dict[str, Any]] = []
         if isinstance(signals, pd.DataFrame):
-            for _, row in signals.iterrows():
-                ts = pd.to_datetime(row["ts"])
-                signals_by_ts.setdefault(ts, []).append(row)
+            bar_idx, order = self._resolve_signal_bars(ohlc.index, signals)
+            records = signals.to_dict("records")
+            sig_bars = bar_idx[order].tolist()
+            sig_records = [records[k] for k in order]
+        n_sig = len(sig_bars)
+        p = 0
+
+        # hoist OHLC columns out of pandas once; the loop only indexes arrays
+        highs = ohlc["high"].to_numpy(dtype=np.float64)
+        lows = ohlc["low"].to_numpy(dtype=np.float64)
+        closes = ohlc["close"].to_numpy(dtype=np.float64)
+        index = ohlc.index
+        days = self._bar_days(index).tolist()
+
+        # equity is written by bar index into a preallocated buffer
+        self._equity = np.empty(len(ohlc), dtype=self._equity_dtype)
+        n_run = 0
+        prev_equity = self.equity
 
         for i in range(len(ohlc)):
-            bar = ohlc.iloc[i]
-            ts = ohlc.index[i]
+            ts = index[i]
+            close = float(closes[i])
 
             # exits first
-            self._check_exits(bar, ts)
+            self._check_exits(highs[i], lows[i], close, ts)
 
             # entries
-            if len(self.open_positions) < self.max_positions:
-                if pd.to_datetime(ts) in signals_by_ts:
-                    for row in signals_by_ts[pd.to_datetime(ts)]:
-                        if len(self.open_positions) >= self.max_positions:
-                            break
-                        self._enter_position(row, bar, ts)
+            while p < n_sig and sig_bars[p] == i:
+                if len(self.open_positions) < self.max_positions:
+                    self._enter_position(sig_records[p], ts)
+                p += 1
 
             # update equity
-            self.equity = self.balance + self._calculate_open_pnl(bar)
-            self.equity_curve_points.append({"time": ts, "equity": self.equity})
+            self.equity = self.balance + self._calculate_open_pnl(close)
+            self._equity[i] = self.equity
+            n_run = i + 1
+            self._equity_running_max = max(self._equity_running_max, self.equity)
+            self._max_drawdown_so_far = min(self._max_drawdown_so_far, self.equity - self._equity_running_max)
+
+            # previous bar closed its calendar day
+            if i > 0 and days[i] != days[i - 1]:
+                self._daily_returns.push_close(prev_equity)
+            prev_equity = self.equity
 
             if self.balance <= 0 or self.equity <= 0:
                 logger.warning("Account depleted — ending early.")
                 break
 
+        # the last simulated bar closes the final (possibly partial) day
+        if n_run > 0 and self._daily_returns.last_close is not None:
+            self._daily_returns.push_close(prev_equity)
+
         # force close all
         if self.open_positions:
-            final_bar = ohlc.iloc[-1]
-            final_ts = ohlc.index[-1]
-            for pos in self.open_positions[:]:
-                self._exit_position(pos, final_bar, final_ts, "end_of_data")
-
-        equity_df = pd.DataFrame(self.equity_curve_points).set_index("time")
-        equity_series = equity_df["equity"] if "equity" in equity_df else pd.Series(dtype=float)
-        metrics = self._calculate_metrics(ohlc, equity_series)
+            final_close = closes[-1]
+            final_ts = index[-1]
+            while self.open_positions:
+                self._exit_position(0, final_close, final_ts, "end_of_data")
 
-        return {"trades": self.trades, "metrics": metrics, "equity_curve": equity_df}
+        return pd.DataFrame({"equity": self._equity[:n_run]}, index=ohlc.index[:n_run].rename("time"))
 
     # ------------------------------------------------------------
     # Position management
     # ------------------------------------------------------------
-    def _enter_position(self, signal: pd.Series, bar: pd.Series, ts: pd.Timestamp):
+    def _enter_position(self, signal: Dict[str, Any], ts: pd.Timestamp):
         side = signal["signal"]
         entry_price = float(signal["price"])
         stop_loss = float(signal["stop"])
@@ -159,69 +440,71 @@ class Backtester:
         if stop_distance <= 0:
             return
 
-        if self.position_size <= 1.0:
-            risk_amount = self.balance * self.position_size
-            risk_per_unit = stop_distance * self.instrument_multiplier
-            if risk_per_unit <= 0:
-                return
-            size = risk_amount / risk_per_unit
-        else:
-            size = float(self.position_size)
-            risk_amount = stop_distance * size * self.instrument_multiplier
-
-        if not np.isfinite(size) or size <= 0:
+        sized = self._size_position(stop_distance)
+        if sized is None:
             return
+        size, risk_amount = sized
 
         commission_cost = self.simulator.calculate_commission(fill_price, size)
         self.balance -= commission_cost
 
-        position = {
-            "side": side,
-            "entry_ts": ts,
-            "entry_price": fill_price,
-            "size": size,
-            "stop": stop_loss,
-            "tp": take_profit,
-            "commission": commission_cost,
-            "meta": meta,
-            "instrument_multiplier": self.instrument_multiplier,
-            "risk_amount": risk_amount,
-            "risk_pct": (risk_amount / max(self.balance, 1e-12)) if self.balance > 0 else 0.0
-        }
-
-        self.open_positions.append(position)
+        self.open_positions.add(
+            side=_core.BUY if side == "buy" else _core.SELL,
+            entry_ts=ts,
+            entry_price=fill_price,
+            size=size,
+            stop=stop_loss,
+            tp=take_profit,
+            commission=commission_cost,
+            multiplier=self.instrument_multiplier,
+            risk_amount=risk_amount,
+            risk_pct=(risk_amount / max(self.balance, 1e-12)) if self.balance > 0 else 0.0,
+            meta=meta
+        )
 
-    def _exit_position(self, position: Dict[str, Any], bar: pd.Series, ts: pd.Timestamp, reason: str):
-        side = position["side"]
-        entry_price = position["entry_price"]
-        size = float(position["size"])
-        entry_ts = position["entry_ts"]
-        entry_balance = float(self.balance + self._calculate_open_pnl(bar))
+    def _size_fractional(self, stop_distance: float) -> Optional[Tuple[float, float]]:
+        """Risk a fraction of balance: size so that hitting the stop loses ``position_size * balance``."""
+        risk_amount = self.balance * self.position_size
+        risk_per_unit = stop_distance * self.instrument_multiplier
+        if risk_per_unit <= 0:
+            return None
+        size = risk_amount / risk_per_unit
+        if not math.isfinite(size) or size <= 0:
+            return None
+        return size, risk_amount
+
+    def _size_fixed(self, stop_distance: float) -> Optional[Tuple[float, float]]:
+        """Trade a fixed ``position_size`` units (validated once in ``__init__``)."""
+        return self.position_size, stop_distance * self.position_size * self.instrument_multiplier
+
+    def _exit_position(self, slot: int, close: float, ts: pd.Timestamp, reason: str):
+        positions = self.open_positions
+        side = "buy" if positions.side[slot] == _core.BUY else "sell"
+        entry_price = float(positions.entry_price[slot])
+        size = float(positions.size[slot])
+        entry_ts = positions.entry_ts[slot]
+        entry_balance = float(self.balance + self._calculate_open_pnl(close))
 
         if reason == "stop_loss":
-            exit_price = float(position["stop"])
+            exit_price = float(positions.stop[slot])
         elif reason == "take_profit":
-            exit_price = float(position["tp"])
+            exit_price = float(positions.tp[slot])
         else:
-            exit_price = self.simulator.simulate_fill("sell" if side == "buy" else "buy", float(bar["close"]))
+            exit_price = self.simulator.simulate_fill("sell" if side == "buy" else "buy", float(close))
 
+        multiplier = float(positions.multiplier[slot])
         if side == "buy":
-            pnl = (exit_price - entry_price) * size * position.get("instrument_multiplier", self.instrument_multiplier)
+            pnl = (exit_price - entry_price) * size * multiplier
         else:
-            pnl = (entry_price - exit_price) * size * position.get("instrument_multiplier", self.instrument_multiplier)
+            pnl = (entry_price - exit_price) * size * multiplier
 
         exit_commission = self.simulator.calculate_commission(exit_price, size)
         pnl -= exit_commission
 
         self.balance += pnl
-        total_fees = position.get("commission", 0.0) + exit_commission
+        total_fees = float(positions.commission[slot]) + exit_commission
 
-        max_dd_at_exit = 0.0
-        if self.equity_curve_points:
-            es = pd.Series([p["equity"] for p in self.equity_curve_points], index=[p["time"] for p in self.equity_curve_points])
-            running_max = es.cummax()
-            dd = es - running_max
-            max_dd_at_exit = float(dd.min()) if len(dd) > 0 else 0.0
+        max_dd_at_exit = self._max_drawdown_so_far
 
         trade = Trade(
             index=len(self.trades),
@@ -235,50 +518,45 @@ class Backtester:
             fees=float(total_fees),
             cum_equity=float(self.balance),
             exit_reason=reason,
-            meta=position.get("meta", {}),
-            entry_balance=float(position.get("entry_balance", entry_balance)),
+            meta=positions.meta[slot],
+            entry_balance=entry_balance,
             exit_balance=float(self.balance),
-            risk_amount=float(position.get("risk_amount", 0.0)),
-            risk_pct=float(position.get("risk_pct", 0.0)),
+            risk_amount=float(positions.risk_amount[slot]),
+            risk_pct=float(positions.risk_pct[slot]),
             max_drawdown_at_exit=abs(max_dd_at_exit)
         )
 
         self.trades.append(trade)
-        try:
-            self.open_positions.remove(position)
-        except ValueError:
-            pass
+        self._trade_pnl.append(trade.pnl)
+        self._trade_exit_ts.append(ts)
+        positions.remove(slot)
 
     # ------------------------------------------------------------
     # Supporting methods
     # ------------------------------------------------------------
-    def _check_exits(self, bar: pd.Series, ts: pd.Timestamp):
-        for pos in self.open_positions[:]:
-            side = pos["side"]
-            if side == "buy" and bar["low"] <= pos["stop"]:
-                self._exit_position(pos, bar, ts, "stop_loss")
-            elif side == "sell" and bar["high"] >= pos["stop"]:
-                self._exit_position(pos, bar, ts, "stop_loss")
-            elif side == "buy" and bar["high"] >= pos["tp"]:
-                self._exit_position(pos, bar, ts, "take_profit")
-            elif side == "sell" and bar["low"] <= pos["tp"]:
-                self._exit_position(pos, bar, ts, "take_profit")
-
-    def _calculate_open_pnl(self, bar: pd.Series) -> float:
-        total_pnl = 0.0
-        for pos in self.open_positions:
-            current_price = float(bar["close"])
-            entry_price = pos["entry_price"]
-            size = float(pos["size"])
-            multiplier = pos.get("instrument_multiplier", self.instrument_multiplier)
-            if pos["side"] == "buy":
-                pnl = (current_price - entry_price) * size * multiplier
-            else:
-                pnl = (entry_price - current_price) * size * multiplier
-            total_pnl += pnl
-        return float(total_pnl)
-
-    def _calculate_metrics(self, ohlc: pd.DataFrame, equity_series: pd.Series) -> MetricsResult:
+    def _check_exits(self, high: float, low: float, close: float, ts: pd.Timestamp):
+        if not self.open_positions:
+            return
+        reasons = self.open_positions.exit_reasons(high, low)
+        hits = np.flatnonzero(reasons >= 0)
+        # only the (usually few) hit slots are finalized one by one; slots shift
+        # down as earlier ones close, so offset by the exits so far
+        for closed, slot in enumerate(hits.tolist()):
+            reason = _core.EXIT_REASONS[reasons[slot]]
+            self._exit_position(slot - closed, close, ts, reason)
+
+    def _calculate_open_pnl(self, close: float) -> float:
+        # most bars have nothing open
+        if not self.open_positions:
+            return 0.0
+        return self.open_positions.open_pnl(close)
+
+    def _calculate_metrics(
+        self,
+        ohlc: pd.DataFrame,
+        equity_series: pd.Series,
+        daily_returns: Optional[ReturnStats] = None
+    ) -> MetricsResult:
         if not self.trades:
             return MetricsResult(
                 net_profit=0.0, total_return_pct=0.0,
@@ -290,13 +568,16 @@ class Backtester:
                 largest_loss=0.0, monthly_returns=[], final_equity=self.balance
             )
 
-        trades_df = pd.DataFrame([t.to_dict() for t in self.trades])
+        trades_df = pd.DataFrame({
+            "pnl": np.array(self._trade_pnl, dtype=np.float64),
+            "exit_ts": pd.to_datetime(self._trade_exit_ts),
+        })
         if isinstance(equity_series, pd.Series) and not equity_series.empty:
             es = equity_series
         else:
             es = pd.Series([t.cum_equity for t in self.trades], index=[pd.to_datetime(t.exit_ts) for t in self.trades])
 
-        return calculate_metrics(trades_df, es, self.initial_balance)
+        return calculate_metrics(trades_df, es, self.initial_balance, daily_returns)
 
     def _empty_result(self) -> Dict[str, Any]:
         return {
@@ -5,7 +5,7 @@ Performance metrics calculation.
 import pandas as pd
 import numpy as np
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional
 
 
 @dataclass
@@ -54,10 +54,42 @@ class MetricsResult:
         }
 
 
+@dataclass
+class ReturnStats:
+    """
+    Streaming mean/variance of period-over-period returns (Welford's algorithm).
+
+    Fed one closing equity per period, so Sharpe can be computed during a
+    simulation without keeping or resampling the equity curve.
+    """
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    last_close: Optional[float] = None
+
+    def push_close(self, equity: float):
+        """Record a period's closing equity and fold in its return."""
+        if self.last_close is not None:
+            r = equity / self.last_close - 1.0
+            self.count += 1
+            delta = r - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (r - self.mean)
+        self.last_close = equity
+
+    def sharpe(self, periods_per_year: int = 252) -> float:
+        """Annualized Sharpe ratio (sample std); 0.0 with fewer than two returns."""
+        if self.count < 2:
+            return 0.0
+        std = np.sqrt(self.m2 / (self.count - 1))
+        return float(self.mean / std * np.sqrt(periods_per_year)) if std > 0 else 0.0
+
+
 def calculate_metrics(
     trades_df: pd.DataFrame,
     equity_series: pd.Series,
-    initial_balance: float
+    initial_balance: float,
+    daily_returns: Optional[ReturnStats] = None
 ) -> MetricsResult:
     """
     Calculate comprehensive performance metrics.
@@ -66,6 +98,9 @@ def calculate_metrics(
         trades_df: DataFrame with trade data. Expected columns include 'pnl', 'exit_ts' (timestamp).
         equity_series: Series indexed by timestamp with equity values over time (monotonic time index).
         initial_balance: Starting balance
+        daily_returns: Daily return statistics accumulated during the simulation. When it
+            holds at least one return, Sharpe is taken from it instead of resampling
+            equity_series to daily closes.
 
     Returns:
         MetricsResult with all metrics
@@ -100,33 +135,35 @@ def calculate_metrics(
             final_equity=final_equity
         )
 
-    # Ensure exit_ts is datetime
-    if 'exit_ts' in trades_df.columns:
-        trades_df = trades_df.copy()
-        trades_df['exit_ts'] = pd.to_datetime(trades_df['exit_ts'])
-
-    # Basic trade counts
+    # Trade statistics from the pnl column as one float array; wins / losses
+    # are boolean masks over it (zero-pnl trades count as neither)
     total_trades = int(len(trades_df))
-    wins = trades_df[trades_df['pnl'] > 0]['pnl'] if 'pnl' in trades_df.columns else pd.Series(dtype=float)
-    losses = trades_df[trades_df['pnl'] < 0]['pnl'] if 'pnl' in trades_df.columns else pd.Series(dtype=float)
-    winning_trades = int(len(wins))
-    losing_trades = int(len(losses))
+    has_pnl = 'pnl' in trades_df.columns
+    pnl = trades_df['pnl'].to_numpy(dtype=np.float64) if has_pnl else np.empty(0)
+    wins = pnl[pnl > 0]
+    losses = pnl[pnl < 0]
+    winning_trades = int(wins.size)
+    losing_trades = int(losses.size)
     win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0.0
 
-    # P&L metrics
-    net_profit = float(trades_df['pnl'].sum()) if 'pnl' in trades_df.columns else final_equity - initial_balance
+    # P&L metrics (NaN pnl values are skipped, as pandas reductions do)
+    valid_pnl = pnl[~np.isnan(pnl)]
+    net_profit = float(valid_pnl.sum()) if has_pnl else final_equity - initial_balance
     total_return_pct = ((final_equity - initial_balance) / initial_balance * 100) if initial_balance != 0 else 0.0
 
-    avg_win = float(wins.mean()) if not wins.empty else 0.0
-    avg_loss = float(losses.mean()) if not losses.empty else 0.0
-    largest_win = float(wins.max()) if not wins.empty else 0.0
-    largest_loss = float(losses.min()) if not losses.empty else 0.0
+    avg_win = float(wins.mean()) if wins.size else 0.0
+    avg_loss = float(losses.mean()) if losses.size else 0.0
+    largest_win = float(wins.max()) if wins.size else 0.0
+    largest_loss = float(losses.min()) if losses.size else 0.0
 
-    gross_profit = float(wins.sum()) if not wins.empty else 0.0
-    gross_loss = float(abs(losses.sum())) if not losses.empty else 0.0
+    gross_profit = float(wins.sum())
+    gross_loss = float(abs(losses.sum()))
     profit_factor = (gross_profit / gross_loss) if gross_loss > 0 else (np.inf if gross_profit > 0 else 0.0)
 
-    expectancy = float(trades_df['pnl'].mean()) if 'pnl' in trades_df.columns and total_trades > 0 else 0.0
+    if has_pnl and total_trades > 0:
+        expectancy = float(valid_pnl.mean()) if valid_pnl.size else float('nan')
+    else:
+        expectancy = 0.0
 
     # Drawdown (using equity_series if available)
     max_drawdown_abs = 0.0
@@ -135,43 +172,59 @@ def calculate_metrics(
     calmar_ratio = 0.0
 
     if equity_series is not None and len(equity_series) > 0:
-        es = pd.Series(equity_series).astype(float)
+        es = pd.Series(equity_series)
+        # float32 curves (Backtester default) stay float32 through drawdown/resample
+        if es.dtype != np.float32:
+            es = es.astype(float)
         es.index = pd.to_datetime(es.index)
-        running_max = es.cummax()
-        drawdown = es - running_max
+        values = es.to_numpy()
+        running_max = np.maximum.accumulate(values)
+        drawdown = values - running_max
         max_drawdown_abs = float(drawdown.min()) if len(drawdown) > 0 else 0.0
-        peak_val = running_max.max() if len(running_max) > 0 else initial_balance
+        peak_val = running_max[-1] if len(running_max) > 0 else initial_balance
         max_drawdown_pct = (abs(max_drawdown_abs) / peak_val * 100) if peak_val != 0 else 0.0
 
-        # Compute returns for Sharpe: prefer daily returns if we have intraday series
-        # Resample to daily last equity
-        try:
-            daily = es.resample('D').last().dropna()
-            if len(daily) >= 2:
-                daily_ret = daily.pct_change().dropna()
-                if daily_ret.std() > 0:
-                    sharpe_ratio = float((daily_ret.mean() / daily_ret.std()) * np.sqrt(252))
-                else:
-                    sharpe_ratio = 0.0
-            else:
-                # Fallback to using series percent change
-                ret = es.pct_change().dropna()
-                if len(ret) > 1 and ret.std() > 0:
-                    sharpe_ratio = float((ret.mean() / ret.std()) * np.sqrt(252))
+        # Compute returns for Sharpe: prefer daily returns if we have intraday series.
+        # Use the stats streamed by the simulation when given, else resample to daily last equity
+        if daily_returns is not None and daily_returns.count > 0:
+            sharpe_ratio = daily_returns.sharpe()
+        else:
+            try:
+                daily = es.resample('D').last().dropna()
+                if len(daily) >= 2:
+                    daily_ret = daily.pct_change().dropna()
+                    if daily_ret.std() > 0:
+                        sharpe_ratio = float((daily_ret.mean() / daily_ret.std()) * np.sqrt(252))
+                    else:
+                        sharpe_ratio = 0.0
                 else:
-                    sharpe_ratio = 0.0
-        except Exception:
-            sharpe_ratio = 0.0
+                    # Fallback to using series percent change
+                    ret = es.pct_change().dropna()
+                    if len(ret) > 1 and ret.std() > 0:
+                        sharpe_ratio = float((ret.mean() / ret.std()) * np.sqrt(252))
+                    else:
+                        sharpe_ratio = 0.0
+            except Exception:
+                sharpe_ratio = 0.0
 
     # Calmar ratio: annualized return / max drawdown %
     calmar_ratio = (total_return_pct / max_drawdown_pct) if max_drawdown_pct != 0 else 0.0
 
     # Monthly returns (based on trades exits)
     monthly_returns = []
-    if 'exit_ts' in trades_df.columns and 'pnl' in trades_df.columns:
-        trades_df['month'] = trades_df['exit_ts'].dt.to_period('M')
-        monthly_pnl = trades_df.groupby('month')['pnl'].sum()
-        monthly_returns = ((monthly_pnl / initial_balance) * 100).tolist()
+    if 'exit_ts' in trades_df.columns and has_pnl:
+        # month ids from local wall time (as to_period would), summed with bincount
+        exit_ts = pd.to_datetime(trades_df['exit_ts'])
+        if exit_ts.dt.tz is not None:
+            exit_ts = exit_ts.dt.tz_localize(None)
+        valid = exit_ts.notna().to_numpy()
+        if valid.any():
+            months = exit_ts.to_numpy()[valid].astype('datetime64[M]').astype(np.int64)
+            month_ids = months - months.min()
+            sums = np.bincount(month_ids, weights=np.nan_to_num(pnl[valid]))
+            # keep only months that had exits, like the groupby it replaces
+            sums = sums[np.bincount(month_ids) > 0]
+            monthly_returns = (sums / initial_balance * 100).tolist()
 
     return MetricsResult(
         net_profit=net_profit,
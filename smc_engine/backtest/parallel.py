@@ -0,0 +1,146 @@
+"""
+Parallel backtests over a parameter grid.
+
+Backtests for different parameter sets are independent, so a sweep fans
+out across worker processes. The numeric OHLC columns are copied into a
+single shared-memory block once, one contiguous row per column; each
+worker maps it into a DataFrame at start-up instead of unpickling the
+frame for every task, and its columns are zero-copy views of the block.
+The strategy factory and backtester settings are also handed over once,
+so a task carries only its parameter set.
+"""
+
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Dict, Any, List, Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..core.strategy import Strategy
+from .backtester import Backtester
+from .metrics import MetricsResult
+
+logger = logging.getLogger(__name__)
+
+# per-worker state, set once by _init_worker
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+_worker_ohlc: Optional[pd.DataFrame] = None
+_worker_factory: Optional[Callable[[Dict[str, Any]], Strategy]] = None
+_worker_kwargs: Dict[str, Any] = {}
+
+
+def _init_worker(
+    shm_name: str,
+    shape: tuple,
+    columns: List[str],
+    dtypes: Dict[str, Any],
+    index: pd.Index,
+    strategy_factory: Callable[[Dict[str, Any]], Strategy],
+    backtester_kwargs: Dict[str, Any]
+):
+    """Attach to the shared OHLC block, rebuild the frame over it and keep the run settings."""
+    global _worker_shm, _worker_ohlc, _worker_factory, _worker_kwargs
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+
+    block = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    block.flags.writeable = False
+    # column-per-row views stay contiguous, so kernels read them uncopied
+    frame = pd.DataFrame(dict(zip(columns, block)), index=index, copy=False)
+
+    _worker_shm = shm
+    _worker_ohlc = frame.astype(dtypes, copy=False)
+    _worker_factory = strategy_factory
+    _worker_kwargs = backtester_kwargs
+
+
+def _run_one(
+    strategy_factory: Callable[[Dict[str, Any]], Strategy],
+    params: Dict[str, Any],
+    backtester_kwargs: Dict[str, Any],
+    ohlc: pd.DataFrame
+) -> Optional[MetricsResult]:
+    try:
+        backtester = Backtester(strategy=strategy_factory(params), **backtester_kwargs)
+        return backtester.run(ohlc)["metrics"]
+    except Exception as e:
+        logger.error(f"Error running backtest for {params}: {e}")
+        return None
+
+
+def _run_task(params: Dict[str, Any]) -> Optional[MetricsResult]:
+    """Worker task: backtest one parameter set with the state from _init_worker."""
+    return _run_one(_worker_factory, params, _worker_kwargs, _worker_ohlc)
+
+
+def run_many(
+    strategy_factory: Callable[[Dict[str, Any]], Strategy],
+    param_grid: List[Dict[str, Any]],
+    ohlc: pd.DataFrame,
+    max_workers: Optional[int] = None,
+    **backtester_kwargs
+) -> List[Optional[MetricsResult]]:
+    """
+    Backtest every parameter set in ``param_grid`` across worker processes.
+
+    Args:
+        strategy_factory: Picklable callable building a strategy from params
+            (typically the strategy class itself)
+        param_grid: Parameter sets to evaluate
+        ohlc: Historical data shared by every run
+        max_workers: Worker processes (default: os.cpu_count())
+        **backtester_kwargs: Passed through to ``Backtester``
+
+    Returns:
+        MetricsResult per parameter set, in ``param_grid`` order; None where
+        the backtest raised
+    """
+    param_grid = list(param_grid)
+    results: List[Optional[MetricsResult]] = [None] * len(param_grid)
+    if not param_grid:
+        return results
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1 or len(param_grid) == 1:
+        for i, params in enumerate(param_grid):
+            results[i] = _run_one(strategy_factory, params, backtester_kwargs, ohlc)
+        return results
+
+    numeric = ohlc.select_dtypes(include=[np.number])
+    dropped = [c for c in ohlc.columns if c not in numeric.columns]
+    if dropped:
+        logger.warning(f"run_many: non-numeric columns are not shared with workers: {dropped}")
+
+    shape = (numeric.shape[1], numeric.shape[0])
+    shm = shared_memory.SharedMemory(create=True, size=max(numeric.size, 1) * np.dtype(np.float64).itemsize)
+    block = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    try:
+        for row, name in zip(block, numeric.columns):
+            row[:] = numeric[name].to_numpy(dtype=np.float64)
+
+        initargs = (
+            shm.name, shape, list(numeric.columns), numeric.dtypes.to_dict(), ohlc.index,
+            strategy_factory, backtester_kwargs
+        )
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(param_grid)),
+            initializer=_init_worker,
+            initargs=initargs
+        ) as executor:
+            futures = {
+                executor.submit(_run_task, params): i
+                for i, params in enumerate(param_grid)
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                results[futures[future]] = future.result()
+                if done % 10 == 0:
+                    logger.info(f"Completed {done}/{len(param_grid)} backtests")
+    finally:
+        del block
+        shm.close()
+        shm.unlink()
+
+    return results
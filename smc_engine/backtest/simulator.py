@@ -2,8 +2,9 @@
 Order execution simulator with realistic market conditions.
 """
 
-from typing import Literal
-import random
+from typing import Literal, Optional
+
+import numpy as np
 
 
 class OrderSimulator:
@@ -12,13 +13,19 @@ class OrderSimulator:
     - Slippage (price impact)
     - Bid-ask spread
     - Commission per trade
+
+    Random slippage multipliers come from a NumPy Generator, drawn in
+    batches into a buffer and consumed in order; pass a seeded ``rng``
+    for reproducible fills.
     """
 
     def __init__(
         self,
         commission: float = 0.0001,  # e.g. 0.01% per trade
         slippage: float = 0.0001,    # average slippage fraction
-        spread: float = 0.0002       # bid/ask spread fraction
+        spread: float = 0.0002,      # bid/ask spread fraction
+        rng: Optional[np.random.Generator] = None,
+        buffer_size: int = 1024
     ):
         """
         Initialize order simulator.
@@ -27,17 +34,34 @@ class OrderSimulator:
             commission: Commission rate per trade (fraction of trade value)
             slippage: Average slippage fraction (e.g., 0.0001 = 0.01%)
             spread: Average bid-ask spread fraction (e.g., 0.0002 = 0.02%)
+            rng: Random generator for slippage noise (default: fresh, unseeded)
+            buffer_size: Number of slippage multipliers drawn per refill
         """
         self.commission = commission
         self.slippage = slippage
         self.spread = spread
         self._half_spread = spread / 2  # precompute for small optimization
 
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self._buffer_size = max(int(buffer_size), 1)
+        self._slip_buf = np.empty(0, dtype=np.float64)
+        self._slip_pos = 0
+
+    def _next_multiplier(self) -> float:
+        """Next slippage multiplier from the buffer, refilling it when exhausted."""
+        if self._slip_pos >= len(self._slip_buf):
+            self._slip_buf = self.rng.uniform(0.5, 1.5, size=self._buffer_size)
+            self._slip_pos = 0
+        mult = self._slip_buf[self._slip_pos]
+        self._slip_pos += 1
+        return float(mult)
+
     def simulate_fill(
         self,
         side: Literal["buy", "sell"],
         price: float,
-        add_randomness: bool = True
+        add_randomness: bool = True,
+        slip_mult: Optional[float] = None
     ) -> float:
         """
         Simulate order fill price given slippage and spread.
@@ -46,6 +70,8 @@ class OrderSimulator:
             side: "buy" or "sell"
             price: Mid-market price at time of order
             add_randomness: Whether to randomize slippage slightly
+            slip_mult: Explicit slippage multiplier; when omitted (and
+                add_randomness is set) the next buffered draw is used
 
         Returns:
             Simulated fill price (realistic executed price)
@@ -54,8 +80,10 @@ class OrderSimulator:
         slippage = self.slippage
 
         # Optional random variation (simulate market noise)
-        if add_randomness:
-            slippage *= random.uniform(0.5, 1.5)
+        if slip_mult is not None:
+            slippage *= slip_mult
+        elif add_randomness:
+            slippage *= self._next_multiplier()
 
         # Apply directionally-correct slippage and spread
         if side == "buy":
@@ -69,6 +97,29 @@ class OrderSimulator:
 
         return fill_price
 
+    def slippage_multipliers(self, n: int, add_randomness: bool = True) -> np.ndarray:
+        """
+        Pre-draw slippage multipliers for ``n`` fills.
+
+        Used by the compiled backtest kernel, which cannot draw random
+        numbers itself. Buffered draws are consumed first, so the values
+        continue the same stream ``simulate_fill`` reads from.
+
+        Args:
+            n: Number of fills to draw for
+            add_randomness: If False, every multiplier is 1.0
+
+        Returns:
+            Array of multipliers in [0.5, 1.5)
+        """
+        if not add_randomness:
+            return np.ones(n, dtype=np.float64)
+        buffered = self._slip_buf[self._slip_pos:self._slip_pos + n]
+        self._slip_pos += len(buffered)
+        if len(buffered) == n:
+            return buffered.copy()
+        return np.concatenate([buffered, self.rng.uniform(0.5, 1.5, size=n - len(buffered))])
+
     def calculate_commission(self, price: float, size: float) -> float:
         """
         Calculate commission based on notional trade value.
@@ -23,6 +23,9 @@ class Settings(BaseSettings):
         default="sqlite:///./smc_trading.db",
         description="Database connection URL"
     )
+    db_pool_size: int = Field(default=32, description="Pooled DB connections kept open (server databases)")
+    db_max_overflow: int = Field(default=32, description="Extra DB connections allowed beyond the pool")
+    db_pool_recycle: int = Field(default=1800, description="Seconds before a pooled DB connection is replaced")
     
     # MetaTrader5
     mt5_login: Optional[int] = Field(default=None, description="MT5 account login")
@@ -35,6 +38,19 @@ class Settings(BaseSettings):
     max_open_trades: int = Field(default=3, description="Maximum concurrent open trades")
     max_trade_risk_pct: float = Field(default=2.0, description="Maximum risk per trade")
     
+    # Live trading loop
+    live_trade_event_driven: bool = Field(
+        default=True,
+        description="Wake the live loop on each new bar instead of polling"
+    )
+    live_trade_poll_interval: int = Field(default=30, description="Seconds between polls when not event-driven")
+    
+    # Market data
+    parquet_cache_dir: Optional[str] = Field(
+        default=None,
+        description="Directory for parquet copies of parsed CSVs (unset: no cache)"
+    )
+    
     # Logging
     log_level: str = Field(default="INFO", description="Logging level")
     log_file: str = Field(default="logs/smc_engine.log", description="Log file path")
@@ -5,9 +5,13 @@ from .smc_primitives import (
     MarketStructure,
     OrderBlock,
     FairValueGap,
+    OrderBlockArray,
+    FairValueGapArray,
     detect_market_structure,
     find_order_blocks,
+    find_order_block_arrays,
     find_fvg,
+    find_fvg_arrays,
     is_bos,
     detect_choch,
     detect_liquidity_grab
@@ -19,9 +23,13 @@ __all__ = [
     "MarketStructure",
     "OrderBlock",
     "FairValueGap",
+    "OrderBlockArray",
+    "FairValueGapArray",
     "detect_market_structure",
     "find_order_blocks",
+    "find_order_block_arrays",
     "find_fvg",
+    "find_fvg_arrays",
     "is_bos",
     "detect_choch",
     "detect_liquidity_grab"
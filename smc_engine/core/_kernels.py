@@ -0,0 +1,273 @@
+"""
+Numba kernels behind the SMC primitive detectors.
+
+Each kernel takes plain float OHLC/ATR arrays and returns flat result
+arrays; the wrappers in ``smc_primitives`` turn those rows into the
+public dataclasses.
+
+Kernels are declared with explicit signatures (float64 and float32
+prices), so they compile eagerly at import - or load from the on-disk
+cache, see ``NUMBA_CACHE_DIR`` - instead of on the first call in every
+fresh process. They release the GIL (``nogil``), so trials running on
+threads (e.g. Optuna with ``n_jobs``) compute in parallel.
+"""
+
+import numpy as np
+from numba import njit
+
+# price dtypes the kernels are compiled for
+_PRICE_TYPES = ("float64", "float32")
+
+
+def _ro(dtype: str) -> str:
+    """
+    Signature type of a 1-d input array. Declared read-only so the kernels
+    also accept read-only (e.g. memoized or shared-memory) data; writable
+    arrays convert to it implicitly.
+    """
+    return f"Array({dtype}, 1, 'A', readonly=True)"
+
+
+@njit(f"float64[:]({_ro('float64')}, {_ro('float64')}, {_ro('float64')}, float64)", cache=True, nogil=True)
+def atr_kernel(h, l, c, span):
+    """
+    True range and its EWM (``span``, adjust=False) in a single pass.
+
+    Mirrors ``pd.Series.ewm(span=span, adjust=False).mean()`` step for step,
+    including its NaN handling (a NaN range leaves the average unchanged but
+    still decays the weight of the previous value), so results are
+    bit-identical to the pandas path. The range skips NaN terms like
+    ``np.fmax``.
+    """
+    n = c.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    alpha = 1.0 / (1.0 + (span - 1.0) / 2.0)
+    decay = 1.0 - alpha
+
+    weighted = np.nan
+    old_wt = 1.0
+    prev_close = np.nan
+    for i in range(n):
+        tr = abs(h[i] - l[i])
+        for term in (abs(h[i] - prev_close), abs(l[i] - prev_close)):
+            # np.fmax semantics: NaN terms are skipped
+            if not np.isnan(term) and not term <= tr:
+                tr = term
+        prev_close = c[i]
+
+        if i == 0 or np.isnan(weighted):
+            weighted = tr
+        else:
+            old_wt *= decay
+            if not np.isnan(tr):
+                if weighted != tr:
+                    weighted = (old_wt * weighted + alpha * tr) / (old_wt + alpha)
+                old_wt = 1.0
+        out[i] = weighted
+
+    return out
+
+
+@njit(f"UniTuple(float64[:], 2)({_ro('float64')}, {_ro('float64')}, int64)", cache=True, nogil=True)
+def rolling_extrema_kernel(h, l, win):
+    """
+    Max of ``h`` and min of ``l`` over every full window of ``win`` bars.
+
+    Monotonic deques of bar positions give O(n) total work regardless of the
+    window length. As with ``np.max``, a window containing a NaN yields NaN.
+
+    Returns:
+        (win_high, win_low), one entry per window start (``n - win + 1``)
+    """
+    n = h.shape[0]
+    m = max(n - win + 1, 0)
+    win_high = np.empty(m, dtype=np.float64)
+    win_low = np.empty(m, dtype=np.float64)
+
+    # deque[head:tail] holds positions whose values decrease (highs) /
+    # increase (lows) from the front, so the front is the window extreme
+    dq_h = np.empty(n, dtype=np.int64)
+    dq_l = np.empty(n, dtype=np.int64)
+    head_h = tail_h = head_l = tail_l = 0
+    last_nan_h = last_nan_l = -1
+
+    for i in range(n):
+        x = h[i]
+        if np.isnan(x):
+            last_nan_h = i
+        else:
+            while tail_h > head_h and h[dq_h[tail_h - 1]] <= x:
+                tail_h -= 1
+            dq_h[tail_h] = i
+            tail_h += 1
+
+        x = l[i]
+        if np.isnan(x):
+            last_nan_l = i
+        else:
+            while tail_l > head_l and l[dq_l[tail_l - 1]] >= x:
+                tail_l -= 1
+            dq_l[tail_l] = i
+            tail_l += 1
+
+        start = i - win + 1
+        if start < 0:
+            continue
+        while head_h < tail_h and dq_h[head_h] < start:
+            head_h += 1
+        while head_l < tail_l and dq_l[head_l] < start:
+            head_l += 1
+        win_high[start] = np.nan if last_nan_h >= start else h[dq_h[head_h]]
+        win_low[start] = np.nan if last_nan_l >= start else l[dq_l[head_l]]
+
+    return win_high, win_low
+
+
+# order block type codes
+OB_BULLISH = 0
+OB_BEARISH = 1
+
+_OB_SIGNATURE = (
+    "Tuple((int8[:], int64[:], int64[:], float64[:], float64[:], float64[:], int64))"
+    "({F}, {F}, {F}, {F}, {B}, {F}, int64, int64, float64, float64, int64, boolean)"
+)
+
+
+@njit([_OB_SIGNATURE.format(F=_ro(f), B=_ro("boolean")) for f in _PRICE_TYPES], cache=True, nogil=True)
+def find_order_blocks_kernel(h, l, o, c, bull, atr, start, min_bars, min_atr_mult, expansion_mult, max_age, strict):
+    """
+    Scan for impulsive runs of ``min_bars`` same-direction candles and the
+    opposite candle that preceded them (the order block). ``bull`` flags
+    candles closing above their open.
+
+    Returns:
+        (kind, start_idx, end_idx, top, bottom, strength, count); only the
+        first ``count`` rows are filled
+    """
+    n = c.shape[0]
+    cap = max(n - min_bars - start, 0) * 2
+    kind = np.empty(cap, dtype=np.int8)
+    start_idx = np.empty(cap, dtype=np.int64)
+    end_idx = np.empty(cap, dtype=np.int64)
+    top = np.empty(cap, dtype=np.float64)
+    bottom = np.empty(cap, dtype=np.float64)
+    strength = np.empty(cap, dtype=np.float64)
+    count = 0
+
+    # most recent bullish / bearish candle strictly before bar i
+    last_bull = -1
+    last_bear = -1
+
+    # bullish candles in the run window [i, i + min_bars), kept rolling so
+    # each bar costs O(1) instead of a rescan of the window
+    n_bull = 0
+    for k in range(min(min_bars, n)):
+        if bull[k]:
+            n_bull += 1
+
+    for i in range(n - min_bars):
+        a = atr[i]
+        if i >= start and not np.isnan(a):
+            end = i + min_bars - 1
+            all_bull = n_bull == min_bars
+            all_bear = n_bull == 0
+
+            for side in range(2):
+                if side == OB_BULLISH:
+                    if not all_bull or not (h[end] - l[i]) >= min_atr_mult * a:
+                        continue
+                    ob = last_bear
+                else:
+                    if not all_bear or not (h[i] - l[end]) >= min_atr_mult * a:
+                        continue
+                    ob = last_bull
+                if ob < 0 or i - ob > max_age:
+                    continue
+
+                expansion = expansion_mult * a
+                if strict:
+                    top[count] = max(o[ob], c[ob]) + expansion
+                    bottom[count] = min(o[ob], c[ob]) - expansion
+                else:
+                    top[count] = h[ob] + expansion
+                    bottom[count] = l[ob] - expansion
+                kind[count] = side
+                start_idx[count] = ob
+                end_idx[count] = end
+                strength[count] = abs(c[end] - o[ob]) / a
+                count += 1
+
+        if bull[i]:
+            last_bull = i
+            n_bull -= 1
+        else:
+            last_bear = i
+        if bull[i + min_bars]:
+            n_bull += 1
+
+    return kind, start_idx, end_idx, top, bottom, strength, count
+
+
+# swing type codes
+SWING_HIGH = 0
+SWING_LOW = 1
+
+_LIQUIDITY_GRAB_SIGNATURE = (
+    "Tuple((int64[:], int64[:], int64[:], int64))"
+    "({F}, {F}, {F}, {F}, {I}, {F}, {K}, float64, int64, int64)"
+)
+
+
+@njit(
+    [_LIQUIDITY_GRAB_SIGNATURE.format(F=_ro(f), I=_ro("int64"), K=_ro("int8")) for f in _PRICE_TYPES],
+    cache=True, nogil=True,
+)
+def detect_liquidity_grab_kernel(h, l, c, atr, swing_idx, swing_price, swing_type, liq_mult, reclaim_bars, window):
+    """
+    For each swing, find bars within ``window`` bars after it that sweep
+    beyond the swing by ``liq_mult`` ATR and are reclaimed (close back
+    across the swing price) within ``reclaim_bars`` bars.
+
+    Returns:
+        (swing_row, grab_idx, reclaim, count); ``swing_row`` indexes the
+        input swing arrays and only the first ``count`` rows are filled
+    """
+    n = c.shape[0]
+    n_swings = swing_idx.shape[0]
+    cap = n_swings * window
+    swing_row = np.empty(cap, dtype=np.int64)
+    grab_idx = np.empty(cap, dtype=np.int64)
+    reclaim = np.empty(cap, dtype=np.int64)
+    count = 0
+
+    for s in range(n_swings):
+        price = swing_price[s]
+        start = swing_idx[s] + 1
+        end = min(start + window, n)
+        for i in range(start, end):
+            a = atr[i]
+            if np.isnan(a):
+                continue
+            thresh = liq_mult * a
+            last = min(i + reclaim_bars + 1, n)
+
+            if swing_type[s] == SWING_HIGH:
+                if h[i] > price + thresh:
+                    for j in range(i + 1, last):
+                        if c[j] < price:
+                            swing_row[count] = s
+                            grab_idx[count] = i
+                            reclaim[count] = j - i
+                            count += 1
+                            break
+            else:
+                if l[i] < price - thresh:
+                    for j in range(i + 1, last):
+                        if c[j] > price:
+                            swing_row[count] = s
+                            grab_idx[count] = i
+                            reclaim[count] = j - i
+                            count += 1
+                            break
+
+    return swing_row, grab_idx, reclaim, count
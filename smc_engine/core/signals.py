@@ -2,6 +2,7 @@
 Signal generation helpers and utilities.
 """
 
+import numpy as np
 import pandas as pd
 from typing import Dict, Any
 
@@ -25,19 +26,27 @@ def filter_signals(
     if signals.empty:
         return signals
     
-    # Filter by risk-reward
-    signals = signals.copy()
-    signals['risk'] = abs(signals['price'] - signals['stop'])
-    signals['reward'] = abs(signals['tp'] - signals['price'])
-    signals['rr_ratio'] = signals['reward'] / signals['risk']
+    # Filter by risk-reward in one pass over the raw arrays
+    price = signals['price'].to_numpy(dtype=float)
+    stop = signals['stop'].to_numpy(dtype=float)
+    tp = signals['tp'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rr_ratio = np.abs(tp - price) / np.abs(price - stop)
+    signals = signals.loc[rr_ratio >= min_risk_reward]
     
-    signals = signals[signals['rr_ratio'] >= min_risk_reward]
+    # Limit signals per day: rank each row within its day (keeping row order)
+    # with a stable sort, then mask by rank
+    day = pd.to_datetime(signals['ts']).dt.floor('D')
+    keys = day.values.view('i8')
+    n = len(keys)
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    positions = np.arange(n)
+    day_start = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]] if n else np.empty(0, dtype=bool)
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = positions - np.maximum.accumulate(np.where(day_start, positions, 0))
     
-    # Limit signals per day
-    signals['date'] = pd.to_datetime(signals['ts']).dt.date
-    signals = signals.groupby('date').head(max_signals_per_day)
-    
-    return signals.drop(columns=['risk', 'reward', 'rr_ratio', 'date'])
+    return signals[(rank < max_signals_per_day) & day.notna().to_numpy()]
 
 
 def combine_signals(
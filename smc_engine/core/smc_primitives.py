@@ -10,12 +10,23 @@ Core SMC detection algorithms:
 - Liquidity Grabs
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from typing import List, Literal, Optional, Union
 from enum import Enum
 import pandas as pd
 import numpy as np
 
+from ._kernels import (
+    OB_BULLISH,
+    OB_BEARISH,
+    SWING_HIGH,
+    SWING_LOW,
+    atr_kernel,
+    rolling_extrema_kernel,
+    find_order_blocks_kernel,
+    detect_liquidity_grab_kernel,
+)
+
 
 # ============================================================
 # ENUMS
@@ -36,7 +47,12 @@ class TrendDirection(Enum):
 # DATACLASSES
 # ============================================================
 
-@dataclass
+def _field_dict(obj) -> dict:
+    """Field name -> value for a slotted dataclass (no ``__dict__`` to copy)."""
+    return {f.name: getattr(obj, f.name) for f in fields(obj)}
+
+
+@dataclass(slots=True)
 class SwingPoint:
     index: int
     timestamp: pd.Timestamp
@@ -68,7 +84,7 @@ class MarketStructure:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderBlock:
     type: Literal["bullish", "bearish"]
     start_idx: int
@@ -80,13 +96,13 @@ class OrderBlock:
     strength: float
 
     def to_dict(self):
-        return vars(self) | {
+        return _field_dict(self) | {
             "start_ts": str(self.start_ts),
             "end_ts": str(self.end_ts),
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class FairValueGap:
     type: Literal["bullish", "bearish"]
     start_idx: int
@@ -98,12 +114,12 @@ class FairValueGap:
     size_pips: float
 
     def to_dict(self):
-        return vars(self) | {
+        return _field_dict(self) | {
             "start_ts": str(self.start_ts),
             "end_ts": str(self.end_ts),
         }
     
-@dataclass
+@dataclass(slots=True)
 class LiquidityGrab:
     type: Literal["bullish", "bearish"]
     swing_idx: int
@@ -118,68 +134,314 @@ class LiquidityGrab:
         return self.grab_idx
 
     def to_dict(self):
-        return vars(self) | {"timestamp": str(self.timestamp)}
+        return _field_dict(self) | {"timestamp": str(self.timestamp)}
 
 
+# ============================================================
+# ARRAY (SoA) CONTAINERS
+# ============================================================
+
+# direction codes used by the array containers
+BULLISH = OB_BULLISH
+BEARISH = OB_BEARISH
+
+
+def _direction(code: int) -> str:
+    return "bullish" if code == BULLISH else "bearish"
+
+
+def _row_dicts(record_type: type, *columns) -> List[dict]:
+    """Dicts keyed by ``record_type``'s fields, one per row of ``columns`` (given in field order)."""
+    names = [f.name for f in fields(record_type)]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+@dataclass(slots=True)
+class OrderBlockArray:
+    """
+    Order blocks as parallel arrays, one row per block in detection order.
+
+    Rows hold bar positions only; timestamps are looked up in ``index`` on
+    demand, so no Timestamp objects are built unless a caller asks.
+    """
+    kind: np.ndarray          # int8 BULLISH / BEARISH
+    start_idx: np.ndarray     # int64 bar positions
+    end_idx: np.ndarray
+    price_top: np.ndarray     # float64
+    price_bottom: np.ndarray
+    strength: np.ndarray
+    index: pd.Index           # the detected frame's index
+
+    @classmethod
+    def empty(cls, index: pd.Index) -> "OrderBlockArray":
+        i, f = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        return cls(np.empty(0, dtype=np.int8), i, i, f, f, f, index)
+
+    @property
+    def start_ts(self) -> pd.Index:
+        return self.index[self.start_idx]
+
+    @property
+    def end_ts(self) -> pd.Index:
+        return self.index[self.end_idx]
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def to_dataclasses(self) -> List[OrderBlock]:
+        return [
+            OrderBlock(_direction(k), s, e, s_ts, e_ts, t, b, st)
+            for k, s, e, s_ts, e_ts, t, b, st in zip(
+                self.kind.tolist(), self.start_idx.tolist(), self.end_idx.tolist(),
+                self.start_ts, self.end_ts, self.price_top.tolist(),
+                self.price_bottom.tolist(), self.strength.tolist(),
+            )
+        ]
+
+    def to_dicts(self) -> List[dict]:
+        """``OrderBlock.to_dict()`` of every row, without building the dataclasses."""
+        return _row_dicts(
+            OrderBlock,
+            map(_direction, self.kind.tolist()), self.start_idx.tolist(), self.end_idx.tolist(),
+            self.start_ts.map(str), self.end_ts.map(str), self.price_top.tolist(),
+            self.price_bottom.tolist(), self.strength.tolist(),
+        )
+
+
+@dataclass(slots=True)
+class FairValueGapArray:
+    """
+    Fair value gaps as parallel arrays, one row per gap in detection order.
+
+    Timestamps are looked up in ``index`` on demand.
+    """
+    kind: np.ndarray          # int8 BULLISH / BEARISH
+    start_idx: np.ndarray     # int64 bar positions
+    end_idx: np.ndarray
+    gap_top: np.ndarray       # float64
+    gap_bottom: np.ndarray
+    size_pips: np.ndarray
+    index: pd.Index           # the detected frame's index
+
+    @classmethod
+    def empty(cls, index: pd.Index) -> "FairValueGapArray":
+        i, f = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        return cls(np.empty(0, dtype=np.int8), i, i, f, f, f, index)
+
+    @property
+    def start_ts(self) -> pd.Index:
+        return self.index[self.start_idx]
+
+    @property
+    def end_ts(self) -> pd.Index:
+        return self.index[self.end_idx]
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def to_dataclasses(self) -> List[FairValueGap]:
+        return [
+            FairValueGap(_direction(k), s, e, s_ts, e_ts, t, b, size)
+            for k, s, e, s_ts, e_ts, t, b, size in zip(
+                self.kind.tolist(), self.start_idx.tolist(), self.end_idx.tolist(),
+                self.start_ts, self.end_ts, self.gap_top.tolist(),
+                self.gap_bottom.tolist(), self.size_pips.tolist(),
+            )
+        ]
+
+    def to_dicts(self) -> List[dict]:
+        """``FairValueGap.to_dict()`` of every row, without building the dataclasses."""
+        return _row_dicts(
+            FairValueGap,
+            map(_direction, self.kind.tolist()), self.start_idx.tolist(), self.end_idx.tolist(),
+            self.start_ts.map(str), self.end_ts.map(str), self.gap_top.tolist(),
+            self.gap_bottom.tolist(), self.size_pips.tolist(),
+        )
+
+
+@dataclass(slots=True)
+class LiquidityGrabArray:
+    """
+    Liquidity grabs as parallel arrays, one row per grab in detection order.
+
+    Timestamps are looked up in ``index`` on demand.
+    """
+    kind: np.ndarray          # int8 BULLISH / BEARISH
+    swing_idx: np.ndarray     # int64 bar positions
+    grab_idx: np.ndarray
+    swing_price: np.ndarray   # float64
+    grab_price: np.ndarray
+    reclaim_bars: np.ndarray  # int64
+    index: pd.Index           # the detected frame's index
+
+    @classmethod
+    def empty(cls, index: pd.Index) -> "LiquidityGrabArray":
+        i, f = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        return cls(np.empty(0, dtype=np.int8), i, i, f, f, i, index)
+
+    @property
+    def end_idx(self) -> np.ndarray:
+        return self.grab_idx
+
+    @property
+    def timestamp(self) -> pd.Index:
+        return self.index[self.grab_idx]
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def to_dataclasses(self) -> List[LiquidityGrab]:
+        return [
+            LiquidityGrab(_direction(k), s, g, ts, sp, gp, r)
+            for k, s, g, ts, sp, gp, r in zip(
+                self.kind.tolist(), self.swing_idx.tolist(), self.grab_idx.tolist(),
+                self.timestamp, self.swing_price.tolist(), self.grab_price.tolist(),
+                self.reclaim_bars.tolist(),
+            )
+        ]
+
+    def to_dicts(self) -> List[dict]:
+        """``LiquidityGrab.to_dict()`` of every row, without building the dataclasses."""
+        return _row_dicts(
+            LiquidityGrab,
+            map(_direction, self.kind.tolist()), self.swing_idx.tolist(), self.grab_idx.tolist(),
+            self.timestamp.map(str), self.swing_price.tolist(), self.grab_price.tolist(),
+            self.reclaim_bars.tolist(),
+        )
+
 
 # ============================================================
 # CORE UTILS
 # ============================================================
 
 def calculate_atr(ohlc: pd.DataFrame, period: int = 14) -> pd.Series:
-    """Vectorized Average True Range (ATR) calculation."""
-    high, low, close = ohlc["high"], ohlc["low"], ohlc["close"]
-    prev_close = close.shift()
-    tr = pd.concat([
-        (high - low).abs(),
-        (high - prev_close).abs(),
-        (low - prev_close).abs()
-    ], axis=1).max(axis=1)
-    return tr.ewm(span=period, adjust=False).mean()
+    """
+    Average True Range (ATR): EWM (span ``period``, adjust=False) of the
+    true range, computed in one fused pass; see ``_kernels.atr_kernel``.
+    """
+    atr = atr_kernel(
+        ohlc["high"].to_numpy(dtype=np.float64),
+        ohlc["low"].to_numpy(dtype=np.float64),
+        ohlc["close"].to_numpy(dtype=np.float64),
+        float(period),
+    )
+    return pd.Series(atr, index=ohlc.index)
+
+
+def _atr_array(ohlc: pd.DataFrame, period: int, atr: Optional[np.ndarray] = None) -> np.ndarray:
+    """ATR as a float64 array, reusing ``atr`` when the caller already has it."""
+    if atr is None:
+        return calculate_atr(ohlc, period).to_numpy(dtype=np.float64)
+    return np.asarray(atr, dtype=np.float64)
+
+
+def _working_dtype(use_float32: bool) -> type:
+    """
+    Dtype of the price arrays fed to the detection scans.
+
+    float32 halves the bytes streamed per bar and still resolves FX ticks
+    (1e-5) at prices well above 1e2, but values near a threshold can land
+    on the other side of it, so detections are not guaranteed identical to
+    float64.
+    """
+    return np.float32 if use_float32 else np.float64
 
 
 # ============================================================
 # MARKET STRUCTURE
 # ============================================================
 
+def _find_swing_positions(highs: np.ndarray, lows: np.ndarray, lookback: int):
+    """
+    Positions of swing highs/lows: bars that are the extreme of the centred
+    ``2 * lookback + 1`` window and strictly beyond both neighbours.
+    """
+    n = len(highs)
+    win = lookback * 2 + 1
+    centre = slice(lookback, n - lookback)
+
+    # centred window extrema, one row per bar that has a full window
+    win_high, win_low = rolling_extrema_kernel(
+        np.asarray(highs, dtype=np.float64), np.asarray(lows, dtype=np.float64), win
+    )
+
+    if lookback > 0:
+        prev_h, next_h = highs[lookback - 1:n - lookback - 1], highs[lookback + 1:n - lookback + 1]
+        prev_l, next_l = lows[lookback - 1:n - lookback - 1], lows[lookback + 1:n - lookback + 1]
+    else:
+        # one-bar windows reach the series ends, where neighbours wrap around
+        prev_h, next_h = np.roll(highs, 1), np.roll(highs, -1)
+        prev_l, next_l = np.roll(lows, 1), np.roll(lows, -1)
+
+    core_h, core_l = highs[centre], lows[centre]
+    is_high = (core_h == win_high) & (core_h > prev_h) & (core_h > next_h)
+    is_low = (core_l == win_low) & (core_l < prev_l) & (core_l < next_l)
+    return np.flatnonzero(is_high) + lookback, np.flatnonzero(is_low) + lookback
+
+
+# trend by classify_trend code + 2
+_TREND_BY_CODE = (
+    TrendDirection.BEARISH,
+    TrendDirection.RANGING,
+    TrendDirection.RANGING,
+    TrendDirection.RANGING,
+    TrendDirection.BULLISH,
+)
+
+
+def classify_trend(last_high: float, prev_high: float, last_low: float, prev_low: float) -> TrendDirection:
+    """
+    Trend from the last two swing highs and lows.
+
+    Each leg scores +1 (higher), -1 (lower) or 0, so HH + HL sums to +2
+    (bullish), LH + LL to -2 (bearish) and anything else is ranging.
+    """
+    code = (
+        int(last_high > prev_high) - int(last_high < prev_high)
+        + int(last_low > prev_low) - int(last_low < prev_low)
+    )
+    return _TREND_BY_CODE[code + 2]
+
+
 def detect_market_structure(ohlc: pd.DataFrame, lookback: int = 10) -> MarketStructure:
     """Detect swing points and trend direction."""
     if len(ohlc) < lookback * 2 + 1:
         return MarketStructure([], TrendDirection.RANGING, None, None)
 
     highs, lows = ohlc["high"].values, ohlc["low"].values
-    swings: List[SwingPoint] = []
-
-    # Rolling extrema
-    rolling_high = pd.Series(highs).rolling(lookback * 2 + 1, center=True).max()
-    rolling_low = pd.Series(lows).rolling(lookback * 2 + 1, center=True).min()
 
-    swing_highs = np.where((highs == rolling_high) & (highs > np.roll(highs, 1)) & (highs > np.roll(highs, -1)))[0]
-    swing_lows = np.where((lows == rolling_low) & (lows < np.roll(lows, 1)) & (lows < np.roll(lows, -1)))[0]
+    swing_highs, swing_lows = _find_swing_positions(highs, lows, lookback)
 
-    for i in swing_highs:
-        swings.append(SwingPoint(i, ohlc.index[i], highs[i], SwingType.HIGH))
-    for i in swing_lows:
-        swings.append(SwingPoint(i, ohlc.index[i], lows[i], SwingType.LOW))
+    # merge highs and lows by bar; the stable sort keeps a high ahead of a
+    # low on the same (outside) bar
+    pos = np.concatenate([swing_highs, swing_lows])
+    is_high = np.arange(len(pos)) < len(swing_highs)
+    order = np.argsort(pos, kind="stable")
+    pos, is_high = pos[order], is_high[order]
+    price = np.where(is_high, highs[pos], lows[pos])
 
-    swings.sort(key=lambda s: s.index)
+    swings: List[SwingPoint] = [
+        SwingPoint(i, ts, p, SwingType.HIGH if h else SwingType.LOW)
+        for i, ts, p, h in zip(pos, ohlc.index[pos], price, is_high.tolist())
+    ]
 
-    # Determine trend
-    highs_seq = [s for s in swings if s.swing_type == SwingType.HIGH]
-    lows_seq = [s for s in swings if s.swing_type == SwingType.LOW]
+    # Determine trend from the position arrays (already in bar order), not
+    # by filtering the swing list per type
     trend = TrendDirection.RANGING
+    if len(swing_highs) >= 2 and len(swing_lows) >= 2:
+        trend = classify_trend(
+            highs[swing_highs[-1]], highs[swing_highs[-2]], lows[swing_lows[-1]], lows[swing_lows[-2]]
+        )
 
-    if len(highs_seq) >= 2 and len(lows_seq) >= 2:
-        if highs_seq[-1].price > highs_seq[-2].price and lows_seq[-1].price > lows_seq[-2].price:
-            trend = TrendDirection.BULLISH
-        elif highs_seq[-1].price < highs_seq[-2].price and lows_seq[-1].price < lows_seq[-2].price:
-            trend = TrendDirection.BEARISH
+    # rows of the newest high / low in the merged swing list
+    high_rows = np.flatnonzero(is_high)
+    low_rows = np.flatnonzero(~is_high)
 
     return MarketStructure(
         swings=swings,
         trend=trend,
-        last_swing_high=highs_seq[-1] if highs_seq else None,
-        last_swing_low=lows_seq[-1] if lows_seq else None,
+        last_swing_high=swings[high_rows[-1]] if len(high_rows) else None,
+        last_swing_low=swings[low_rows[-1]] if len(low_rows) else None,
     )
 
 
@@ -187,15 +449,26 @@ def detect_market_structure(ohlc: pd.DataFrame, lookback: int = 10) -> MarketStr
 # BOS / CHOCH
 # ============================================================
 
-def is_bos(ohlc: pd.DataFrame, swing: SwingPoint, bos_margin_atr: float = 0.5, atr_period: int = 14) -> bool:
-    """Detect Break of Structure relative to a swing."""
+def is_bos(
+    ohlc: pd.DataFrame,
+    swing: SwingPoint,
+    bos_margin_atr: float = 0.5,
+    atr_period: int = 14,
+    atr: Optional[np.ndarray] = None
+) -> bool:
+    """
+    Detect Break of Structure relative to a swing.
+
+    ``atr`` is an optional precomputed ATR aligned with ``ohlc``; only its
+    last value is used.
+    """
     if len(ohlc) < atr_period:
         return False
 
-    atr = calculate_atr(ohlc, atr_period).iloc[-1]
-    atr = 0.0001 if pd.isna(atr) else atr
+    atr = _atr_array(ohlc, atr_period, atr)[-1]
+    atr = 0.0001 if np.isnan(atr) else atr
     margin = bos_margin_atr * atr
-    close = ohlc["close"].iloc[-1]
+    close = ohlc["close"].to_numpy()[-1]
 
     if swing.swing_type == SwingType.HIGH:
         return close > swing.price + margin
@@ -206,13 +479,15 @@ def detect_choch(
     ohlc: pd.DataFrame,
     ms_or_swings: Union[MarketStructure, List[SwingPoint]],
     bos_margin_atr: float = 0.5,
-    atr_period: int = 14
+    atr_period: int = 14,
+    atr: Optional[np.ndarray] = None
 ) -> bool:
     """
     Detect Change of Character (ChoCH).
 
     Accepts either a MarketStructure instance or a list of SwingPoint (legacy/mistaken usage).
     If a list is provided, derive a minimal MarketStructure (trend + last swings) from it.
+    ``atr`` is an optional precomputed ATR aligned with ``ohlc``.
     """
     # If a list of swings was passed, construct a minimal MarketStructure
     if isinstance(ms_or_swings, list):
@@ -222,10 +497,7 @@ def detect_choch(
         lows = [s for s in swings_list if s.swing_type == SwingType.LOW]
         trend = TrendDirection.RANGING
         if len(highs) >= 2 and len(lows) >= 2:
-            if highs[-1].price > highs[-2].price and lows[-1].price > lows[-2].price:
-                trend = TrendDirection.BULLISH
-            elif highs[-1].price < highs[-2].price and lows[-1].price < lows[-2].price:
-                trend = TrendDirection.BEARISH
+            trend = classify_trend(highs[-1].price, highs[-2].price, lows[-1].price, lows[-2].price)
 
         ms = MarketStructure(
             swings=swings_list,
@@ -240,9 +512,9 @@ def detect_choch(
     if ms.trend == TrendDirection.RANGING:
         return False
     if ms.trend == TrendDirection.BULLISH and ms.last_swing_low:
-        return is_bos(ohlc, ms.last_swing_low, bos_margin_atr, atr_period)
+        return is_bos(ohlc, ms.last_swing_low, bos_margin_atr, atr_period, atr)
     if ms.trend == TrendDirection.BEARISH and ms.last_swing_high:
-        return is_bos(ohlc, ms.last_swing_high, bos_margin_atr, atr_period)
+        return is_bos(ohlc, ms.last_swing_high, bos_margin_atr, atr_period, atr)
     return False
 
 
@@ -250,169 +522,211 @@ def detect_choch(
 # ORDER BLOCKS  ✅ FIXED
 # ============================================================
 
-def find_order_blocks(ohlc: pd.DataFrame, params: dict) -> List[OrderBlock]:
-    """Detect Order Blocks using impulsive moves."""
+# params read by find_order_block_arrays (results depend on nothing else)
+ORDER_BLOCK_PARAMS = (
+    "min_impulse_bars", "min_impulse_atr", "ob_expansion_atr", "atr_period",
+    "max_age_bars", "detection_method", "use_float32",
+)
+
+
+def find_order_block_arrays(
+    ohlc: pd.DataFrame,
+    params: dict,
+    atr: Optional[np.ndarray] = None,
+    bullish: Optional[np.ndarray] = None
+) -> OrderBlockArray:
+    """
+    Detect Order Blocks using impulsive moves, as parallel arrays.
+
+    ``atr`` is an optional precomputed ATR aligned with ``ohlc``; ``bullish``
+    an optional precomputed ``close > open`` mask. ``params["use_float32"]``
+    runs the scan on float32 prices.
+    """
     min_bars = params.get("min_impulse_bars", 3)
     min_atr_mult = params.get("min_impulse_atr", 2.0)
     expansion_mult = params.get("ob_expansion_atr", 0.5)
     atr_period = params.get("atr_period", 14)
     max_age = params.get("max_age_bars", 100)
     strict = params.get("detection_method", "strict") == "strict"
+    dtype = _working_dtype(params.get("use_float32", False))
 
     if len(ohlc) < atr_period + min_bars:
-        return []
-
-    atr = calculate_atr(ohlc, atr_period)
-    bullish = ohlc["close"] > ohlc["open"]
-    bearish = ~bullish
-    order_blocks: List[OrderBlock] = []
-
-    for i in range(atr_period, len(ohlc) - min_bars):
-        current_atr = atr.iat[i]
-        if np.isnan(current_atr):
-            continue
-
-        def add_block(block_type: str, ob_idx: int):
-            expansion = expansion_mult * current_atr
-            high, low, open_, close = ohlc.iloc[ob_idx][["high", "low", "open", "close"]]
-            ob_top, ob_bottom = (
-                (max(open_, close) + expansion, min(open_, close) - expansion)
-                if strict else
-                (high + expansion, low - expansion)
-            )
-            order_blocks.append(OrderBlock(
-                type=block_type,
-                start_idx=ob_idx,
-                end_idx=i + min_bars - 1,
-                start_ts=ohlc.index[ob_idx],
-                end_ts=ohlc.index[i + min_bars - 1],
-                price_top=ob_top,
-                price_bottom=ob_bottom,
-                strength=float(abs(ohlc["close"].iloc[i + min_bars - 1] - ohlc["open"].iloc[ob_idx]) / current_atr),
-            ))
-
-        # Bullish impulse
-        if bullish.iloc[i:i + min_bars].all():
-            if (ohlc["high"].iloc[i + min_bars - 1] - ohlc["low"].iloc[i]) >= min_atr_mult * current_atr:
-                ob_series = bearish[:i][::-1]
-                if ob_series.any():
-                    ob_ts = ob_series.idxmax()  # this returns a timestamp
-                    # convert timestamp to integer location (robust)
-                    try:
-                        ob_idx = ohlc.index.get_loc(ob_ts)
-                    except Exception:
-                        # fallback to positional approach if weird index types
-                        ob_idx = int(ob_series.iloc[::-1].to_numpy().argmax())
-                    if i - ob_idx <= max_age:
-                        add_block("bullish", ob_idx)
-
-        # Bearish impulse
-        if bearish.iloc[i:i + min_bars].all():
-            if (ohlc["high"].iloc[i] - ohlc["low"].iloc[i + min_bars - 1]) >= min_atr_mult * current_atr:
-                ob_series = bullish[:i][::-1]
-                if ob_series.any():
-                    ob_ts = ob_series.idxmax()
-                    try:
-                        ob_idx = ohlc.index.get_loc(ob_ts)
-                    except Exception:
-                        ob_idx = int(ob_series.iloc[::-1].to_numpy().argmax())
-                    if i - ob_idx <= max_age:
-                        add_block("bearish", ob_idx)
-
-    return order_blocks
+        return OrderBlockArray.empty(ohlc.index)
+
+    open_ = ohlc["open"].to_numpy(dtype=dtype)
+    close = ohlc["close"].to_numpy(dtype=dtype)
+    if bullish is None:
+        bullish = close > open_
+
+    # the bar scan runs in a compiled kernel; see _kernels.find_order_blocks_kernel
+    kind, start_idx, end_idx, top, bottom, strength, count = find_order_blocks_kernel(
+        ohlc["high"].to_numpy(dtype=dtype),
+        ohlc["low"].to_numpy(dtype=dtype),
+        open_,
+        close,
+        np.asarray(bullish, dtype=np.bool_),
+        _atr_array(ohlc, atr_period, atr).astype(dtype, copy=False),
+        int(atr_period), int(min_bars), float(min_atr_mult), float(expansion_mult),
+        int(max_age), bool(strict),
+    )
+
+    start_idx, end_idx = start_idx[:count], end_idx[:count]
+    return OrderBlockArray(
+        kind=kind[:count],
+        start_idx=start_idx,
+        end_idx=end_idx,
+        price_top=top[:count],
+        price_bottom=bottom[:count],
+        strength=strength[:count],
+        index=ohlc.index,
+    )
+
+
+def find_order_blocks(ohlc: pd.DataFrame, params: dict, atr: Optional[np.ndarray] = None) -> List[OrderBlock]:
+    """
+    Detect Order Blocks using impulsive moves.
+
+    ``atr`` is an optional precomputed ATR aligned with ``ohlc``.
+    """
+    return find_order_block_arrays(ohlc, params, atr).to_dataclasses()
 
 
 # ============================================================
 # FAIR VALUE GAPS
 # ============================================================
 
-def find_fvg(ohlc: pd.DataFrame, params: dict) -> List[FairValueGap]:
-    """Detect Fair Value Gaps (3-candle imbalance)."""
+# params read by find_fvg_arrays
+FVG_PARAMS = ("min_gap_atr", "fvg_expand_atr", "atr_period", "use_float32")
+
+
+def find_fvg_arrays(
+    ohlc: pd.DataFrame,
+    params: dict,
+    atr: Optional[np.ndarray] = None
+) -> FairValueGapArray:
+    """
+    Detect Fair Value Gaps (3-candle imbalance), as parallel arrays.
+
+    ``atr`` is an optional precomputed ATR aligned with ``ohlc``.
+    ``params["use_float32"]`` runs the comparisons on float32 prices.
+    """
     min_gap_atr = params.get("min_gap_atr", 0.5)
     expand_mult = params.get("fvg_expand_atr", 0.2)
     atr_period = params.get("atr_period", 14)
+    dtype = _working_dtype(params.get("use_float32", False))
 
     if len(ohlc) < atr_period + 3:
-        return []
-
-    atr = calculate_atr(ohlc, atr_period)
-    fvgs: List[FairValueGap] = []
-
-    for i in range(atr_period, len(ohlc) - 2):
-        current_atr = atr.iat[i]
-        if np.isnan(current_atr):
-            continue
-        expand = expand_mult * current_atr
-        min_gap = min_gap_atr * current_atr
+        return FairValueGapArray.empty(ohlc.index)
+
+    high = ohlc["high"].to_numpy(dtype=dtype)
+    low = ohlc["low"].to_numpy(dtype=dtype)
+    atr = _atr_array(ohlc, atr_period, atr).astype(dtype, copy=False)
+
+    # candle i against candle i + 2, for every i at once (NaN ATR never matches)
+    h0, l0 = high[:-2], low[:-2]
+    h2, l2 = high[2:], low[2:]
+    a = atr[:-2]
+    min_gap = min_gap_atr * a
+    bull_mask = (h0 < l2) & ((l2 - h0) >= min_gap)
+    bear_mask = ~bull_mask & (l0 > h2) & ((l0 - h2) >= min_gap)
+    bull_mask[:atr_period] = False
+    bear_mask[:atr_period] = False
+
+    hits = np.flatnonzero(bull_mask | bear_mask)
+    is_bull = bull_mask[hits]
+    expand = expand_mult * a[hits]
+
+    return FairValueGapArray(
+        kind=np.where(is_bull, BULLISH, BEARISH).astype(np.int8),
+        start_idx=hits,
+        end_idx=hits + 2,
+        gap_top=(np.where(is_bull, l2[hits], l0[hits]) + expand).astype(np.float64, copy=False),
+        gap_bottom=(np.where(is_bull, h0[hits], h2[hits]) - expand).astype(np.float64, copy=False),
+        size_pips=(np.where(is_bull, l2[hits] - h0[hits], l0[hits] - h2[hits]) * 10000).astype(np.float64, copy=False),
+        index=ohlc.index,
+    )
 
-        high_i, low_i2 = ohlc["high"].iat[i], ohlc["low"].iat[i + 2]
-        low_i, high_i2 = ohlc["low"].iat[i], ohlc["high"].iat[i + 2]
 
-        if high_i < low_i2 and (low_i2 - high_i) >= min_gap:
-            fvgs.append(FairValueGap("bullish", i, i + 2, ohlc.index[i], ohlc.index[i + 2],
-                                     low_i2 + expand, high_i - expand, (low_i2 - high_i) * 10000))
-        elif low_i > high_i2 and (low_i - high_i2) >= min_gap:
-            fvgs.append(FairValueGap("bearish", i, i + 2, ohlc.index[i], ohlc.index[i + 2],
-                                     low_i + expand, high_i2 - expand, (low_i - high_i2) * 10000))
+def find_fvg(ohlc: pd.DataFrame, params: dict, atr: Optional[np.ndarray] = None) -> List[FairValueGap]:
+    """
+    Detect Fair Value Gaps (3-candle imbalance).
 
-    return fvgs
+    ``atr`` is an optional precomputed ATR aligned with ``ohlc``.
+    """
+    return find_fvg_arrays(ohlc, params, atr).to_dataclasses()
 
 
 # ============================================================
 # LIQUIDITY GRABS
 # ============================================================
 
+def detect_liquidity_grab_arrays(
+    ohlc: pd.DataFrame,
+    swings: List[SwingPoint],
+    liquidity_grab_atr: float = 1.0,
+    grab_reclaim_bars: int = 3,
+    atr_period: int = 14,
+    atr: Optional[np.ndarray] = None,
+    use_float32: bool = False,
+) -> LiquidityGrabArray:
+    """
+    Detect liquidity grabs based on swing highs/lows, as parallel arrays.
+
+    ``atr`` is an optional precomputed ATR aligned with ``ohlc``;
+    ``use_float32`` runs the scan on float32 prices.
+    """
+    if len(ohlc) < atr_period + grab_reclaim_bars:
+        return LiquidityGrabArray.empty(ohlc.index)
+
+    if not swings:
+        return LiquidityGrabArray.empty(ohlc.index)
+
+    # swings as parallel arrays for the compiled scan
+    dtype = _working_dtype(use_float32)
+    high = ohlc["high"].to_numpy(dtype=dtype)
+    low = ohlc["low"].to_numpy(dtype=dtype)
+    swing_idx = np.array([s.index for s in swings], dtype=np.int64)
+    swing_price = np.array([s.price for s in swings], dtype=dtype)
+    swing_type = np.array([SWING_HIGH if s.swing_type == SwingType.HIGH else SWING_LOW for s in swings], dtype=np.int8)
+    swing_row, grab_idx, reclaim, count = detect_liquidity_grab_kernel(
+        high,
+        low,
+        ohlc["close"].to_numpy(dtype=dtype),
+        _atr_array(ohlc, atr_period, atr).astype(dtype, copy=False),
+        swing_idx,
+        swing_price,
+        swing_type,
+        float(liquidity_grab_atr), int(grab_reclaim_bars), 50,
+    )
+
+    swing_row, grab_idx = swing_row[:count], grab_idx[:count]
+    is_high = swing_type[swing_row] == SWING_HIGH
+    return LiquidityGrabArray(
+        kind=np.where(is_high, BEARISH, BULLISH).astype(np.int8),
+        swing_idx=swing_idx[swing_row],
+        grab_idx=grab_idx,
+        swing_price=swing_price[swing_row].astype(np.float64, copy=False),
+        grab_price=np.where(is_high, high[grab_idx], low[grab_idx]).astype(np.float64, copy=False),
+        reclaim_bars=reclaim[:count],
+        index=ohlc.index,
+    )
+
+
 def detect_liquidity_grab(
     ohlc: pd.DataFrame,
     swings: List[SwingPoint],
     liquidity_grab_atr: float = 1.0,
     grab_reclaim_bars: int = 3,
     atr_period: int = 14,
+    atr: Optional[np.ndarray] = None,
+    use_float32: bool = False,
 ) -> List[LiquidityGrab]:
-    """Detect liquidity grabs based on swing highs/lows."""
-    if len(ohlc) < atr_period + grab_reclaim_bars:
-        return []
-
-    atr = calculate_atr(ohlc, atr_period)
-    grabs: List[LiquidityGrab] = []
-
-    for swing in swings:
-        start = swing.index + 1
-        end = min(start + 50, len(ohlc))
-        for i in range(start, end):
-            current_atr = atr.iat[i]
-            if np.isnan(current_atr):
-                continue
-            thresh = liquidity_grab_atr * current_atr
-
-            if swing.swing_type == SwingType.HIGH:
-                if ohlc["high"].iat[i] > swing.price + thresh:
-                    for j in range(i + 1, min(i + grab_reclaim_bars + 1, len(ohlc))):
-                        if ohlc["close"].iat[j] < swing.price:
-                            grabs.append(LiquidityGrab(
-                                type="bearish",
-                                swing_idx=swing.index,
-                                grab_idx=i,
-                                timestamp=ohlc.index[i],
-                                swing_price=swing.price,
-                                grab_price=ohlc["high"].iat[i],
-                                reclaim_bars=j - i,
-                            ))
-                            break
-
-            elif swing.swing_type == SwingType.LOW:
-                if ohlc["low"].iat[i] < swing.price - thresh:
-                    for j in range(i + 1, min(i + grab_reclaim_bars + 1, len(ohlc))):
-                        if ohlc["close"].iat[j] > swing.price:
-                            grabs.append(LiquidityGrab(
-                                type="bullish",
-                                swing_idx=swing.index,
-                                grab_idx=i,
-                                timestamp=ohlc.index[i],
-                                swing_price=swing.price,
-                                grab_price=ohlc["low"].iat[i],
-                                reclaim_bars=j - i,
-                            ))
-                            break
-    return grabs
+    """
+    Detect liquidity grabs based on swing highs/lows.
 
+    ``atr`` is an optional precomputed ATR aligned with ``ohlc``;
+    ``use_float32`` runs the scan on float32 prices.
+    """
+    return detect_liquidity_grab_arrays(
+        ohlc, swings, liquidity_grab_atr, grab_reclaim_bars, atr_period, atr, use_float32
+    ).to_dataclasses()
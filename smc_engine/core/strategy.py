@@ -8,15 +8,135 @@ import pandas as pd
 import numpy as np
 
 from .smc_primitives import (
+    BULLISH,
+    BEARISH,
+    SwingType,
+    TrendDirection,
+    OrderBlockArray,
+    FairValueGapArray,
+    ORDER_BLOCK_PARAMS,
+    FVG_PARAMS,
+    classify_trend,
     detect_market_structure,
-    find_order_blocks,
-    find_fvg,
-    detect_choch,
-    detect_liquidity_grab,
+    find_order_block_arrays,
+    find_fvg_arrays,
+    detect_liquidity_grab_arrays,
     calculate_atr,
 )
 
 
+# ================================================================
+# Zone lookup helpers
+# ================================================================
+
+def _zone_table(kind: np.ndarray, end_idx: np.ndarray, bottom: np.ndarray, top: np.ndarray, direction: int):
+    """
+    Rows of one direction from a zone array container, in detection order.
+
+    Detectors emit zones in scan order, so ``end_idx`` is non-decreasing and
+    the zones completed before bar i form a prefix found by searchsorted.
+    """
+    rows = np.flatnonzero(kind == direction)
+    return rows, end_idx[rows], bottom[rows], top[rows]
+
+
+def _first_zone_hit(table, i: int, price: float) -> int:
+    """Row of the first zone completed before bar i whose range contains ``price``, or -1."""
+    rows, end_idx, bottom, top = table
+    active = np.searchsorted(end_idx, i, side="left")
+    if not active:
+        return -1
+    hit = (bottom[:active] <= price) & (price <= top[:active])
+    j = int(np.argmax(hit))
+    return int(rows[j]) if hit[j] else -1
+
+
+def _ob_tables(order_blocks: OrderBlockArray):
+    """Order blocks with their bullish and bearish zone tables."""
+    zones = (order_blocks.kind, order_blocks.end_idx, order_blocks.price_bottom, order_blocks.price_top)
+    return order_blocks, _zone_table(*zones, BULLISH), _zone_table(*zones, BEARISH)
+
+
+def _fvg_tables(fvgs: FairValueGapArray):
+    """Fair value gaps with their bullish and bearish zone tables."""
+    zones = (fvgs.kind, fvgs.end_idx, fvgs.gap_bottom, fvgs.gap_top)
+    return fvgs, _zone_table(*zones, BULLISH), _zone_table(*zones, BEARISH)
+
+
+class _SignalContext:
+    """
+    Detector results for one OHLC frame, memoized by the parameters each
+    depends on.
+
+    Parameter sets that agree on e.g. ``atr_period`` and ``lookback`` share
+    the ATR and market structure; only the detectors whose inputs differ
+    run again. Memoized values are shared, so callers must not modify them.
+    """
+
+    def __init__(self, ohlc: pd.DataFrame):
+        self.ohlc = ohlc
+        self.closes = ohlc["close"].to_numpy()
+        self.highs = ohlc["high"].to_numpy()
+        self.lows = ohlc["low"].to_numpy()
+        self.bullish = self.closes > ohlc["open"].to_numpy()
+        self._memo: Dict[tuple, Any] = {}
+
+    def _memoized(self, key: tuple, build):
+        if key not in self._memo:
+            self._memo[key] = build()
+        return self._memo[key]
+
+    def atr(self, period: int) -> np.ndarray:
+        return self._memoized(
+            ("atr", period), lambda: calculate_atr(self.ohlc, period).to_numpy(dtype=np.float64)
+        )
+
+    def structure(self, lookback: int):
+        """Market structure with its swing highs and lows, each in bar order."""
+        def build():
+            structure = detect_market_structure(self.ohlc, lookback)
+            return (
+                structure,
+                [s for s in structure.swings if s.swing_type == SwingType.HIGH],
+                [s for s in structure.swings if s.swing_type == SwingType.LOW],
+            )
+        return self._memoized(("structure", lookback), build)
+
+    def order_blocks(self, params: Dict[str, Any]):
+        key = ("ob",) + tuple(params.get(name) for name in ORDER_BLOCK_PARAMS)
+        return self._memoized(key, lambda: _ob_tables(find_order_block_arrays(
+            self.ohlc, params, atr=self.atr(params["atr_period"]), bullish=self.bullish
+        )))
+
+    def fvgs(self, params: Dict[str, Any]):
+        key = ("fvg",) + tuple(params.get(name) for name in FVG_PARAMS)
+        return self._memoized(key, lambda: _fvg_tables(
+            find_fvg_arrays(self.ohlc, params, atr=self.atr(params["atr_period"]))
+        ))
+
+    def grab_bars(self, params: Dict[str, Any]) -> Dict[int, int]:
+        """Direction of the first liquidity grab detected at each bar, keyed by bar position."""
+        lookback, atr_period = params["lookback"], params["atr_period"]
+        grab_atr = params.get("liquidity_grab_atr", 1.0)
+        use_float32 = params.get("use_float32", False)
+
+        def build():
+            grabs = detect_liquidity_grab_arrays(
+                self.ohlc,
+                self.structure(lookback)[0].swings,
+                grab_atr,
+                grab_reclaim_bars=3,
+                atr_period=atr_period,
+                atr=self.atr(atr_period),
+                use_float32=use_float32,
+            )
+            grab_at_bar = {}
+            for bar, kind in zip(grabs.end_idx.tolist(), grabs.kind.tolist()):
+                grab_at_bar.setdefault(bar, kind)
+            return grab_at_bar
+        return self._memoized(("grabs", lookback, atr_period, grab_atr, use_float32), build)
+
+
 # ================================================================
 # Base Strategy Interface
 # ================================================================
@@ -53,9 +173,9 @@ class SMCStrategy(Strategy):
     Process overview:
         1. Detect rolling market structure and trend
         2. Identify order blocks and fair value gaps (zones)
-        3. Detect BOS / ChoCH and liquidity grabs
-        4. Generate entries on retracements into OB/FVG 
-           confirmed by structure shifts or liquidity sweeps
+        3. Detect liquidity grabs
+        4. Generate entries on retracements into OB/FVG
+           confirmed by a liquidity sweep on the same bar
         5. Use adaptive stop loss and target placement
     """
 
@@ -80,7 +200,9 @@ class SMCStrategy(Strategy):
     # Default parameter search space
     # ------------------------------------------------------------
 
-    def default_param_space(self) -> Dict[str, Any]:
+    @classmethod
+    def default_param_space(cls) -> Dict[str, Any]:
+        """Default optimization search space (a new dict per call; safe to modify)."""
         return {
             "lookback": {"type": "int", "low": 20, "high": 100},
             "min_impulse_bars": {"type": "int", "low": 2, "high": 5},
@@ -104,191 +226,200 @@ class SMCStrategy(Strategy):
         """
         Generate SMC-based trading signals.
         """
+        return self._signals(_SignalContext(ohlc))
+
+    def generate_signals_batch(self, ohlc: pd.DataFrame, params_list: List[Dict[str, Any]]) -> List[pd.DataFrame]:
+        """
+        Generate signals for several parameter sets over the same data.
+
+        ATR, market structure, zones and liquidity grabs are computed once
+        per distinct value of the parameters they depend on and shared by
+        every set (e.g. a sweep over ``risk_reward`` alone runs each
+        detector once). Each set is validated as for a new strategy.
 
+        Returns:
+            One signal frame per parameter set, equal to ``generate_signals``
+            of a strategy built with it
+        """
+        ctx = _SignalContext(ohlc)
+        return [type(self)(params)._signals(ctx) for params in params_list]
+
+    def _signals(self, ctx: _SignalContext) -> pd.DataFrame:
+        ohlc = ctx.ohlc
         signals = []
         min_bars = max(self.params["lookback"], self.params["atr_period"]) + 10
         if len(ohlc) < min_bars:
             return pd.DataFrame(columns=["ts", "signal", "price", "stop", "tp", "meta"])
 
         # --- Precompute data ---------------------------------------------------
-        atr = calculate_atr(ohlc, self.params["atr_period"])
+        # ATR is shared by every detector below and by the per-bar checks
+        atr = ctx.atr(self.params["atr_period"])
+
+        closes = ctx.closes
+        highs = ctx.highs
+        lows = ctx.lows
+        index = ohlc.index
 
-        order_blocks = (
-            find_order_blocks(ohlc, self.params)
+        order_blocks, bull_obs, bear_obs = (
+            ctx.order_blocks(self.params)
             if self.params.get("use_order_blocks", True)
-            else []
+            else _ob_tables(OrderBlockArray.empty(index))
         )
-        fvgs = (
-            find_fvg(ohlc, self.params)
+        fvgs, bull_fvgs, bear_fvgs = (
+            ctx.fvgs(self.params)
             if self.params.get("use_fvg", True)
-            else []
+            else _fvg_tables(FairValueGapArray.empty(index))
         )
 
-        # optional: detect all liquidity grabs once (structure-based)
-        liquidity_grabs = (
-            detect_liquidity_grab(
-                ohlc,
-                detect_market_structure(ohlc, self.params["lookback"]).swings,
-                self.params.get("liquidity_grab_atr", 1.0),
-                grab_reclaim_bars=3,
-                atr_period=self.params["atr_period"],
-            )
-            if self.params.get("use_liquidity_grabs", True)
-            else []
-        )
+        # Swings over the full series; a swing at bar p is only known once
+        # the ``lookback`` bars after it have closed, i.e. from bar p + lookback
+        lookback = self.params["lookback"]
+        _, swing_highs, swing_lows = ctx.structure(lookback)
+
+        # optional: liquidity grabs (structure-based), by bar
+        grab_at_bar = ctx.grab_bars(self.params) if self.params.get("use_liquidity_grabs", True) else {}
 
         last_signal_bar = -9999  # avoid duplicate entries
         cool_off = 5
 
+        # number of swing highs / lows confirmed so far
+        n_highs = 0
+        n_lows = 0
+
         # --- Main signal loop -------------------------------------------------
-        for i in range(min_bars, len(ohlc)):
+        # Only a liquidity grab on the bar can confirm an entry, so the loop
+        # visits grab bars alone; the swing counters catch up over any gap.
+        for i in sorted(bar for bar in grab_at_bar if bar >= min_bars):
             if i - last_signal_bar < cool_off:
                 continue
 
-            df_slice = ohlc.iloc[: i + 1]
-            price = df_slice["close"].iloc[-1]
-            high = df_slice["high"].iloc[-1]
-            low = df_slice["low"].iloc[-1]
-            atr_now = atr.iloc[i]
-            if pd.isna(atr_now):
+            # Rolling structure: advance past swings confirmed by bar i
+            while n_highs < len(swing_highs) and swing_highs[n_highs].index + lookback <= i:
+                n_highs += 1
+            while n_lows < len(swing_lows) and swing_lows[n_lows].index + lookback <= i:
+                n_lows += 1
+
+            price = closes[i]
+            high = highs[i]
+            low = lows[i]
+            atr_now = atr[i]
+            if np.isnan(atr_now):
                 continue
 
-            # Rolling structure
-            ms = detect_market_structure(df_slice, self.params["lookback"])
-            trend = ms.trend.value
-
-            # Confirm structural shift
-            choch = detect_choch(df_slice, ms.swings)
+            trend = TrendDirection.RANGING.value
+            if n_highs >= 2 and n_lows >= 2:
+                trend = classify_trend(
+                    swing_highs[n_highs - 1].price, swing_highs[n_highs - 2].price,
+                    swing_lows[n_lows - 1].price, swing_lows[n_lows - 2].price,
+                ).value
 
-            # Active liquidity grab at this bar?
-            recent_grab = next(
-                (g for g in liquidity_grabs if g.end_idx == i), None
-            ) if liquidity_grabs else None
+            # Direction of the liquidity grab at this bar
+            recent_grab = grab_at_bar[i]
 
             # ==================== BULLISH CONTEXT ============================
             if trend in ["bullish", "ranging"]:
-                # Confluence: structure shift or liquidity grab
-                bullish_confirm = (
-                    (choch.is_bullish if hasattr(choch, "is_bullish") else False)
-                    or (recent_grab and recent_grab.type == "bullish")
-                )
-                if not bullish_confirm:
+                # Confluence: a bullish liquidity grab on this bar
+                if recent_grab != BULLISH:
                     continue
 
                 # look for nearest active bullish OB / FVG zone
-                for ob in order_blocks:
-                    if ob.type != "bullish" or ob.end_idx >= i:
-                        continue
-                    if ob.price_bottom <= low <= ob.price_top:
-                        entry = price
-                        stop = min(ob.price_bottom, low) - 0.3 * atr_now
-                        risk = entry - stop
-                        tp = entry + risk * self.params["risk_reward"]
-
-                        signals.append(
-                            {
-                                "ts": df_slice.index[-1],
-                                "signal": "buy",
-                                "price": entry,
-                                "stop": stop,
-                                "tp": tp,
-                                "meta": {
-                                    "reason": "OB+ChoCH/LQ",
-                                    "trend": trend,
-                                    "ob_strength": getattr(ob, "strength", None),
-                                },
-                            }
-                        )
-                        last_signal_bar = i
-                        break
+                j = _first_zone_hit(bull_obs, i, low)
+                if j >= 0:
+                    entry = price
+                    stop = min(order_blocks.price_bottom[j], low) - 0.3 * atr_now
+                    risk = entry - stop
+                    tp = entry + risk * self.params["risk_reward"]
+
+                    signals.append(
+                        {
+                            "ts": i,
+                            "signal": "buy",
+                            "price": entry,
+                            "stop": stop,
+                            "tp": tp,
+                            "meta": {
+                                "reason": "OB+ChoCH/LQ",
+                                "trend": trend,
+                                "ob_strength": float(order_blocks.strength[j]),
+                            },
+                        }
+                    )
+                    last_signal_bar = i
 
                 # FVG confluence (if price within gap and bullish confirmed)
-                for fvg in fvgs:
-                    if fvg.type != "bullish" or fvg.end_idx >= i:
-                        continue
-                    if fvg.gap_bottom <= low <= fvg.gap_top:
-                        entry = price
-                        stop = fvg.gap_bottom - 0.3 * atr_now
-                        risk = entry - stop
-                        tp = entry + risk * self.params["risk_reward"]
-
-                        signals.append(
-                            {
-                                "ts": df_slice.index[-1],
-                                "signal": "buy",
-                                "price": entry,
-                                "stop": stop,
-                                "tp": tp,
-                                "meta": {
-                                    "reason": "FVG+ChoCH/LQ",
-                                    "trend": trend,
-                                    "fvg_size": getattr(fvg, "size_pips", None),
-                                },
-                            }
-                        )
-                        last_signal_bar = i
-                        break
+                j = _first_zone_hit(bull_fvgs, i, low)
+                if j >= 0:
+                    entry = price
+                    stop = fvgs.gap_bottom[j] - 0.3 * atr_now
+                    risk = entry - stop
+                    tp = entry + risk * self.params["risk_reward"]
+
+                    signals.append(
+                        {
+                            "ts": i,
+                            "signal": "buy",
+                            "price": entry,
+                            "stop": stop,
+                            "tp": tp,
+                            "meta": {
+                                "reason": "FVG+ChoCH/LQ",
+                                "trend": trend,
+                                "fvg_size": float(fvgs.size_pips[j]),
+                            },
+                        }
+                    )
+                    last_signal_bar = i
 
             # ==================== BEARISH CONTEXT ============================
             if trend in ["bearish", "ranging"]:
-                bearish_confirm = (
-                    (choch.is_bearish if hasattr(choch, "is_bearish") else False)
-                    or (recent_grab and recent_grab.type == "bearish")
-                )
-                if not bearish_confirm:
+                if recent_grab != BEARISH:
                     continue
 
-                for ob in order_blocks:
-                    if ob.type != "bearish" or ob.end_idx >= i:
-                        continue
-                    if ob.price_bottom <= high <= ob.price_top:
-                        entry = price
-                        stop = max(ob.price_top, high) + 0.3 * atr_now
-                        risk = stop - entry
-                        tp = entry - risk * self.params["risk_reward"]
-
-                        signals.append(
-                            {
-                                "ts": df_slice.index[-1],
-                                "signal": "sell",
-                                "price": entry,
-                                "stop": stop,
-                                "tp": tp,
-                                "meta": {
-                                    "reason": "OB+ChoCH/LQ",
-                                    "trend": trend,
-                                    "ob_strength": getattr(ob, "strength", None),
-                                },
-                            }
-                        )
-                        last_signal_bar = i
-                        break
-
-                for fvg in fvgs:
-                    if fvg.type != "bearish" or fvg.end_idx >= i:
-                        continue
-                    if fvg.gap_bottom <= high <= fvg.gap_top:
-                        entry = price
-                        stop = fvg.gap_top + 0.3 * atr_now
-                        risk = stop - entry
-                        tp = entry - risk * self.params["risk_reward"]
-
-                        signals.append(
-                            {
-                                "ts": df_slice.index[-1],
-                                "signal": "sell",
-                                "price": entry,
-                                "stop": stop,
-                                "tp": tp,
-                                "meta": {
-                                    "reason": "FVG+ChoCH/LQ",
-                                    "trend": trend,
-                                    "fvg_size": getattr(fvg, "size_pips", None),
-                                },
-                            }
-                        )
-                        last_signal_bar = i
-                        break
+                j = _first_zone_hit(bear_obs, i, high)
+                if j >= 0:
+                    entry = price
+                    stop = max(order_blocks.price_top[j], high) + 0.3 * atr_now
+                    risk = stop - entry
+                    tp = entry - risk * self.params["risk_reward"]
+
+                    signals.append(
+                        {
+                            "ts": i,
+                            "signal": "sell",
+                            "price": entry,
+                            "stop": stop,
+                            "tp": tp,
+                            "meta": {
+                                "reason": "OB+ChoCH/LQ",
+                                "trend": trend,
+                                "ob_strength": float(order_blocks.strength[j]),
+                            },
+                        }
+                    )
+                    last_signal_bar = i
+
+                j = _first_zone_hit(bear_fvgs, i, high)
+                if j >= 0:
+                    entry = price
+                    stop = fvgs.gap_top[j] + 0.3 * atr_now
+                    risk = stop - entry
+                    tp = entry - risk * self.params["risk_reward"]
+
+                    signals.append(
+                        {
+                            "ts": i,
+                            "signal": "sell",
+                            "price": entry,
+                            "stop": stop,
+                            "tp": tp,
+                            "meta": {
+                                "reason": "FVG+ChoCH/LQ",
+                                "trend": trend,
+                                "fvg_size": float(fvgs.size_pips[j]),
+                            },
+                        }
+                    )
+                    last_signal_bar = i
 
         # ------------------------------------------------------------
         # Convert signals to DataFrame
@@ -296,4 +427,7 @@ class SMCStrategy(Strategy):
         if not signals:
             return pd.DataFrame(columns=["ts", "signal", "price", "stop", "tp", "meta"])
 
-        return pd.DataFrame(signals)
+        # signals carry bar positions until here; look timestamps up once
+        frame = pd.DataFrame(signals)
+        frame["ts"] = index[frame["ts"].to_numpy()]
+        return frame
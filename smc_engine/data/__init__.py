@@ -2,5 +2,6 @@
 
 from .mt5_manager import MT5Manager
 from .marketdata import MarketDataProvider
+from .bar_window import BarWindow
 
-__all__ = ["MT5Manager", "MarketDataProvider"]
+__all__ = ["MT5Manager", "MarketDataProvider", "BarWindow"]
@@ -0,0 +1,60 @@
+"""
+Dtype and index normalization for loaded OHLC frames.
+"""
+
+import numpy as np
+import pandas as pd
+
+# price columns stored as float32 by ``downcast_ohlc``
+PRICE_COLUMNS = ['open', 'high', 'low', 'close']
+
+
+def downcast_ohlc(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink an OHLC frame for in-memory use.
+    
+    Prices become float32 (about 7 significant digits, enough for FX
+    quotes), non-negative integer columns such as volumes take the
+    smallest unsigned type that holds them, and string columns (symbol,
+    side, ...) become categoricals. Only the price cast is lossy.
+    
+    Args:
+        df: OHLC DataFrame
+    
+    Returns:
+        New DataFrame sharing the index of ``df``
+    """
+    dtypes = {}
+    for name, dtype in df.dtypes.items():
+        if name in PRICE_COLUMNS:
+            dtypes[name] = np.float32
+        elif dtype == object:
+            dtypes[name] = 'category'
+    df = df.astype(dtypes)
+    
+    for name in df.select_dtypes(include='integer').columns:
+        df[name] = pd.to_numeric(df[name], downcast='unsigned')
+    
+    return df
+
+
+def sorted_unique_index(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ensure the time index is increasing with no repeated timestamps.
+    
+    Label slices (``df.loc[start:end]``) on a monotonic index are binary
+    searches; on an unsorted one pandas falls back to scanning. Rows are
+    sorted stably and, for a repeated timestamp, the first row is kept.
+    
+    Args:
+        df: DataFrame with a datetime index
+    
+    Returns:
+        ``df`` itself when already sorted and unique, otherwise a new frame
+    """
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index(kind='stable')
+    if not df.index.is_unique:
+        df = df[~df.index.duplicated(keep='first')]
+    return df
+
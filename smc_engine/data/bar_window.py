@@ -0,0 +1,134 @@
+"""
+Fixed-length window of the most recent bars, for the live trading loop.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+class BarWindow:
+    """
+    The newest ``capacity`` bars of a stream, updated in place.
+
+    Each column lives in a preallocated array of twice the capacity and the
+    window is a contiguous slice of it, so appending a bar is a single
+    write and ``frame`` builds its DataFrame over views, with no concat,
+    de-duplication or tail copy per bar. When the slice reaches the end of
+    the arrays, the window is moved back to the front in one copy (once
+    every ``capacity`` bars).
+
+    Bars must arrive in time order. A bar with the same timestamp as the
+    newest one replaces it (a refetched, still-forming bar); older bars are
+    ignored.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: Number of bars kept
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = capacity
+        self._columns: Optional[dict] = None
+        self._times: Optional[np.ndarray] = None
+        self._tz = None
+        self._index_name = None
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def last_ts(self) -> Optional[pd.Timestamp]:
+        """Timestamp of the newest bar, or None while empty."""
+        if not len(self):
+            return None
+        return pd.Timestamp(self._times[self._end - 1], tz=self._tz)
+
+    def update(self, bars: pd.DataFrame) -> int:
+        """
+        Add bars (datetime-indexed, same columns on every call).
+
+        Args:
+            bars: New bars, oldest first; may repeat the newest bar held
+
+        Returns:
+            Number of bars appended (a replaced newest bar is not counted)
+        """
+        if bars is None or bars.empty:
+            return 0
+        if self._columns is None:
+            self._allocate(bars)
+
+        times = bars.index.tz_convert(self._tz).asi8 if self._tz is not None else bars.index.asi8
+        values = [bars[name].to_numpy() for name in self._columns]
+
+        # first row newer than the window, and a possible overwrite of its last bar
+        first = 0
+        if len(self):
+            last = self._times[self._end - 1]
+            first = int(np.searchsorted(times, last, side='right'))
+            if first > 0 and times[first - 1] == last:
+                for column, source in zip(self._columns.values(), values):
+                    column[self._end - 1] = source[first - 1]
+
+        new = len(times) - first
+        if new <= 0:
+            return 0
+
+        # only the newest ``capacity`` rows can end up in the window
+        skip = max(new - self.capacity, 0)
+        first += skip
+        new -= skip
+
+        keep = min(len(self), self.capacity - new)
+        if self._end + new > len(self._times):
+            # slide the kept bars back to the front of the arrays
+            lo = self._end - keep
+            for column in (*self._columns.values(), self._times):
+                column[:keep] = column[lo:self._end]
+            self._start, self._end = 0, keep
+
+        for column, source in zip(self._columns.values(), values):
+            column[self._end:self._end + new] = source[first:]
+        self._times[self._end:self._end + new] = times[first:]
+        self._end += new
+        self._start = self._end - min(len(self), self.capacity)
+        return new + skip
+
+    def frame(self) -> pd.DataFrame:
+        """
+        The window as a DataFrame over views of the buffers.
+
+        The frame is only valid until the next ``update``; copy it to keep it.
+        Its arrays are read-only, so in-place writes raise instead of
+        corrupting the buffers.
+        """
+        if self._columns is None:
+            return pd.DataFrame()
+        window = slice(self._start, self._end)
+        columns = {}
+        for name, column in self._columns.items():
+            view = column[window]
+            view.flags.writeable = False
+            columns[name] = view
+        index = pd.DatetimeIndex(self._times[window].view('datetime64[ns]'), name=self._index_name)
+        if self._tz is not None:
+            index = index.tz_localize('UTC').tz_convert(self._tz)
+        return pd.DataFrame(columns, index=index, copy=False)
+
+    def _allocate(self, bars: pd.DataFrame):
+        """Size the buffers from the first batch's columns and dtypes."""
+        size = 2 * self.capacity
+        self._tz = bars.index.tz
+        self._index_name = bars.index.name
+        self._times = np.empty(size, dtype=np.int64)
+        # extension dtypes (e.g. categoricals) are held as objects
+        self._columns = {
+            name: np.empty(size, dtype=dtype if isinstance(dtype, np.dtype) else object)
+            for name, dtype in bars.dtypes.items()
+        }
@@ -2,16 +2,113 @@
 Market data provider - unified interface for CSV, DB, and MT5 data.
 """
 
+import hashlib
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
 from pathlib import Path
+from collections import OrderedDict
+from functools import lru_cache
 from datetime import datetime
 from typing import Optional, Literal
 import logging
 
-from .mt5_manager import MT5Manager
+from ..config import settings
+from .mt5_manager import MT5Manager, TIMEFRAME_SECONDS
+from ._dtypes import downcast_ohlc, sorted_unique_index
 
 logger = logging.getLogger(__name__)
 
+# Column types pinned when parsing CSVs with Arrow; other columns are inferred.
+# ``time`` is parsed naive (Arrow rejects offset-less strings for a zoned
+# type) and tagged as UTC before conversion, see ``_utc_time``.
+CSV_COLUMN_TYPES = {
+    'time': pa.timestamp('ns'),
+    'open': pa.float64(),
+    'high': pa.float64(),
+    'low': pa.float64(),
+    'close': pa.float64(),
+}
+
+# Files above this size are parsed in blocks rather than in one piece
+LARGE_CSV_BYTES = 200 * 1024 * 1024
+CSV_BLOCK_BYTES = 64 * 1024 * 1024
+CSV_CHUNK_ROWS = 500_000
+
+# Parsed CSV frames kept in memory across providers
+CSV_MEMO_SIZE = 16
+
+# MT5 history frames (closed date ranges) kept per provider
+HISTORY_MEMO_SIZE = 8
+
+# Parquet cache directories that failed a write; not retried in this process
+_unwritable_cache_dirs: set = set()
+
+
+def _utc_time(table: pa.Table) -> pa.Table:
+    """
+    Mark the naive ``time`` column of a parsed CSV as UTC.
+    
+    A metadata-only cast (values are already UTC epoch offsets), so pandas
+    receives a zoned column and needs no ``tz_localize`` pass.
+    """
+    i = table.schema.get_field_index('time')
+    if i < 0 or not pa.types.is_timestamp(table.schema.field(i).type) or table.schema.field(i).type.tz:
+        return table
+    return table.set_column(i, 'time', table.column(i).cast(pa.timestamp('ns', tz='UTC')))
+
+
+def _read_only(df: pd.DataFrame) -> pd.DataFrame:
+    """Rebuild ``df`` over read-only column arrays, without copying data."""
+    columns = {}
+    for name, column in df.items():
+        if not isinstance(column.dtype, np.dtype):
+            # extension arrays (e.g. categoricals) have no writeable flag
+            columns[name] = column.array
+            continue
+        values = column.to_numpy()
+        values.flags.writeable = False
+        columns[name] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def _is_closed_range(end: Optional[datetime], timeframe: str) -> bool:
+    """
+    True if the bars up to ``end`` (naive values are UTC) no longer change.
+    
+    The last bar opening at or before ``end`` is only closed once a full
+    ``timeframe`` period has passed, so ``end`` must be at least that far
+    in the past. Unknown timeframes are treated as open.
+    """
+    if end is None or timeframe not in TIMEFRAME_SECONDS:
+        return False
+    try:
+        end_ts = pd.Timestamp(end)
+    except (TypeError, ValueError):
+        return False
+    if end_ts.tzinfo is None:
+        end_ts = end_ts.tz_localize('UTC')
+    return end_ts <= pd.Timestamp.now(tz='UTC') - pd.Timedelta(seconds=TIMEFRAME_SECONDS[timeframe])
+
+
+def _parquet_cache_path(csv_path: Path, cache_dir: str) -> Path:
+    """Parquet copy of ``csv_path`` in ``cache_dir``, named uniquely per resolved CSV path."""
+    digest = hashlib.sha1(str(csv_path.resolve()).encode()).hexdigest()[:16]
+    return Path(cache_dir) / f"{csv_path.stem}-{digest}.parquet"
+
+
+@lru_cache(maxsize=CSV_MEMO_SIZE)
+def _load_csv_shared(csv_path: str, mtime_ns: int, parquet_cache_dir: Optional[str], use_float32: bool) -> pd.DataFrame:
+    """
+    Load a CSV once per (path, modification time); callers share the result.
+    
+    The frame's arrays are read-only, so in-place writes raise instead of
+    leaking into other callers' data.
+    """
+    provider = MarketDataProvider(source='csv', parquet_cache_dir=parquet_cache_dir or '', use_float32=use_float32)
+    return _read_only(provider._load_from_csv(csv_path))
+
 
 class MarketDataProvider:
     """
@@ -23,18 +120,33 @@ class MarketDataProvider:
     - MT5 live data
     """
     
-    def __init__(self, source: Literal['csv', 'db', 'mt5'] = 'csv'):
+    def __init__(
+        self,
+        source: Literal['csv', 'db', 'mt5'] = 'csv',
+        parquet_cache_dir: Optional[str] = None,
+        use_float32: bool = False
+    ):
         """
         Initialize market data provider.
         
         Args:
             source: Data source type
+            parquet_cache_dir: Directory for ``.parquet`` copies of parsed
+                CSVs, loaded while newer than the CSV. Defaults to
+                ``settings.parquet_cache_dir``; no cache when unset or empty
+            use_float32: Return float32 prices and compact volume/string
+                columns (see ``downcast_ohlc``); halves the frame's memory
         """
         self.source = source
+        self.parquet_cache_dir = settings.parquet_cache_dir if parquet_cache_dir is None else parquet_cache_dir
+        self.use_float32 = use_float32
         self.mt5_manager = None
         
+        # (symbol, timeframe, start, end) -> read-only MT5 history frame
+        self._history_memo: OrderedDict = OrderedDict()
+        
         if source == 'mt5':
-            self.mt5_manager = MT5Manager(dry_run=False)
+            self.mt5_manager = MT5Manager(dry_run=False, use_float32=use_float32)
     
     def get_data(
         self,
@@ -42,7 +154,8 @@ class MarketDataProvider:
         timeframe: str,
         start: Optional[datetime] = None,
         end: Optional[datetime] = None,
-        csv_path: Optional[str] = None
+        csv_path: Optional[str] = None,
+        memoize: bool = True
     ) -> pd.DataFrame:
         """
         Get OHLC data from configured source.
@@ -53,21 +166,45 @@ class MarketDataProvider:
             start: Start datetime
             end: End datetime
             csv_path: Path to CSV file (for csv source)
+            memoize: Look up and store MT5 history in the memo; pass False
+                for one-off ranges (e.g. live polling) that never repeat
         
         Returns:
-            DataFrame with OHLC data and datetime index
+            DataFrame with OHLC data and datetime index. CSV data and MT5
+            history for past date ranges are memoized and read-only; copy
+            it before modifying values in place.
         """
         if self.source == 'csv':
-            return self._load_from_csv(csv_path)
+            path = Path(csv_path) if csv_path else None
+            if path is None or not path.exists():
+                return self._load_from_csv(csv_path)
+            
+            # Unchanged files are parsed once; the mtime in the key picks up
+            # rewrites. A shallow copy keeps added columns out of the cache.
+            df = _load_csv_shared(str(path.resolve()), path.stat().st_mtime_ns, self.parquet_cache_dir, self.use_float32)
+            return df.copy(deep=False)
         
         elif self.source == 'mt5':
             if self.mt5_manager is None:
                 raise RuntimeError(f"MT5 manager not initialized: ")
             
+            key = (symbol, timeframe, str(start), str(end))
+            df = self._history_memo.get(key) if memoize else None
+            if df is not None:
+                self._history_memo.move_to_end(key)
+                return df.copy(deep=False)
+            
             if not self.mt5_manager.connected:
                 self.mt5_manager.connect()
             
-            return self.mt5_manager.get_historical(symbol, timeframe, start, end)
+            df = self.mt5_manager.get_historical(symbol, timeframe, start, end)
+            if not memoize or not _is_closed_range(end, timeframe):
+                return df
+            
+            self._history_memo[key] = df = _read_only(df)
+            if len(self._history_memo) > HISTORY_MEMO_SIZE:
+                self._history_memo.popitem(last=False)
+            return df.copy(deep=False)
         
         elif self.source == 'db':
             # Placeholder for database query
@@ -97,7 +234,14 @@ class MarketDataProvider:
         if not path.exists():
             raise FileNotFoundError(f"CSV file not found: {csv_path}")
         
-        df = pd.read_csv(csv_path)
+        # Parsed copy from an earlier load, unless the CSV changed since
+        cache = _parquet_cache_path(path, self.parquet_cache_dir) if self.parquet_cache_dir else None
+        if cache is not None and cache.exists() and cache.stat().st_mtime >= path.stat().st_mtime:
+            df = pd.read_parquet(cache, engine='pyarrow', memory_map=True).set_index('time')
+            logger.info(f"Loaded {len(df)} bars from {cache}")
+            return downcast_ohlc(df) if self.use_float32 else df
+        
+        df = self._read_csv(path)
         
         # Ensure required columns
         required = ['time', 'open', 'high', 'low', 'close']
@@ -105,14 +249,79 @@ class MarketDataProvider:
         if missing:
             raise ValueError(f"Missing required columns: {missing}")
         
-        # Parse time column
-        df['time'] = pd.to_datetime(df['time'])
+        # Parse time column (already typed, and zoned, when Arrow parsed the file)
+        if not pd.api.types.is_datetime64_any_dtype(df['time']):
+            df['time'] = pd.to_datetime(df['time'])
         df.set_index('time', inplace=True)
         
         # Ensure timezone awareness
         if df.index.tz is None:
             df.index = df.index.tz_localize('UTC')
         
+        # Sorted, unique index so label slices are binary searches
+        df = sorted_unique_index(df)
+        
         logger.info(f"Loaded {len(df)} bars from {csv_path}")
         
-        return df
+        if cache is not None and self.parquet_cache_dir not in _unwritable_cache_dirs:
+            try:
+                cache.parent.mkdir(parents=True, exist_ok=True)
+                df.reset_index().to_parquet(cache, engine='pyarrow', compression='snappy', index=False)
+            except (OSError, ValueError, TypeError) as e:
+                _unwritable_cache_dirs.add(self.parquet_cache_dir)
+                logger.warning(
+                    f"Could not write parquet cache {cache}: {e}. Parquet caching to "
+                    f"{self.parquet_cache_dir} is off for this run; check PARQUET_CACHE_DIR."
+                )
+        
+        # the parquet copy above keeps full precision
+        return downcast_ohlc(df) if self.use_float32 else df
+    
+    def _read_csv(self, path: Path) -> pd.DataFrame:
+        """
+        Parse a CSV file with Arrow's multithreaded reader.
+        
+        OHLC and time columns are converted straight to their final types,
+        skipping pandas' per-column inference. Files Arrow cannot convert
+        (e.g. non-ISO timestamps or offsets) fall back to ``pd.read_csv``.
+        Files over ``LARGE_CSV_BYTES`` are streamed block by block, so only
+        one block of raw parsed data is held next to the result.
+        
+        Args:
+            path: Path to CSV file
+        
+        Returns:
+            Raw DataFrame, ``time`` still a column
+        """
+        large = path.stat().st_size > LARGE_CSV_BYTES
+        convert_options = pa_csv.ConvertOptions(column_types=CSV_COLUMN_TYPES)
+        try:
+            # parse straight from the mapped file (page cache) rather than
+            # through a separate read buffer
+            with pa.memory_map(str(path), 'r') as source:
+                if large:
+                    return self._stream_csv(source, convert_options)
+                table = pa_csv.read_csv(source, convert_options=convert_options)
+        except pa.ArrowInvalid as e:
+            logger.debug(f"Arrow could not parse {path}, using pandas: {e}")
+            if not large:
+                return pd.read_csv(path)
+            chunks = pd.read_csv(path, chunksize=CSV_CHUNK_ROWS, cache_dates=True, low_memory=False)
+            return pd.concat(chunks, ignore_index=True, copy=False)
+        
+        return _utc_time(table).to_pandas(self_destruct=True, split_blocks=True)
+    
+    def _stream_csv(self, source: pa.NativeFile, convert_options: pa_csv.ConvertOptions) -> pd.DataFrame:
+        """Parse a large CSV one Arrow record batch at a time."""
+        reader = pa_csv.open_csv(
+            source,
+            read_options=pa_csv.ReadOptions(block_size=CSV_BLOCK_BYTES),
+            convert_options=convert_options
+        )
+        chunks = [
+            _utc_time(pa.Table.from_batches([batch])).to_pandas(self_destruct=True, split_blocks=True)
+            for batch in reader
+        ]
+        if not chunks:
+            return _utc_time(reader.schema.empty_table()).to_pandas()
+        return pd.concat(chunks, ignore_index=True, copy=False)
@@ -3,16 +3,50 @@ MetaTrader5 integration for live trading and historical data.
 """
 
 import MetaTrader5 as mt5
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, Literal
+from typing import Optional, Dict, Any, List, Literal, Callable
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import threading
+import time
 from dataclasses import dataclass
 
 from ..config import settings
+from ._dtypes import downcast_ohlc, sorted_unique_index
 
 logger = logging.getLogger(__name__)
 
+# concurrent history requests in get_historical_many
+HISTORY_WORKERS = 8
+
+# dry-run slippage / ticket draws generated per refill
+DRY_RUN_BUFFER_SIZE = 1024
+
+# seconds an mt5.account_info() snapshot is reused
+ACCOUNT_REFRESH_SECONDS = 1.0
+
+# largest margin / equity ratio at which new orders are allowed
+MAX_MARGIN_USAGE = 0.8
+
+# minimum seconds between repeats of the same safety-check warning
+SAFETY_WARNING_INTERVAL = 1.0
+
+# seconds between latest-bar checks of a bar subscription
+BAR_WATCH_INTERVAL = 0.25
+
+# bar length per timeframe, for wall-clock bar boundaries in dry-run mode
+TIMEFRAME_SECONDS = {
+    'M1': 60,
+    'M5': 300,
+    'M15': 900,
+    'M30': 1800,
+    'H1': 3600,
+    'H4': 14400,
+    'D1': 86400,
+}
+
 
 @dataclass
 class OrderResult:
@@ -25,6 +59,84 @@ class OrderResult:
     raw_response: Optional[Dict[str, Any]] = None
 
 
+class BarSubscription:
+    """
+    New-bar notifications for one symbol/timeframe.
+    
+    A daemon thread checks the open time of the newest bar every
+    ``interval`` seconds; when it advances, the previous bar has closed,
+    ``callback`` runs with the new bar's open time and ``wait`` returns.
+    """
+    
+    def __init__(
+        self,
+        latest_bar_time: Callable[[], Optional[int]],
+        callback: Optional[Callable[[pd.Timestamp], None]] = None,
+        interval: float = BAR_WATCH_INTERVAL
+    ):
+        """
+        Start watching.
+        
+        Args:
+            latest_bar_time: Returns the newest bar's open time (epoch
+                seconds), or None when unavailable
+            callback: Called from the watcher thread on every new bar
+            interval: Seconds between checks
+        """
+        self.last_bar_time: Optional[pd.Timestamp] = None
+        self._latest_bar_time = latest_bar_time
+        self._callback = callback
+        self._interval = interval
+        self._new_bar = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._watch, name="bar-subscription", daemon=True)
+        self._thread.start()
+    
+    def _watch(self):
+        # every terminal read and callback is guarded: an exception must not
+        # end the thread, or waiters would never be woken again
+        last = None
+        while True:
+            try:
+                current = self._latest_bar_time()
+                if current is not None:
+                    if last is not None and current > last:
+                        self.last_bar_time = pd.Timestamp(current, unit='s', tz='UTC')
+                        if self._callback is not None:
+                            try:
+                                self._callback(self.last_bar_time)
+                            except Exception:
+                                logger.exception("Bar subscription callback failed")
+                        self._new_bar.set()
+                    last = current
+            except Exception:
+                logger.exception("Bar subscription check failed")
+            if self._stopped.wait(self._interval):
+                return
+    
+    @property
+    def alive(self) -> bool:
+        """True while the watcher thread is running and not stopped."""
+        return self._thread.is_alive() and not self._stopped.is_set()
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a new bar opens (or ``timeout`` seconds pass).
+        
+        Returns:
+            True if a new bar arrived, False on timeout or after ``stop``
+        """
+        arrived = self._new_bar.wait(timeout) and not self._stopped.is_set()
+        self._new_bar.clear()
+        return arrived
+    
+    def stop(self):
+        """Stop the watcher thread and release any waiter."""
+        self._stopped.set()
+        self._new_bar.set()
+        self._thread.join()
+
+
 class MT5Manager:
     """
     MetaTrader5 connection and trading manager.
@@ -37,30 +149,67 @@ class MT5Manager:
     - Dry-run simulation mode
     """
     
-    def __init__(self, dry_run: bool = True):
+    def __init__(
+        self,
+        dry_run: bool = True,
+        use_float32: bool = False,
+        rng: Optional[np.random.Generator] = None
+    ):
         """
         Initialize MT5 manager.
         
         Args:
             dry_run: If True, simulate orders without actual execution
+            use_float32: Return historical data with float32 prices and
+                compact volume columns (see ``downcast_ohlc``)
+            rng: Random generator for dry-run slippage and tickets
+                (default: fresh, unseeded)
         """
         self.dry_run = dry_run
+        self.use_float32 = use_float32
         self.connected = False
         self.account_info = None
         
+        # dry-run fills draw slippage and tickets from buffered batches
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self._slip_buf = np.empty(0, dtype=np.float64)
+        self._ticket_buf = np.empty(0, dtype=np.int64)
+        self._draw_pos = 0
+        
+        # last account snapshot (named tuple) and its monotonic timestamp
+        self._account = None
+        self._account_ts = 0.0
+        
+        # last emission time of each safety-check warning
+        self._warned_at: Dict[str, float] = {}
+        
+        # broker symbol names and resolve_symbol results, per connection
+        self._symbol_names: Optional[List[str]] = None
+        self._symbol_cache: Dict[str, str] = {}
+        
         if not dry_run and not settings.validate_mt5_config():
             logger.warning("MT5 configuration incomplete. Running in dry-run mode.")
             self.dry_run = True
 
     def resolve_symbol(self, symbol):
-        """Try to find the actual broker symbol (handles suffixes like EURUSDm)."""
-        all_symbols = mt5.symbols_get()
-        if not all_symbols:
-            return symbol
-        for s in all_symbols:
-            if s.name.startswith(symbol):
-                return s.name
-        return symbol
+        """
+        Try to find the actual broker symbol (handles suffixes like EURUSDm).
+        
+        The terminal's symbol list is fetched once per connection and each
+        resolved name is remembered, so repeated lookups skip the IPC call.
+        """
+        if symbol in self._symbol_cache:
+            return self._symbol_cache[symbol]
+        
+        if self._symbol_names is None:
+            all_symbols = mt5.symbols_get()
+            if not all_symbols:
+                return symbol
+            self._symbol_names = [s.name for s in all_symbols]
+        
+        resolved = next((name for name in self._symbol_names if name.startswith(symbol)), symbol)
+        self._symbol_cache[symbol] = resolved
+        return resolved
     
     def connect(self) -> bool:
         """
@@ -118,6 +267,9 @@ class MT5Manager:
             logger.info("Disconnected from MT5")
         
         self.connected = False
+        self._symbol_names = None
+        self._symbol_cache.clear()
+        self._account = None
     
     def get_historical(
         self,
@@ -190,19 +342,111 @@ class MT5Manager:
             error = mt5.last_error()
             raise RuntimeError(f"Failed to get historical data: {error}")
         
-        # Convert to DataFrame
-        df = pd.DataFrame(rates)
-        df['time'] = pd.to_datetime(df['time'], unit='s')
-        df.set_index('time', inplace=True)
+        # Convert to DataFrame: epoch seconds cast straight to datetime64;
+        # each other field of the row-major rates array is copied once into
+        # its own contiguous column, which pandas then adopts as-is
+        index = pd.DatetimeIndex(
+            rates['time'].astype('datetime64[s]').astype('datetime64[ns]'), name='time'
+        ).tz_localize('UTC')
+        df = pd.DataFrame(
+            {name: np.ascontiguousarray(rates[name]) for name in rates.dtype.names if name != 'time'},
+            index=index,
+            copy=False
+        )
+        df = sorted_unique_index(df)
         
-        # Ensure timezone awareness
-        if df.index.tz is None:
-            df.index = df.index.tz_localize('UTC')
+        if self.use_float32:
+            df = downcast_ohlc(df)
         
         logger.info(f"Retrieved {len(df)} bars for {symbol} {timeframe}")
         
         return df
     
+    def get_historical_many(
+        self,
+        symbols: List[str],
+        timeframe: str,
+        start: datetime,
+        end: datetime,
+        max_workers: int = HISTORY_WORKERS
+    ) -> pd.DataFrame:
+        """
+        Retrieve historical OHLC data for several symbols at once.
+        
+        Requests run on a thread pool so the terminal round trips overlap;
+        the frames are concatenated once at the end.
+        
+        Args:
+            symbols: Trading symbols
+            timeframe: Timeframe (see ``get_historical``)
+            start: Start datetime
+            end: End datetime
+            max_workers: Concurrent requests
+        
+        Returns:
+            DataFrame indexed by (symbol, time), symbols in the given order
+        
+        Raises:
+            ValueError / RuntimeError: As ``get_historical``, for the first
+                failing symbol
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return pd.DataFrame()
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(symbols))) as executor:
+            futures = [
+                executor.submit(self.get_historical, symbol, timeframe, start, end)
+                for symbol in symbols
+            ]
+            frames = {symbol: future.result() for symbol, future in zip(symbols, futures)}
+        
+        return pd.concat(frames, names=['symbol'], copy=False)
+    
+    def subscribe_bars(
+        self,
+        symbol: str,
+        timeframe: str,
+        callback: Optional[Callable[[pd.Timestamp], None]] = None
+    ) -> BarSubscription:
+        """
+        Get notified whenever a new bar opens (i.e. the previous one closed).
+        
+        The MT5 Python API has no push notifications, so a background thread
+        reads the newest bar's open time from the terminal (a local call)
+        every ``BAR_WATCH_INTERVAL`` seconds. In dry-run mode bars follow
+        the wall clock.
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe (see ``get_historical``)
+            callback: Called from the watcher thread with each new bar's
+                open time
+        
+        Returns:
+            Running BarSubscription; call ``stop`` when done
+        
+        Raises:
+            ValueError: If timeframe invalid
+        """
+        if timeframe not in TIMEFRAME_SECONDS:
+            raise ValueError(f"Invalid timeframe: {timeframe}")
+        
+        if self.dry_run:
+            period = TIMEFRAME_SECONDS[timeframe]
+            
+            def latest_bar_time() -> Optional[int]:
+                return int(time.time()) // period * period
+        else:
+            symbolm = self.resolve_symbol(symbol)
+            tf = getattr(mt5, f"TIMEFRAME_{timeframe}")
+            
+            def latest_bar_time() -> Optional[int]:
+                rates = mt5.copy_rates_from_pos(symbolm, tf, 0, 1)
+                return int(rates['time'][-1]) if rates is not None and len(rates) else None
+        
+        return BarSubscription(latest_bar_time, callback)
+    
     def place_order(
         self,
         symbol: str,
@@ -350,19 +594,14 @@ class MT5Manager:
         
         Returns expected fill price and simulated ticket.
         """
-        import random
-        
         # Simulate price if not provided
         if price is None:
             price = 1.1000  # Dummy price
         
-        # Simulate slippage
-        slippage_pips = random.uniform(-2, 2) / 10000
+        # Simulated slippage (+/-2 pips) and fake ticket
+        slippage_pips, ticket = self._next_dry_run_draw()
         fill_price = price + slippage_pips
         
-        # Generate fake ticket
-        ticket = random.randint(100000, 999999)
-        
         logger.info(f"[DRY-RUN] Order simulated: {side} {volume} {symbol} @ {fill_price}")
         
         return OrderResult(
@@ -373,6 +612,16 @@ class MT5Manager:
             message="Order simulated (dry-run mode)"
         )
     
+    def _next_dry_run_draw(self):
+        """Next (slippage, ticket) pair from the buffers, refilling them when exhausted."""
+        if self._draw_pos >= len(self._slip_buf):
+            self._slip_buf = self.rng.uniform(-2, 2, size=DRY_RUN_BUFFER_SIZE) / 10000
+            self._ticket_buf = self.rng.integers(100000, 999999, size=DRY_RUN_BUFFER_SIZE, endpoint=True)
+            self._draw_pos = 0
+        i = self._draw_pos
+        self._draw_pos += 1
+        return float(self._slip_buf[i]), int(self._ticket_buf[i])
+    
     def close_position(self, ticket: Optional[int] = None, symbol: Optional[str] = None) -> OrderResult:
         """
         Close an open position.
@@ -430,15 +679,26 @@ class MT5Manager:
                 'leverage': 100
             }
         
-        if not self.connected:
-            return None
-        
-        account = mt5.account_info()
+        account = self._account_snapshot()
         if account is None:
             return None
         
         return account._asdict()
     
+    def _account_snapshot(self):
+        """
+        Live account named tuple, fetched at most every
+        ``ACCOUNT_REFRESH_SECONDS``; None when unavailable.
+        """
+        if not self.connected:
+            return None
+        
+        now = time.monotonic()
+        if self._account is None or now - self._account_ts >= ACCOUNT_REFRESH_SECONDS:
+            self._account = mt5.account_info()
+            self._account_ts = now
+        return self._account
+    
     def _check_trading_allowed(self) -> bool:
         """
         Check if trading is allowed based on safety rules.
@@ -446,18 +706,20 @@ class MT5Manager:
         Returns:
             True if trading allowed, False otherwise
         """
-        if not settings.live_trading and not self.dry_run:
-            logger.warning("Live trading disabled in settings")
+        if self.dry_run:
+            # dry-run accounts are flat: no margin in use
+            return True
+        
+        if not settings.live_trading:
+            self._throttled_warning("Live trading disabled in settings")
             return False
         
-        # Check account info
-        account = self.get_account_info()
+        # Check account info and margin
+        account = self._account_snapshot()
         if account is None:
             return False
-        
-        # Check margin
-        if account['margin'] > account['equity'] * 0.8:
-            logger.warning("Margin usage too high")
+        if account.margin > account.equity * MAX_MARGIN_USAGE:
+            self._throttled_warning("Margin usage too high")
             return False
         
         # Additional checks can be added here
@@ -466,3 +728,13 @@ class MT5Manager:
         # - News times
         
         return True
+    
+    def _throttled_warning(self, message: str):
+        """Log ``message`` at most once per ``SAFETY_WARNING_INTERVAL``."""
+        if not logger.isEnabledFor(logging.WARNING):
+            return
+        now = time.monotonic()
+        if now - self._warned_at.get(message, -SAFETY_WARNING_INTERVAL) >= SAFETY_WARNING_INTERVAL:
+            self._warned_at[message] = now
+            logger.warning(message)
+
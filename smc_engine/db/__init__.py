@@ -1,6 +1,6 @@
 """Database models and session management."""
 
-from .db import get_session, init_db
+from .db import get_session, init_db, bulk_insert, batched_writes
 from .models import (
     Strategy,
     StrategyParameter,
@@ -15,6 +15,8 @@ from .models import (
 __all__ = [
     "get_session",
     "init_db",
+    "bulk_insert",
+    "batched_writes",
     "Strategy",
     "StrategyParameter",
     "Backtest",
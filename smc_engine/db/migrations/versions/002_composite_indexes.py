@@ -0,0 +1,41 @@
+"""Composite indexes for per-run trade and trial queries
+
+Revision ID: 002
+Revises: 001
+Create Date: 2024-02-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Trades are read per backtest in entry order (equity curve rebuilds):
+    # one (backtest_id, entry_ts) index serves the filter and the sort, and
+    # its prefix replaces the single-column backtest_id index
+    op.drop_index('ix_backtest_trades_entry_ts', table_name='backtest_trades')
+    op.drop_index('ix_backtest_trades_backtest_id', table_name='backtest_trades')
+    op.create_index(
+        'ix_backtest_trades_backtest_id_entry_ts', 'backtest_trades', ['backtest_id', 'entry_ts']
+    )
+    
+    # Best trials of a run, highest value first
+    op.drop_index('ix_optimization_trials_optimization_id', table_name='optimization_trials')
+    op.create_index(
+        'ix_optimization_trials_opt_value', 'optimization_trials', ['optimization_id', sa.text('value DESC')]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_optimization_trials_opt_value', table_name='optimization_trials')
+    op.create_index('ix_optimization_trials_optimization_id', 'optimization_trials', ['optimization_id'])
+    
+    op.drop_index('ix_backtest_trades_backtest_id_entry_ts', table_name='backtest_trades')
+    op.create_index('ix_backtest_trades_backtest_id', 'backtest_trades', ['backtest_id'])
+    op.create_index('ix_backtest_trades_entry_ts', 'backtest_trades', ['entry_ts'])
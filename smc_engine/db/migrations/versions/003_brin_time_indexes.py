@@ -0,0 +1,38 @@
+"""BRIN indexes on append-only timestamp columns (PostgreSQL)
+
+Revision ID: 003
+Revises: 002
+Create Date: 2024-02-01 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+# (index, table, column) written in time order, so a block-range index
+# is a fraction of a B-tree's size and still prunes time-range scans
+TIME_INDEXES = [
+    ('ix_actions_log_timestamp', 'actions_log', 'timestamp'),
+    ('ix_backtests_created_at', 'backtests', 'created_at'),
+]
+
+
+def upgrade() -> None:
+    # other dialects have no BRIN and keep their B-tree indexes
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for name, table, column in TIME_INDEXES:
+        op.drop_index(name, table_name=table)
+        op.create_index(name, table, [column], postgresql_using='brin')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for name, table, column in TIME_INDEXES:
+        op.drop_index(name, table_name=table)
+        op.create_index(name, table, [column])
@@ -0,0 +1,101 @@
+"""Partition backtest_trades and actions_log by month (PostgreSQL)
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-02-01 00:00:00.000000
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+# months of empty partitions created ahead of the current one; later
+# months land in the DEFAULT partition until a partition is added for them
+MONTHS_AHEAD = 3
+
+# table -> (partition column, foreign keys, (index, columns, using) ...)
+PARTITIONED = {
+    'backtest_trades': (
+        'entry_ts',
+        [('backtest_trades_backtest_id_fkey', 'backtest_id', 'backtests', 'id')],
+        [('ix_backtest_trades_backtest_id_entry_ts', ['backtest_id', 'entry_ts'], None)],
+    ),
+    'actions_log': (
+        'timestamp',
+        [],
+        [
+            ('ix_actions_log_timestamp', ['timestamp'], 'brin'),
+            ('ix_actions_log_action_type', ['action_type'], None),
+        ],
+    ),
+}
+
+
+def _add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def _swap_in(table: str, partitioned: bool) -> None:
+    """
+    Rebuild ``table`` as a partitioned (or plain) table with the same
+    columns and rows. The old table is dropped before keys and indexes are
+    recreated, since their names move with it on rename.
+    """
+    bind = op.get_bind()
+    column, foreign_keys, indexes = PARTITIONED[table]
+    old = f'{table}_old'
+    
+    op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    if partitioned:
+        op.execute(
+            f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+            f'PARTITION BY RANGE ("{column}")'
+        )
+        first = bind.execute(sa.text(f'SELECT min("{column}") FROM {old}')).scalar()
+        today = date.today().replace(day=1)
+        month = (first.date() if first else today).replace(day=1)
+        while month <= _add_months(today, MONTHS_AHEAD):
+            upper = _add_months(month, 1)
+            op.execute(
+                f'CREATE TABLE {table}_{month:%Y_%m} PARTITION OF {table} '
+                f"FOR VALUES FROM ('{month}') TO ('{upper}')"
+            )
+            month = upper
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+    else:
+        op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    
+    op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+    op.execute(f'DROP TABLE {old} CASCADE')
+    
+    # partitioned primary keys must include the partition column
+    key = ['id', column] if partitioned else ['id']
+    op.create_primary_key(f'{table}_pkey', table, key)
+    for name, local, remote_table, remote in foreign_keys:
+        op.create_foreign_key(name, table, remote_table, [local], [remote])
+    for name, columns, using in indexes:
+        op.create_index(name, table, columns, postgresql_using=using)
+
+
+def upgrade() -> None:
+    # declarative partitioning is PostgreSQL-only; other dialects keep
+    # plain tables
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in PARTITIONED:
+        _swap_in(table, partitioned=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table in PARTITIONED:
+        _swap_in(table, partitioned=False)
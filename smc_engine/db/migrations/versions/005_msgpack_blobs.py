@@ -0,0 +1,63 @@
+"""Store write-only JSON blobs as msgpack bytes
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-02-01 00:00:00.000000
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+import msgpack
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+# (table, column) blobs that are written and read back whole, never queried
+PACKED_COLUMNS = [
+    ('live_trades', 'raw_mt5_response'),
+    ('backtest_trades', 'meta'),
+    ('actions_log', 'payload'),
+]
+
+# rows read and converted per batch
+BATCH_SIZE = 1000
+
+
+def _convert(table: str, column: str, new_type, encode) -> None:
+    """Rewrite ``column`` as ``new_type`` with every value passed through ``encode``."""
+    bind = op.get_bind()
+    tmp = f'{column}_new'
+    op.add_column(table, sa.Column(tmp, new_type))
+    
+    # keyset pagination on the (UUID) primary key: one batch in memory at a
+    # time, whatever the table size
+    page = f'SELECT id, "{column}" FROM {table} WHERE "{column}" IS NOT NULL'
+    first = sa.text(f'{page} ORDER BY id LIMIT :n')
+    after = sa.text(f'{page} AND id > :last ORDER BY id LIMIT :n')
+    update = sa.text(f'UPDATE {table} SET "{tmp}" = :value WHERE id = :id')
+    batch = bind.execute(first, {'n': BATCH_SIZE}).fetchall()
+    while batch:
+        bind.execute(update, [{'id': row[0], 'value': encode(row[1])} for row in batch])
+        batch = bind.execute(after, {'last': batch[-1][0], 'n': BATCH_SIZE}).fetchall()
+    
+    op.drop_column(table, column)
+    op.alter_column(table, tmp, new_column_name=column)
+
+
+def upgrade() -> None:
+    for table, column in PACKED_COLUMNS:
+        _convert(table, column, sa.LargeBinary, lambda value: msgpack.packb(value, use_bin_type=True))
+
+
+def downgrade() -> None:
+    for table, column in PACKED_COLUMNS:
+        _convert(
+            table, column, JSONB,
+            lambda value: json.dumps(msgpack.unpackb(value, raw=False))
+        )
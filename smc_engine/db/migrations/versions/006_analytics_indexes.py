@@ -0,0 +1,33 @@
+"""Composite indexes for ordered trade curves and per-strategy backtests
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-02-01 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # PnL curves read a backtest's trades in trade order
+    op.create_index(
+        'ix_backtest_trades_backtest_id_trade_index', 'backtest_trades', ['backtest_id', 'trade_index']
+    )
+    
+    # A strategy's backtests by test window; the prefix replaces the
+    # single-column strategy_id index
+    op.drop_index('ix_backtests_strategy_id', table_name='backtests')
+    op.create_index('ix_backtests_strategy_id_start_date', 'backtests', ['strategy_id', 'start_date'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_backtests_strategy_id_start_date', table_name='backtests')
+    op.create_index('ix_backtests_strategy_id', 'backtests', ['strategy_id'])
+    
+    op.drop_index('ix_backtest_trades_backtest_id_trade_index', table_name='backtest_trades')
@@ -2,18 +2,167 @@
 SQLAlchemy database models for SMC trading engine.
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, ForeignKey, Boolean, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, ForeignKey, Boolean, Text, Index, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import TypeDecorator
 from datetime import datetime
-import uuid
+import os
+import sqlite3
+import threading
+import time
+from typing import List
+import msgpack
+import numpy as np
 
 Base = declarative_base()
 
+# Random bytes fetched per os.urandom call: 10 per id, 256 ids per refill
+UUID_RANDOM_BYTES = 10
+UUID_POOL_BYTES = UUID_RANDOM_BYTES * 256
+
+_uuid_pool = b""
+_uuid_pos = 0
+_uuid_lock = threading.Lock()
+
 
 def generate_uuid():
-    """Generate UUID string."""
-    return str(uuid.uuid4())
+    """
+    Generate a UUIDv7 string.
+    
+    The leading 48 bits are the Unix time in milliseconds, so ids created
+    together sort together and primary-key inserts append to the index
+    instead of landing on random pages. The remaining 74 bits are random,
+    sliced from a pooled ``os.urandom`` buffer rather than one syscall per
+    id.
+    """
+    global _uuid_pool, _uuid_pos
+    
+    with _uuid_lock:
+        if _uuid_pos + UUID_RANDOM_BYTES > len(_uuid_pool):
+            _uuid_pool = os.urandom(UUID_POOL_BYTES)
+            _uuid_pos = 0
+        rand = _uuid_pool[_uuid_pos:_uuid_pos + UUID_RANDOM_BYTES]
+        _uuid_pos += UUID_RANDOM_BYTES
+    
+    # unix_ts_ms(48) | ver=7(4) | rand_a(12) | var=0b10(2) | rand_b(62)
+    h = (
+        (time.time_ns() // 1_000_000).to_bytes(6, "big")
+        + bytes((0x70 | rand[0] & 0x0F, rand[1], 0x80 | rand[2] & 0x3F))
+        + rand[3:]
+    ).hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def generate_uuids(n: int) -> List[str]:
+    """
+    ``n`` UUIDv7 strings, laid out like ``generate_uuid``.
+    
+    The 16-byte ids are assembled as one (n, 16) array from a single
+    ``os.urandom`` call and hex-encoded in one pass, for bulk inserts.
+    """
+    raw = np.empty((n, 16), dtype=np.uint8)
+    raw[:, :6] = np.frombuffer((time.time_ns() // 1_000_000).to_bytes(6, "big"), dtype=np.uint8)
+    raw[:, 6:] = np.frombuffer(os.urandom(UUID_RANDOM_BYTES * n), dtype=np.uint8).reshape(n, UUID_RANDOM_BYTES)
+    raw[:, 6] = 0x70 | raw[:, 6] & 0x0F
+    raw[:, 8] = 0x80 | raw[:, 8] & 0x3F
+    
+    h = raw.tobytes().hex()
+    return [
+        f"{h[i:i + 8]}-{h[i + 8:i + 12]}-{h[i + 12:i + 16]}-{h[i + 16:i + 20]}-{h[i + 20:i + 32]}"
+        for i in range(0, 32 * n, 32)
+    ]
+
+
+class PackedJSON(TypeDecorator):
+    """
+    JSON-style value (dicts, lists, scalars) stored as msgpack bytes.
+    
+    For write-heavy blobs that are only read back whole: no JSON text
+    rendering or JSONB normalization per write, and smaller rows. Use
+    ``JSON`` for anything that needs to be queried or indexed.
+    """
+    impl = LargeBinary
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return msgpack.packb(value, use_bin_type=True)
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return msgpack.unpackb(value, raw=False)
+
+
+# SQLite 3.45 added the binary JSONB storage format and jsonb()
+SQLITE_JSONB = sqlite3.sqlite_version_info >= (3, 45, 0)
+
+
+class _JSONCast(FunctionElement):
+    """Single-argument wrapper typed as the column it converts."""
+    inherit_cache = True
+    
+    def __init__(self, expr, type_):
+        super().__init__(expr)
+        self.type = type_
+
+
+class _to_jsonb(_JSONCast):
+    """Bound JSON text, converted to binary JSONB where SQLite supports it."""
+    inherit_cache = True
+
+
+class _from_jsonb(_JSONCast):
+    """Stored JSON as text, rendering SQLite JSONB blobs back to text."""
+    inherit_cache = True
+
+
+@compiles(_to_jsonb)
+@compiles(_from_jsonb)
+def _compile_passthrough(element, compiler, **kw):
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(_to_jsonb, "sqlite")
+def _compile_sqlite_to_jsonb(element, compiler, **kw):
+    arg = compiler.process(element.clauses, **kw)
+    return f"jsonb({arg})" if SQLITE_JSONB else arg
+
+
+@compiles(_from_jsonb, "sqlite")
+def _compile_sqlite_from_jsonb(element, compiler, **kw):
+    arg = compiler.process(element.clauses, **kw)
+    return f"json({arg})" if SQLITE_JSONB else arg
+
+
+class JSONDocument(TypeDecorator):
+    """
+    Queryable JSON column kept in each backend's binary JSON format.
+    
+    PostgreSQL gets ``JSONB`` (as created by the migrations), SQLite >= 3.45
+    stores ``jsonb()`` blobs and renders them back with ``json()`` on
+    select, so SQL-side JSON functions skip re-parsing text. Older SQLite
+    and other backends store plain JSON text. Existing text rows stay
+    readable either way.
+    """
+    impl = JSON
+    cache_ok = True
+    
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(JSONB())
+        return dialect.type_descriptor(JSON())
+    
+    def bind_expression(self, bindvalue):
+        return _to_jsonb(bindvalue, self)
+    
+    def column_expression(self, column):
+        return _from_jsonb(column, self)
 
 
 class Strategy(Base):
@@ -24,7 +173,7 @@ class Strategy(Base):
     name = Column(String, nullable=False, unique=True)
     description = Column(Text)
     code_hash = Column(String)
-    default_params = Column(JSON)
+    default_params = Column(JSONDocument)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -40,7 +189,7 @@ class StrategyParameter(Base):
     
     id = Column(String, primary_key=True, default=generate_uuid)
     strategy_id = Column(String, ForeignKey('strategies.id'))
-    params = Column(JSON, nullable=False)
+    params = Column(JSONDocument, nullable=False)
     label = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -65,13 +214,18 @@ class Backtest(Base):
     initial_balance = Column(Float, nullable=False)
     final_balance = Column(Float)
     
-    metrics = Column(JSON)  # All performance metrics
+    metrics = Column(JSONDocument)  # All performance metrics
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        Index('ix_backtests_strategy_id_start_ts', strategy_id, start_ts),
+    )
+    
     # Relationships
     strategy = relationship("Strategy", back_populates="backtests")
     params = relationship("StrategyParameter", back_populates="backtests")
-    trades = relationship("BacktestTrade", back_populates="backtest")
+    # children are read with their run, in one IN query per batch of runs
+    trades = relationship("BacktestTrade", back_populates="backtest", lazy="selectin")
 
 
 class BacktestTrade(Base):
@@ -95,7 +249,12 @@ class BacktestTrade(Base):
     cum_equity = Column(Float, nullable=False)
     
     exit_reason = Column(String)
-    extra = Column(JSON)  # Additional metadata
+    extra = Column(PackedJSON)  # Additional metadata
+    
+    __table_args__ = (
+        Index('ix_backtest_trades_backtest_id_entry_ts', backtest_id, entry_ts),
+        Index('ix_backtest_trades_backtest_id_trade_index', backtest_id, trade_index),
+    )
     
     # Relationships
     backtest = relationship("Backtest", back_populates="trades")
@@ -108,7 +267,7 @@ class OptimizationRun(Base):
     id = Column(String, primary_key=True, default=generate_uuid)
     strategy_id = Column(String, ForeignKey('strategies.id'))
     
-    param_space = Column(JSON, nullable=False)
+    param_space = Column(JSONDocument, nullable=False)
     objective = Column(String, nullable=False)
     method = Column(String)  # grid, random, optuna
     
@@ -118,11 +277,11 @@ class OptimizationRun(Base):
     started_at = Column(DateTime, default=datetime.utcnow)
     finished_at = Column(DateTime)
     
-    metrics_summary = Column(JSON)
+    metrics_summary = Column(JSONDocument)
     
     # Relationships
     strategy = relationship("Strategy", back_populates="optimization_runs")
-    trials = relationship("OptimizationTrial", back_populates="optimization_run")
+    trials = relationship("OptimizationTrial", back_populates="optimization_run", lazy="selectin")
 
 
 class OptimizationTrial(Base):
@@ -133,12 +292,16 @@ class OptimizationTrial(Base):
     optimization_id = Column(String, ForeignKey('optimization_runs.id'))
     
     trial_number = Column(Integer, nullable=False)
-    trial_params = Column(JSON, nullable=False)
-    metrics = Column(JSON, nullable=False)
+    trial_params = Column(JSONDocument, nullable=False)
+    metrics = Column(JSONDocument, nullable=False)
     score = Column(Float, nullable=False)
     
     created_at = Column(DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        Index('ix_optimization_trials_opt_value', optimization_id, score.desc()),
+    )
+    
     # Relationships
     optimization_run = relationship("OptimizationRun", back_populates="trials")
 
@@ -164,7 +327,7 @@ class LiveTrade(Base):
     pnl = Column(Float)
     status = Column(String, nullable=False)  # open, closed, cancelled
     
-    raw_mt5_response = Column(JSON)
+    raw_mt5_response = Column(PackedJSON)
     
     # Relationships
     strategy = relationship("Strategy", back_populates="live_trades")
@@ -177,5 +340,9 @@ class ActionLog(Base):
     id = Column(String, primary_key=True, default=generate_uuid)
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
     action_type = Column(String, nullable=False)
-    payload = Column(JSON)
-    result = Column(JSON)
+    payload = Column(PackedJSON)
+    result = Column(JSONDocument)
+    
+    __table_args__ = (
+        Index('ix_actions_log_timestamp', timestamp),
+    )
@@ -3,11 +3,16 @@ CLI entry point for SMC Trading Engine.
 Provides commands: backtest, optimize, live
 """
 import argparse
+import atexit
 import json
+import multiprocessing
 import sys
 from pathlib import Path
 from datetime import datetime
 import logging
+from logging.handlers import QueueHandler, QueueListener
+
+import orjson
 
 from smc_engine.config import Settings
 from smc_engine.orchestrator import Orchestrator
@@ -19,21 +24,33 @@ logger = logging.getLogger(__name__)
 def setup_logging(verbose: bool = False):
     """Configure logging for the application."""
     level = logging.DEBUG if verbose else logging.INFO
-    logging.basicConfig(
-        level=level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('smc_engine.log'),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [
+        logging.FileHandler('smc_engine.log'),
+        logging.StreamHandler(sys.stdout)
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    # Callers only enqueue records; file and console I/O run on the
+    # listener thread. A process queue also carries records from forked
+    # worker processes (parallel optimization) to the same handlers.
+    log_queue = multiprocessing.Queue(-1)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    # records are enqueued with the bare message; the handlers add the layout
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=level, handlers=[queue_handler])
 
 
 def load_json_file(filepath: str) -> dict:
     """Load JSON configuration file."""
     try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
     except FileNotFoundError:
         logger.error(f"File not found: {filepath}")
         sys.exit(1)
@@ -42,6 +59,15 @@ def load_json_file(filepath: str) -> dict:
         sys.exit(1)
 
 
+def load_json_arg(value: str, name: str) -> dict:
+    """Parse a JSON string given on the command line."""
+    try:
+        return orjson.loads(value)
+    except json.JSONDecodeError as e:
+        logger.error(f"Invalid JSON for {name}: {e}")
+        sys.exit(1)
+
+
 def cmd_backtest(args):
     """Run backtest command."""
     logger.info("Starting backtest...")
@@ -77,8 +103,12 @@ def cmd_backtest(args):
     else:
         logger.warning("No metrics found in result.")
 
+    # Results are written in the background; wait before reporting the id
+    if orchestrator.wait_persist():
+        logger.warning("Backtest results could not be saved to the database.")
+
     # Optional backtest_id if returned separately
-    backtest_id = getattr(result, "backtest_id", None)
+    backtest_id = result.get("backtest_id") if isinstance(result, dict) else getattr(result, "backtest_id", None)
     if backtest_id:
         logger.info(f"Backtest completed. Backtest ID: {backtest_id}")
     else:
@@ -94,6 +124,7 @@ def cmd_optimize(args):
     
     # Load parameter space
     param_space = load_json_file(args.param_space)
+    constraints = load_json_arg(args.constraints, '--constraints') if args.constraints else None
     
     # Initialize orchestrator
     orchestrator = Orchestrator()
@@ -110,7 +141,9 @@ def cmd_optimize(args):
         n_trials=args.trials,
         method=args.method,
         source=args.data_source,
-        csv_path=args.csv_path
+        csv_path=args.csv_path,
+        n_jobs=args.jobs,
+        constraints=constraints
     )
     
     # Handle result from _save_optimization_to_db (could be str or dict-like)
@@ -224,6 +257,7 @@ def main():
     optimize_parser.add_argument('--constraints', help='JSON string of constraints (e.g., {"max_drawdown_pct": 20})')
     optimize_parser.add_argument('--data_source', default='csv', choices=['csv', 'mt5'], help='Data source')
     optimize_parser.add_argument('--csv_path', help='Path to CSV file')
+    optimize_parser.add_argument('--jobs', type=int, default=1, help='Parallel trial evaluations; -1 uses all cores (default: 1). Optuna runs are not reproducible with more than 1')
     
     # Live command
     live_parser = subparsers.add_parser('live', help='Run live trading')
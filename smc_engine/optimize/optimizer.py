@@ -6,25 +6,85 @@ import optuna
 import pandas as pd
 import numpy as np
 from typing import Dict, Any, List, Callable, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
+from functools import cached_property
+from operator import attrgetter
+import hashlib
+import json
 import logging
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+import threading
 
 from ..core.strategy import Strategy
 from ..backtest.backtester import Backtester
+from ..backtest.parallel import run_many
+from ..backtest.metrics import MetricsResult
 from ..config import settings
 
 logger = logging.getLogger(__name__)
 
+# MetricsResult field maximized for each objective; others fall back to Sharpe
+OBJECTIVE_METRICS = {
+    'sharpe': 'sharpe_ratio',
+    'net_profit': 'net_profit',
+    'calmar': 'calmar_ratio',
+    'profit_factor': 'profit_factor',
+}
+
+
+# Parameter sets reported in OptimizationResult.top_n_params
+TOP_N = 10
+
+# Score given to failed or infeasible trials
+INFEASIBLE_SCORE = -1e10
+
+
+def _param_bounds(name: str, bounds: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+    """Pre-constraint checking ``bounds['min'] <= params[name] <= bounds['max']``."""
+    low = bounds.get('min', -np.inf)
+    high = bounds.get('max', np.inf)
+    
+    def check(params: Dict[str, Any]) -> bool:
+        value = params.get(name)
+        return value is None or low <= value <= high
+    
+    return check
+
+
+def _top_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Positions of the ``k`` highest scores, best first, in O(n).
+    
+    Same order as a stable descending sort (ties keep position, NaN last):
+    the k-th value is found by partition, and only positions at or above
+    it are sorted.
+    """
+    neg = -scores
+    if k < len(neg):
+        kth = np.partition(neg, k - 1)[k - 1]
+        if not np.isnan(kth):
+            candidates = np.flatnonzero(neg <= kth)
+            return candidates[np.argsort(neg[candidates], kind='stable')[:k]]
+    return np.argsort(neg, kind='stable')[:k]
+
 
 @dataclass
 class OptimizationResult:
-    """Result of parameter optimization."""
+    """
+    Result of parameter optimization.
+    
+    ``all_trials`` (every trial, best first) is only built into a DataFrame
+    when first accessed.
+    """
     best_params: Dict[str, Any]
     best_score: float
-    all_trials: pd.DataFrame
     top_n_params: List[Dict[str, Any]]
     study: Optional[optuna.Study] = None
+    trials_builder: Optional[Callable[[], pd.DataFrame]] = field(default=None, repr=False)
+    
+    @cached_property
+    def all_trials(self) -> pd.DataFrame:
+        return self.trials_builder()
 
 
 class Optimizer:
@@ -44,7 +104,8 @@ class Optimizer:
         ohlc: pd.DataFrame,
         objective: str = 'sharpe',
         constraints: Optional[Dict[str, Any]] = None,
-        initial_balance: float = 10000.0
+        initial_balance: float = 10000.0,
+        **backtester_kwargs
     ):
         """
         Initialize optimizer.
@@ -54,8 +115,13 @@ class Optimizer:
             param_space: Parameter space definition
             ohlc: Historical data for backtesting
             objective: Optimization objective ('sharpe', 'net_profit', 'calmar', etc.)
-            constraints: Constraints dict (e.g., {'max_drawdown_pct': 20})
+            constraints: Constraints dict (e.g., {'max_drawdown_pct': 20}).
+                An optional 'pre' entry holds checks on the parameters
+                alone, run before the backtest: a mapping of param name to
+                {'min': ..., 'max': ...} bounds, or a list of callables
+                taking the params dict and returning False when infeasible
             initial_balance: Starting balance for backtests
+            **backtester_kwargs: Passed through to ``Backtester``
         """
         self.strategy_class = strategy_class
         self.param_space = param_space
@@ -63,8 +129,28 @@ class Optimizer:
         self.objective = objective
         self.constraints = constraints or {}
         self.initial_balance = initial_balance
+        self.backtester_kwargs = backtester_kwargs
+        
+        # Resolved once; scoring runs for every trial
+        self._objective_metric = attrgetter(OBJECTIVE_METRICS.get(objective, 'sharpe_ratio'))
+        metric_names = {f.name for f in fields(MetricsResult)}
+        self._constraint_limits = tuple(
+            (attrgetter(name), abs(value))
+            for name, value in self.constraints.items()
+            if name in metric_names
+        )
+        pre = self.constraints.get('pre') or {}
+        self._pre_constraints: List[Callable[[Dict[str, Any]], bool]] = (
+            [_param_bounds(name, bounds) for name, bounds in pre.items()]
+            if isinstance(pre, dict) else list(pre)
+        )
         
         self.trials_data = []
+        self._trials_lock = threading.Lock()
+        
+        # (score, metrics_dict) per canonical params key; repeated samples
+        # skip the backtest
+        self._score_cache: Dict[bytes, tuple] = {}
     
     def optimize(
         self,
@@ -79,24 +165,29 @@ class Optimizer:
         Args:
             method: 'grid', 'random', or 'optuna'
             n_trials: Number of trials (for random/optuna)
-            n_jobs: Number of parallel jobs
+            n_jobs: Number of parallel jobs; grid/random search fan out over
+                worker processes, Optuna over threads. Negative values count
+                back from the CPU count (-1: all cores). Concurrent Optuna
+                trials are not reproducible from random_seed
             random_seed: Random seed for reproducibility
         
         Returns:
             OptimizationResult with best parameters and trial data
         """
-        logger.info(f"Starting optimization: method={method}, trials={n_trials}")
+        if n_jobs < 0:
+            n_jobs = max((os.cpu_count() or 1) + 1 + n_jobs, 1)
+        logger.info(f"Starting optimization: method={method}, trials={n_trials}, jobs={n_jobs}")
         
         if method == 'grid':
-            return self._grid_search()
+            return self._grid_search(n_jobs)
         elif method == 'random':
-            return self._random_search(n_trials, random_seed)
+            return self._random_search(n_trials, random_seed, n_jobs)
         elif method == 'optuna':
-            return self._optuna_search(n_trials, random_seed)
+            return self._optuna_search(n_trials, random_seed, n_jobs)
         else:
             raise ValueError(f"Unknown optimization method: {method}")
     
-    def _grid_search(self) -> OptimizationResult:
+    def _grid_search(self, n_jobs: int = 1) -> OptimizationResult:
         """
         Exhaustive grid search over parameter space.
         
@@ -110,54 +201,48 @@ class Optimizer:
         logger.info(f"Testing {len(param_combinations)} parameter combinations")
         
         # Evaluate each combination
-        for i, params in enumerate(param_combinations):
-            score, metrics = self._evaluate_params(params)
-            
+        evaluations = self._evaluate_many(param_combinations, n_jobs)
+        
+        for i, (params, (score, metrics)) in enumerate(zip(param_combinations, evaluations)):
             self.trials_data.append({
                 'trial': i,
                 'params': params,
                 'score': score,
                 'metrics': metrics
             })
-            
-            if (i + 1) % 10 == 0:
-                logger.info(f"Completed {i + 1}/{len(param_combinations)} trials")
         
         return self._compile_results()
     
-    def _random_search(self, n_trials: int, seed: int) -> OptimizationResult:
+    def _random_search(self, n_trials: int, seed: int, n_jobs: int = 1) -> OptimizationResult:
         """Random sampling of parameter space."""
         logger.info(f"Running random search with {n_trials} trials...")
         
-        np.random.seed(seed)
+        # Sampling does not depend on scores, so draw every trial up front
+        param_samples = self._sample_params(n_trials, np.random.default_rng(seed))
+        evaluations = self._evaluate_many(param_samples, n_jobs)
         
-        for i in range(n_trials):
-            params = self._sample_params()
-            score, metrics = self._evaluate_params(params)
-            
+        for i, (params, (score, metrics)) in enumerate(zip(param_samples, evaluations)):
             self.trials_data.append({
                 'trial': i,
                 'params': params,
                 'score': score,
                 'metrics': metrics
             })
-            
-            if (i + 1) % 10 == 0:
-                logger.info(f"Completed {i + 1}/{n_trials} trials, best score: {max(t['score'] for t in self.trials_data):.4f}")
         
         return self._compile_results()
     
-    def _optuna_search(self, n_trials: int, seed: int) -> OptimizationResult:
+    def _optuna_search(self, n_trials: int, seed: int, n_jobs: int = 1) -> OptimizationResult:
         """Bayesian optimization using Optuna."""
         logger.info(f"Running Optuna optimization with {n_trials} trials...")
         
-        # Create Optuna study
+        # Create Optuna study in memory: the sampler re-reads every trial on
+        # each suggestion, which against RDB storage costs round trips per
+        # trial. The finished study is copied to settings.optuna_storage.
+        study_name = f"smc_optimization_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}"
         study = optuna.create_study(
             direction='maximize',
             sampler=optuna.samplers.TPESampler(seed=seed),
-            storage=settings.optuna_storage,
-            study_name=f"smc_optimization_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}",
-            load_if_exists=False
+            study_name=study_name
         )
         
         # Define objective function
@@ -183,31 +268,55 @@ class Optimizer:
                         param_config['choices']
                     )
             
-            score, metrics = self._evaluate_params(params)
+            # Constraint violations come back penalized
+            feasible = self._is_feasible(params)
+            score, metrics = self._evaluate_params(params) if feasible else (INFEASIBLE_SCORE, {})
             
-            # Check constraints
-            if not self._check_constraints(metrics):
-                return -1e10  # Penalize constraint violations
+            # Trials run concurrently when n_jobs > 1
+            with self._trials_lock:
+                self.trials_data.append({
+                    'trial': trial.number,
+                    'params': params,
+                    'score': score,
+                    'metrics': metrics
+                })
             
-            self.trials_data.append({
-                'trial': trial.number,
-                'params': params,
-                'score': score,
-                'metrics': metrics
-            })
+            if not feasible:
+                # Pruned rather than scored, so TPE steers away from the region
+                raise optuna.TrialPruned()
             
             return score
         
         # Run optimization
-        study.optimize(objective, n_trials=n_trials, show_progress_bar=True)
+        study.optimize(objective, n_trials=n_trials, n_jobs=n_jobs, show_progress_bar=True)
         
-        logger.info(f"Optimization complete. Best score: {study.best_value:.4f}")
+        completed = study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,))
+        if completed:
+            logger.info(f"Optimization complete. Best score: {study.best_value:.4f}")
+        else:
+            logger.warning("Optimization complete. No feasible trials")
+        
+        if settings.optuna_storage:
+            self._persist_study(study)
         
         result = self._compile_results()
         result.study = study
         
         return result
     
+    def _persist_study(self, study: optuna.Study):
+        """Copy a finished in-memory study's trials to the configured storage."""
+        try:
+            stored = optuna.create_study(
+                direction='maximize',
+                storage=settings.optuna_storage,
+                study_name=study.study_name,
+                load_if_exists=False
+            )
+            stored.add_trials(study.trials)
+        except Exception as e:
+            logger.warning(f"Failed to persist Optuna study {study.study_name}: {e}")
+    
     def _evaluate_params(self, params: Dict[str, Any]) -> tuple:
         """
         Evaluate a parameter set by running backtest.
@@ -218,6 +327,24 @@ class Optimizer:
         Returns:
             Tuple of (score, metrics_dict)
         """
+        key = self._params_key(params)
+        cached = self._score_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        if not self._is_feasible(params):
+            evaluation = (INFEASIBLE_SCORE, {})
+        else:
+            evaluation = self._run_params(params)
+        self._score_cache[key] = evaluation
+        return evaluation
+    
+    def _is_feasible(self, params: Dict[str, Any]) -> bool:
+        """Check the parameter-only ('pre') constraints."""
+        return all(check(params) for check in self._pre_constraints)
+    
+    def _run_params(self, params: Dict[str, Any]) -> tuple:
+        """Backtest and score a parameter set, bypassing the score cache."""
         try:
             # Create strategy instance
             strategy = self.strategy_class(params)
@@ -225,50 +352,98 @@ class Optimizer:
             # Run backtest
             backtester = Backtester(
                 strategy=strategy,
-                initial_balance=self.initial_balance
+                initial_balance=self.initial_balance,
+                **self.backtester_kwargs
             )
             
             result = backtester.run(self.ohlc)
-            metrics = result['metrics']
-            
-            # Calculate objective score
-            if self.objective == 'sharpe':
-                score = metrics.sharpe_ratio
-            elif self.objective == 'net_profit':
-                score = metrics.net_profit
-            elif self.objective == 'calmar':
-                score = metrics.calmar_ratio
-            elif self.objective == 'profit_factor':
-                score = metrics.profit_factor
-            else:
-                score = metrics.sharpe_ratio
-            
-            # Check constraints
-            if not self._check_constraints(metrics):
-                score = -1e10
-            
-            return score, metrics.to_dict()
+            return self._score_metrics(result['metrics'])
         
         except Exception as e:
             logger.error(f"Error evaluating params: {e}")
-            return -1e10, {}
+            return INFEASIBLE_SCORE, {}
+    
+    def _evaluate_many(self, param_list: List[Dict[str, Any]], n_jobs: int = 1) -> List[tuple]:
+        """
+        Evaluate parameter sets, fanning out across worker processes.
+        
+        Backtests are independent and CPU-bound; with ``n_jobs > 1`` they run
+        through ``run_many``, which shares the OHLC frame with the workers
+        once instead of pickling it per task. Scoring happens here.
+        
+        Args:
+            param_list: Strategy parameter sets
+            n_jobs: Worker processes
+        
+        Returns:
+            (score, metrics_dict) per parameter set, in input order
+        """
+        keys = [self._params_key(params) for params in param_list]
+        
+        # Backtest each distinct, not yet scored, feasible parameter set once
+        pending = {}
+        for key, params in zip(keys, param_list):
+            if key in self._score_cache or key in pending:
+                continue
+            if self._is_feasible(params):
+                pending[key] = params
+            else:
+                self._score_cache[key] = (INFEASIBLE_SCORE, {})
+        
+        if n_jobs <= 1 or len(pending) <= 1:
+            best_score = -np.inf
+            for i, (key, params) in enumerate(pending.items()):
+                self._score_cache[key] = evaluation = self._run_params(params)
+                best_score = max(best_score, evaluation[0])
+                if (i + 1) % 10 == 0:
+                    # lazy %-args: nothing is formatted when INFO is off
+                    logger.info("Completed %d/%d trials, best score: %.4f", i + 1, len(pending), best_score)
+        else:
+            results = run_many(
+                self.strategy_class,
+                list(pending.values()),
+                self.ohlc,
+                max_workers=n_jobs,
+                initial_balance=self.initial_balance,
+                **self.backtester_kwargs
+            )
+            for key, metrics in zip(pending, results):
+                self._score_cache[key] = (INFEASIBLE_SCORE, {}) if metrics is None else self._score_metrics(metrics)
+        
+        return [self._score_cache[key] for key in keys]
+    
+    @staticmethod
+    def _params_key(params: Dict[str, Any]) -> bytes:
+        """Order-independent digest of a parameter set."""
+        canonical = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.blake2b(canonical.encode(), digest_size=16).digest()
+    
+    def _score_metrics(self, metrics) -> tuple:
+        """Objective score (penalized on constraint violation) and metrics dict."""
+        score = self._objective_metric(metrics)
+        
+        # Check constraints
+        if not self._check_constraints(metrics):
+            score = INFEASIBLE_SCORE
+        
+        return score, metrics.to_dict()
     
     def _check_constraints(self, metrics) -> bool:
-        """Check if metrics satisfy constraints."""
-        for constraint_name, constraint_value in self.constraints.items():
-            if hasattr(metrics, constraint_name):
-                metric_value = getattr(metrics, constraint_name)
-                
-                # Assume constraint is maximum value
-                if abs(metric_value) > abs(constraint_value):
-                    return False
+        """Check if metrics satisfy constraints (each a maximum absolute value)."""
+        for metric, limit in self._constraint_limits:
+            if abs(metric(metrics)) > limit:
+                return False
         
         return True
     
     def _generate_grid(self) -> List[Dict[str, Any]]:
-        """Generate all parameter combinations for grid search."""
-        import itertools
+        """
+        Generate all parameter combinations for grid search.
         
+        Combinations are enumerated as one (N, k) array of value codes and
+        decoded column-wise, in ``itertools.product`` order; repeated
+        values on an axis are dropped first, so no combination repeats.
+        """
         param_names = []
         param_values = []
         
@@ -283,46 +458,81 @@ class Optimizer:
             elif config['type'] == 'categorical':
                 values = config['choices']
             
-            param_values.append(values)
+            # First occurrence of each distinct value (as _params_key sees it)
+            unique = {}
+            for value in values:
+                unique.setdefault(json.dumps(value, default=str), value)
+            
+            # Object array keeps the original Python values when indexed
+            axis = np.empty(len(unique), dtype=object)
+            axis[:] = list(unique.values())
+            param_values.append(axis)
+        
+        if not param_values:
+            return [{}]
         
         # Generate all combinations
-        combinations = list(itertools.product(*param_values))
+        shape = tuple(len(axis) for axis in param_values)
+        codes = np.indices(shape).reshape(len(shape), -1)
+        columns = [axis[code].tolist() for axis, code in zip(param_values, codes)]
         
-        return [dict(zip(param_names, combo)) for combo in combinations]
+        return [dict(zip(param_names, combo)) for combo in zip(*columns)]
     
-    def _sample_params(self) -> Dict[str, Any]:
-        """Sample random parameters from space."""
-        params = {}
+    def _sample_params(self, n_trials: int, rng: np.random.Generator) -> List[Dict[str, Any]]:
+        """
+        Sample ``n_trials`` random parameter sets from space.
+        
+        Each parameter is drawn for every trial in one vectorized call;
+        categorical choices are drawn as indices, so values keep their
+        original Python types.
+        """
+        param_names = []
+        columns = []
         
         for name, config in self.param_space.items():
+            param_names.append(name)
+            
             if config['type'] == 'int':
-                params[name] = np.random.randint(config['low'], config['high'] + 1)
+                values = rng.integers(config['low'], config['high'] + 1, size=n_trials).tolist()
             elif config['type'] == 'float':
-                params[name] = np.random.uniform(config['low'], config['high'])
+                values = rng.uniform(config['low'], config['high'], size=n_trials).tolist()
             elif config['type'] == 'categorical':
-                params[name] = np.random.choice(config['choices'])
+                choices = config['choices']
+                values = [choices[i] for i in rng.integers(len(choices), size=n_trials).tolist()]
+            
+            columns.append(values)
         
-        return params
+        if not columns:
+            return [{} for _ in range(n_trials)]
+        
+        return [dict(zip(param_names, combo)) for combo in zip(*columns)]
     
     def _compile_results(self) -> OptimizationResult:
         """Compile optimization results."""
         if not self.trials_data:
             raise ValueError("No trials data available")
         
-        # Convert to DataFrame
-        trials_df = pd.DataFrame(self.trials_data)
-        
-        # Sort by score
-        trials_df = trials_df.sort_values('score', ascending=False)
-        
-        # Get best parameters
-        best_trial = trials_df.iloc[0]
-        best_params = best_trial['params']
-        best_score = best_trial['score']
-        
-        # Get top N parameter sets
-        top_n = min(10, len(trials_df))
-        top_n_params = trials_df.head(top_n)['params'].tolist()
+        trials = list(self.trials_data)
+        n = len(trials)
+        scores = np.fromiter((t['score'] for t in trials), dtype=np.float64, count=n)
+        params = np.fromiter((t['params'] for t in trials), dtype=object, count=n)
+        
+        # Best trials by partial selection; no full sort unless all_trials is read
+        top = _top_indices(scores, TOP_N)
+        best_params = params[top[0]]
+        best_score = float(scores[top[0]])
+        top_n_params = params[top].tolist()
+        
+        def build_trials() -> pd.DataFrame:
+            # Typed column arrays; params / metrics dicts go into object
+            # arrays, so pandas does not scan them to infer a dtype
+            metrics = np.fromiter((t['metrics'] for t in trials), dtype=object, count=n)
+            return pd.DataFrame({
+                'trial': np.fromiter((t['trial'] for t in trials), dtype=np.int64, count=n),
+                'params': params,
+                'score': scores,
+                'metrics': metrics
+            }, copy=False).take(np.argsort(-scores, kind='stable'))
         
         logger.info(f"Best parameters: {best_params}")
         logger.info(f"Best score: {best_score:.4f}")
@@ -330,6 +540,6 @@ class Optimizer:
         return OptimizationResult(
             best_params=best_params,
             best_score=best_score,
-            all_trials=trials_df,
-            top_n_params=top_n_params
+            top_n_params=top_n_params,
+            trials_builder=build_trials
         )
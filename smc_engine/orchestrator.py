@@ -11,24 +11,28 @@ Improvements:
 - Added database persistence helpers:
     - _save_backtest_to_db(...)
     - _save_optimization_to_db(...)
-- Improved run_live_trading(...) loop with safety checks, polling, and graceful shutdown.
+- Improved run_live_trading(...) loop with safety checks, new-bar events, and graceful shutdown.
 - Thorough logging and error handling.
 """
 
 import time
 import pandas as pd
-import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import logging
-import json
+
+import orjson
+
+from sqlalchemy.orm import raiseload
 
 from .core.strategy import SMCStrategy
 from .data.marketdata import MarketDataProvider
 from .backtest.backtester import Backtester
 from .optimize.optimizer import Optimizer
 from .data.mt5_manager import MT5Manager
-from .db.db import get_session
+from .data.bar_window import BarWindow
+from .db.db import get_session, bulk_insert
 from .db.models import (
     Strategy as StrategyModel,
     StrategyParameter as StrategyParameterModel,
@@ -37,12 +41,86 @@ from .db.models import (
     OptimizationRun as OptimizationRunModel,
     OptimizationTrial as OptimizationTrialModel,
     LiveTrade as LiveTradeModel,
+    generate_uuid,
 )
 from .config import settings
 
 logger = logging.getLogger(__name__)
 
 
+# Options for to_safe_json: numpy arrays / scalars natively, and non-string
+# keys written as strings, like json.dumps
+SAFE_JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# Event-driven live loop: longest wait for a new bar, in poll intervals,
+# before checking the watcher and running a pass anyway
+LIVE_WAIT_POLL_INTERVALS = 2
+
+
+def _json_default(obj):
+    """orjson fallback: datetime subclasses (e.g. pd.Timestamp) and plain objects."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if hasattr(obj, "__dict__"):
+        return vars(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _as_dict(obj: Any) -> Any:
+    """An object's attribute dict (not copied); dicts and slot-less values pass through."""
+    if isinstance(obj, dict):
+        return obj
+    d = getattr(obj, "__dict__", None)
+    return d if d is not None else obj
+
+
+def _trial_rows(optimization_id: str, all_trials: Any) -> List[Dict[str, Any]]:
+    """
+    OptimizationTrial insert rows from a trials DataFrame or a list of
+    trial dicts / objects.
+
+    A DataFrame is read column by column, without a dict per row first.
+    Optimizer trial records number them "trial" and score them "score";
+    Optuna-style "trial_number" / "value" take precedence when present.
+    """
+    if isinstance(all_trials, pd.DataFrame):
+        n = len(all_trials)
+
+        def column(names, default):
+            for name in names:
+                if name in all_trials.columns:
+                    return all_trials[name].tolist()
+            return default
+
+        return [
+            dict(
+                optimization_id=optimization_id,
+                trial_number=int(number),
+                trial_params=params,
+                metrics=metrics,
+                score=float(score),
+            )
+            for number, params, metrics, score in zip(
+                column(("trial_number", "trial"), range(n)),
+                column(("params",), [{}] * n),
+                column(("metrics",), [{}] * n),
+                column(("value", "score"), [0] * n),
+            )
+        ]
+
+    return [
+        dict(
+            optimization_id=optimization_id,
+            trial_number=int(trial.get("trial_number", trial.get("trial", i))),
+            trial_params=trial.get("params", {}),
+            metrics=trial.get("metrics", {}),
+            score=float(trial.get("value", trial.get("score", 0))),
+        )
+        for i, t in enumerate(all_trials or [])
+        for trial in (_as_dict(t),)
+    ]
+
+
 class Orchestrator:
     """
     High-level orchestrator for trading workflows.
@@ -55,24 +133,39 @@ class Orchestrator:
 
     def __init__(self):
         """Initialize orchestrator with a default CSV market data provider."""
-        self.market_data = MarketDataProvider(source="csv")
-
-    def _to_jsonable(self, obj):
-        if isinstance(obj, dict):
-            return {k: self._to_jsonable(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._to_jsonable(v) for v in obj]
-        elif hasattr(obj, "__dict__"):
-            return self._to_jsonable(vars(obj))
-        elif isinstance(obj, (np.floating, np.integer)):
-            return obj.item()
-        elif isinstance(obj, (datetime,)):
-            return obj.isoformat()
-        else:
-            return obj
-    
+        # one provider per source, kept so its caches and connection survive
+        # across runs
+        self._provider_cache: Dict[str, MarketDataProvider] = {}
+        self.market_data = self._provider("csv")
+
+        # background DB writes (one thread keeps them in submission order)
+        self._persist_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="persist")
+        self._persist_futures: List[Future] = []
+
+    def _provider(self, source: str) -> MarketDataProvider:
+        """Market data provider for ``source``, created on first use."""
+        provider = self._provider_cache.get(source)
+        if provider is None:
+            provider = self._provider_cache[source] = MarketDataProvider(source)
+        return provider
+
+    def wait_persist(self) -> int:
+        """
+        Block until every queued background DB write has finished.
+
+        Returns:
+            Number of writes that failed (each is logged where it failed)
+        """
+        futures, self._persist_futures = self._persist_futures, []
+        return sum(1 for future in futures if future.exception() is not None)
+
     def to_safe_json(self, data):
-        return json.loads(json.dumps(self._to_jsonable(data)))
+        """
+        JSON-safe copy of ``data``, serialized and parsed by orjson.
+        
+        NaN / infinity become None, as they are stored in JSON columns.
+        """
+        return orjson.loads(orjson.dumps(data, default=_json_default, option=SAFE_JSON_OPTIONS))
 
     # ---------------------------
     # Live trading
@@ -90,14 +183,14 @@ class Orchestrator:
 
         Behavior:
         - Connects to MT5 via MT5Manager
-        - Polls for the latest bars periodically (settings.live_trade_poll_interval)
-        - Uses SMCStrategy.generate_signals() on the most recent data window
+        - Wakes when a new bar opens (MT5Manager.subscribe_bars), or polls every
+          settings.live_trade_poll_interval seconds when
+          settings.live_trade_event_driven is off
+        - Fetches only the bars since the last one held and runs
+          SMCStrategy.generate_signals() on the rolling lookback window,
+          acting only on signals from bars not evaluated before
         - Applies safety checks and places orders (or simulates them in dry-run)
         - Logs each action and returns on KeyboardInterrupt
-
-        Notes:
-        - This loop is intentionally simple and poll-based (no websocket/tick subscription).
-        - For low-latency automated execution, consider event-driven architecture.
         """
         logger.info(f"Starting live trading: {strategy_name}, mode={mode}")
 
@@ -121,55 +214,120 @@ class Orchestrator:
             logger.error(f"Unknown strategy: {strategy_name}")
             return
 
-        poll_interval = getattr(settings, "live_trade_poll_interval", 30)
+        poll_interval = settings.live_trade_poll_interval
         lookback_bars = max(params.get('lookback', params.get('swing_lookback', 50)),
                             params.get('atr_period', 14)) + 10
 
-        logger.info(f"Live trading loop started (poll every {poll_interval}s). Lookback bars: {lookback_bars}")
-        logger.info("Press Ctrl+C to stop live trading.")
+        # Fixed for the whole session; resolved once rather than per bar / signal
+        initial_window = timedelta(hours=max(lookback_bars, 24))  # conservative first fetch
+        trade_volume = params.get('trade_volume', params.get('volume', 0.01))
+        order_comment = f"SMC live {mode}"
+        trade_status = 'open' if mode == 'live' else 'simulated'
+
+        # Event-driven waits are bounded, so a stalled or dead watcher is
+        # noticed and the loop still runs a pass every few poll intervals
+        subscription = None
+        subscription_timeout = max(LIVE_WAIT_POLL_INTERVALS * poll_interval, 1.0)
+
+        # Rolling window of the newest lookback_bars bars, extended in place
+        window = BarWindow(lookback_bars)
+        first_pass = True
+
+        # Polling runs on a fixed monotonic schedule, so time spent on a pass
+        # does not shift later polls (and wall-clock adjustments do not either)
+        next_poll = time.monotonic()
 
         try:
+            # Event-driven: wake when a bar closes; otherwise poll on a timer.
+            # Set up inside the try so a failure still disconnects below.
+            if settings.live_trade_event_driven:
+                subscription = mt5_manager.subscribe_bars(symbol, timeframe)
+                logger.info(f"Live trading loop started (on each new {timeframe} bar). Lookback bars: {lookback_bars}")
+            else:
+                logger.info(f"Live trading loop started (poll every {poll_interval}s). Lookback bars: {lookback_bars}")
+            logger.info("Press Ctrl+C to stop live trading.")
+
             while True:
-                # 1) Fetch recent OHLC bars (we fetch a bit more than lookback)
+                if not first_pass:
+                    if subscription is not None and not subscription.alive:
+                        logger.error(f"Bar subscription stopped; falling back to polling every {poll_interval}s.")
+                        subscription.stop()
+                        subscription = None
+                        next_poll = time.monotonic()
+                    if subscription is not None:
+                        subscription.wait(timeout=subscription_timeout)
+                    else:
+                        next_poll += poll_interval
+                        behind = time.monotonic() - next_poll
+                        if behind > 0 and poll_interval > 0:
+                            # a pass overran: drop the missed polls, keep the phase
+                            missed = int(behind // poll_interval) + 1
+                            next_poll += missed * poll_interval
+                            logger.warning(f"Live loop overran by {missed} poll interval(s); skipping ahead.")
+                        time.sleep(max(0.0, next_poll - time.monotonic()))
+                first_pass = False
+
+                # 1) Fetch bars: a conservative window on the first pass,
+                # afterwards only those from the newest bar held onwards
                 end_time = datetime.utcnow()
-                start_time = end_time - timedelta(hours=max(lookback_bars, 24))  # conservative window
+                evaluated_until = window.last_ts
+                start_time = end_time - initial_window if evaluated_until is None else evaluated_until
                 try:
-                    ohlc = self.market_data.get_data(
+                    new_bars = self.market_data.get_data(
                         symbol=symbol,
                         timeframe=timeframe,
                         start=start_time,
-                        end=end_time
+                        end=end_time,
+                        memoize=False  # ends at "now": never repeated, and the last bar is still forming
                     )
                 except Exception as e:
                     logger.exception(f"Failed to fetch market data in live loop: {e}")
-                    time.sleep(poll_interval)
                     continue
 
-                if ohlc is None or len(ohlc) < lookback_bars:
+                if new_bars is None or new_bars.empty:
+                    continue
+
+                # Unchanged input gives the same signals, and only bars after
+                # evaluated_until are acted on: skip the strategy until a
+                # new bar arrives
+                if not window.update(new_bars):
+                    logger.debug("No new bar since the last evaluation.")
+                    continue
+                if len(window) < lookback_bars:
                     logger.warning("Not enough bars to generate signals; waiting.")
-                    time.sleep(poll_interval)
                     continue
 
-                # 2) Generate signals
+                # 2) Generate signals; only those for bars after the newest
+                # one already evaluated are acted on
                 try:
-                    signals_df = strategy.generate_signals(ohlc.tail(lookback_bars))
+                    signals_df = strategy.generate_signals(window.frame())
                 except Exception as e:
                     logger.exception(f"Strategy signal generation failed: {e}")
-                    time.sleep(poll_interval)
                     continue
 
+                if signals_df is not None and not signals_df.empty and evaluated_until is not None:
+                    signals_df = signals_df[signals_df['ts'] > evaluated_until]
+
                 if signals_df is None or signals_df.empty:
-                    logger.debug("No signals this tick.")
-                    time.sleep(poll_interval)
+                    logger.debug("No signals this bar.")
                     continue
 
-                # Only consider most recent signals (one per bar; process newest rows)
-                for _, sig in signals_df.sort_values('ts').iterrows():
-                    ts = sig['ts']
-                    signal = sig['signal']
-                    price = float(sig['price'])
-                    sl = float(sig['stop']) if sig.get('stop') is not None else None
-                    tp = float(sig['tp']) if sig.get('tp') is not None else None
+                # Only consider most recent signals (one per bar; process newest rows).
+                # Columns are read out as lists once instead of a Series per row.
+                signals_df = signals_df.sort_values('ts', kind='stable')
+                n_signals = len(signals_df)
+                stops = signals_df['stop'].tolist() if 'stop' in signals_df else [None] * n_signals
+                targets = signals_df['tp'].tolist() if 'tp' in signals_df else [None] * n_signals
+                for ts, signal, price, sl, tp in zip(
+                    signals_df['ts'].tolist(),
+                    signals_df['signal'].tolist(),
+                    signals_df['price'].tolist(),
+                    stops,
+                    targets,
+                ):
+                    price = float(price)
+                    sl = float(sl) if sl is not None else None
+                    tp = float(tp) if tp is not None else None
 
                     logger.info(f"Signal at {ts}: {signal} {symbol} @ {price} (sl={sl}, tp={tp})")
 
@@ -182,12 +340,12 @@ class Orchestrator:
                     res = mt5_manager.place_order(
                         symbol=symbol,
                         side=signal,
-                        volume=params.get('trade_volume', params.get('volume', 0.01)),
+                        volume=trade_volume,
                         price=None,  # market price unless limit is wanted
                         sl=sl,
                         tp=tp,
                         order_type='market',
-                        comment=f"SMC live {mode}"
+                        comment=order_comment
                     )
 
                     if not res.success:
@@ -208,7 +366,7 @@ class Orchestrator:
                                     exit_price=None,
                                     volume=res.volume,
                                     pnl=None,
-                                    status='open' if mode == 'live' else 'simulated',
+                                    status=trade_status,
                                     raw_mt5_response=res.raw_response
                                 )
                                 session.add(lt)
@@ -217,9 +375,6 @@ class Orchestrator:
                         except Exception:
                             logger.exception("Failed to persist LiveTrade to DB.")
 
-                # sleep until next poll
-                time.sleep(poll_interval)
-
         except KeyboardInterrupt:
             logger.info("Live trading stopped by user (KeyboardInterrupt).")
 
@@ -227,6 +382,8 @@ class Orchestrator:
             logger.exception(f"Unhandled exception in live trading loop: {e}")
 
         finally:
+            if subscription is not None:
+                subscription.stop()
             mt5_manager.disconnect()
             logger.info("Live trading: disconnected and exiting loop.")
 
@@ -245,18 +402,24 @@ class Orchestrator:
         initial_balance: float = 10000.0,
         csv_path: Optional[str] = None,
         save_to_db: bool = True,
-        source: str = "csv"
+        source: str = "csv",
+        save_async: bool = True
     ) -> Dict[str, Any]:
         """
         Run a backtest and optionally persist results to the database.
 
+        With ``save_async`` the results are written on a background thread
+        and this returns without waiting for the commit; the backtest id is
+        assigned up front, so it is returned either way. Call
+        ``wait_persist`` to wait for pending writes.
+
         Returns:
             result dict produced by Backtester.run(...)
         """
         logger.info(f"Running backtest: {strategy_name} on {symbol} {timeframe}")
 
         # Update source
-        self.market_data = MarketDataProvider(source)
+        self.market_data = self._provider(source)
 
         # Load data
         ohlc = self.market_data.get_data(
@@ -277,7 +440,7 @@ class Orchestrator:
 
         # Run backtest
         backtester = Backtester(strategy=strategy, initial_balance=initial_balance)
-        result = backtester.run(ohlc)
+        result_dict = _as_dict(backtester.run(ohlc))
 
         print(backtester.report())
 
@@ -287,22 +450,27 @@ class Orchestrator:
         # Save to database
         backtest_id = None
         if save_to_db:
-            try:
-                backtest_id = self._save_backtest_to_db(
-                    strategy_name=strategy_name,
-                    params=params,
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    start=start_ts,
-                    end=end_ts,
-                    initial_balance=initial_balance,
-                    result=result,
-                )
-            except Exception as e:
-                logger.exception(f"Failed to persist backtest: {e}")
+            save_kwargs = dict(
+                strategy_name=strategy_name,
+                params=params,
+                symbol=symbol,
+                timeframe=timeframe,
+                start=start_ts,
+                end=end_ts,
+                initial_balance=initial_balance,
+                result=result_dict,
+                backtest_id=generate_uuid(),
+            )
+            if save_async:
+                self._persist_futures.append(self._persist_pool.submit(self._save_backtest_to_db, **save_kwargs))
+                backtest_id = save_kwargs["backtest_id"]
+            else:
+                try:
+                    backtest_id = self._save_backtest_to_db(**save_kwargs)
+                except Exception as e:
+                    logger.exception(f"Failed to persist backtest: {e}")
 
         # Return structured output
-        result_dict = vars(result) if hasattr(result, "__dict__") else result
         result_dict["backtest_id"] = backtest_id
         return result_dict
 
@@ -320,16 +488,23 @@ class Orchestrator:
         n_trials: int = 100,
         csv_path: Optional[str] = None,
         save_to_db: bool = True,
+        n_jobs: int = 1,
+        constraints: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """
         Run parameter optimization and optionally save run + trials to DB.
 
+        Trials run serially unless n_jobs asks for more (-1: all cores);
+        concurrent Optuna trials are not reproducible from the seed.
+        constraints are passed to the Optimizer as-is, including
+        parameter-only bounds under "pre".
+
         Returns:
             A dictionary summarizing optimization results.
         """
         logger.info(f"Running optimization: {strategy_name}, method={method}, trials={n_trials}")
 
-        self.market_data = MarketDataProvider(source)
+        self.market_data = self._provider(source)
 
         # Load data
         ohlc = self.market_data.get_data(
@@ -351,9 +526,10 @@ class Orchestrator:
             param_space=param_space,
             ohlc=ohlc,
             objective=objective,
+            constraints=constraints,
         )
 
-        result = optimizer.optimize(method=method, n_trials=n_trials)
+        result = optimizer.optimize(method=method, n_trials=n_trials, n_jobs=n_jobs)
 
         # Print summary
         print(f"\n=== Optimization Results ===")
@@ -378,6 +554,9 @@ class Orchestrator:
             except Exception as e:
                 logger.exception(f"Failed to persist optimization run: {e}")
 
+        # earlier backtests' background writes are done before returning
+        self.wait_persist()
+
         return {
             "best_params": result.best_params,
             "best_score": result.best_score,
@@ -397,30 +576,30 @@ class Orchestrator:
         start: datetime,
         end: datetime,
         initial_balance: float,
-        result: Any,
+        result: Dict[str, Any],
+        backtest_id: Optional[str] = None,
     ) -> Optional[str]:
         """
         Persist backtest results to the database.
 
-        Handles both object-based and dictionary-based result structures.
+        ``result`` is the Backtester.run dict; its trades may be objects or
+        dicts. ``backtest_id`` fixes the row id (default: a new one).
         """
         logger.info("Persisting backtest to DB...")
         session_ctx = get_session()
 
         with session_ctx as session:
             try:
-                # Normalize result
-                result_dict = vars(result) if hasattr(result, "__dict__") else result
-                metrics_obj = result_dict.get("metrics", {})
+                metrics_obj = result.get("metrics", {})
                 metrics = self.to_safe_json(metrics_obj)
 
                 final_balance = (
-                    result_dict.get("final_balance")
+                    result.get("final_balance")
                     or (metrics.get("final_balance") if isinstance(metrics, dict) else None)
                 )
 
                 # Strategy
-                strategy_row = session.query(StrategyModel).filter_by(name=strategy_name).first()
+                strategy_row = session.query(StrategyModel).options(raiseload("*")).filter_by(name=strategy_name).first()
                 if not strategy_row:
                     strategy_row = StrategyModel(
                         name=strategy_name,
@@ -441,6 +620,7 @@ class Orchestrator:
 
                 # Backtest
                 backtest_row = BacktestModel(
+                    id=backtest_id or generate_uuid(),
                     strategy_id=strategy_row.id,
                     params_id=param_row.id,
                     symbol=symbol,
@@ -449,31 +629,35 @@ class Orchestrator:
                     end_ts=end,
                     initial_balance=initial_balance,
                     final_balance=final_balance or 0.0,
-                    metrics=metrics or result_dict,
+                    metrics=metrics or result,
                 )
                 session.add(backtest_row)
                 session.flush()
 
                 # Trades
-                trades = result_dict.get("trades") or getattr(result, "trades", [])
-                for t in trades:
-                    tdata = vars(t) if hasattr(t, "__dict__") else t
-                    trade = BacktestTradeModel(
+                # Trades: one row dict each, sent as a single batched insert.
+                # Backtester trades name their fields index / size / meta.
+                trades = result.get("trades") or []
+                trade_rows = [
+                    dict(
                         backtest_id=backtest_row.id,
-                        trade_index=int(tdata.get("trade_index", 0)),
+                        trade_index=int(tdata.get("trade_index", tdata.get("index", i))),
                         entry_ts=tdata.get("entry_ts") or tdata.get("entry_time"),
                         exit_ts=tdata.get("exit_ts") or tdata.get("exit_time"),
                         side=tdata.get("side", "buy"),
                         entry_price=float(tdata.get("entry_price", 0)),
                         exit_price=float(tdata.get("exit_price", 0)),
-                        volume=float(tdata.get("volume", 0)),
+                        volume=float(tdata.get("volume", tdata.get("size", 0))),
                         pnl=float(tdata.get("pnl", 0)),
                         fees=float(tdata.get("fees", 0)),
                         cum_equity=float(tdata.get("cum_equity", 0)),
                         exit_reason=tdata.get("exit_reason"),
-                        extra=tdata.get("extra"),
+                        extra=tdata.get("extra", tdata.get("meta")),
                     )
-                    session.add(trade)
+                    for i, t in enumerate(trades)
+                    for tdata in (_as_dict(t),)
+                ]
+                bulk_insert(session, BacktestTradeModel, trade_rows)
 
                 session.commit()
                 logger.info(f"Backtest persisted: id={backtest_row.id}, trades={len(trades)}")
@@ -496,16 +680,13 @@ class Orchestrator:
         Persist optimization run and trials.
         Handles both class-based and dict-based result objects.
         """
-        import pandas as pd
-        import uuid
-
         logger.info("Persisting optimization run to DB...")
         session_ctx = get_session()
 
         with session_ctx as session:
             try:
                 # Ensure strategy exists
-                strategy_row = session.query(StrategyModel).filter_by(name=strategy_name).first()
+                strategy_row = session.query(StrategyModel).options(raiseload("*")).filter_by(name=strategy_name).first()
                 if not strategy_row:
                     strategy_row = StrategyModel(
                         name=strategy_name,
@@ -516,8 +697,11 @@ class Orchestrator:
                     session.flush()
 
                 # --- Safe access helper ---
+                # attribute access, not __dict__: all_trials is a cached_property
                 def get_attr(obj, name, default=None):
-                    return getattr(obj, name, default) if hasattr(obj, name) else default
+                    if isinstance(obj, dict):
+                        return obj.get(name, default)
+                    return getattr(obj, name, default)
 
                 # Extract safely from both object or dict
                 best_score = get_attr(result, "best_score", 0.0)
@@ -525,14 +709,8 @@ class Orchestrator:
                 best_params = get_attr(result, "best_params", None)
                 all_trials = get_attr(result, "all_trials", None)
 
-                # --- Handle DataFrame ---
-                if isinstance(all_trials, pd.DataFrame):
-                    all_trials = all_trials.to_dict(orient="records")
-                elif not all_trials:
-                    all_trials = []
-
                 # Create optimization run record
-                run_id = str(uuid.uuid4())
+                run_id = generate_uuid()
                 run_row = OptimizationRunModel(
                     id=run_id,
                     strategy_id=strategy_row.id,
@@ -558,17 +736,11 @@ class Orchestrator:
                     session.add(run_row)
 
                 # Persist all trials
-                for trial in all_trials:
-                    if hasattr(trial, "__dict__"):
-                        trial = vars(trial)
-                    trial_row = OptimizationTrialModel(
-                        optimization_id=run_row.id,
-                        trial_number=int(trial.get("trial_number", 0)),
-                        trial_params=trial.get("params", {}),
-                        metrics=trial.get("metrics", {}),
-                        score=float(trial.get("value", trial.get("score", 0))),
-                    )
-                    session.add(trial_row)
+                trial_rows = _trial_rows(run_id, all_trials)
+                # pending run/parameter changes must reach the DB before the
+                # Core insert, which bypasses the unit of work
+                session.flush()
+                bulk_insert(session, OptimizationTrialModel, trial_rows)
 
                 session.commit()
                 logger.info(f"Optimization run persisted successfully: id={run_id}")
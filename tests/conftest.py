@@ -3,83 +3,157 @@ import pytest
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
+from smc_engine.core.strategy import Strategy
+from smc_engine.db.db import _set_sqlite_pragmas
 from smc_engine.db.models import Base
 
 
-@pytest.fixture
+def _read_only_frame(columns):
+    """DataFrame over read-only arrays; session fixtures are shared, so writes must fail."""
+    for values in columns.values():
+        values.flags.writeable = False
+    return pd.DataFrame(columns, copy=False)
+
+
+@pytest.fixture(scope="session")
 def sample_ohlc():
-    """Generate sample OHLC data for testing."""
-    np.random.seed(42)
+    """Generate sample OHLC data for testing (read-only; copy before modifying)."""
+    # same stream as the original np.random.seed(42), without touching global state
+    rng = np.random.RandomState(42)
     n = 500
     dates = pd.date_range(start='2020-01-01', periods=n, freq='H')
     
     # Generate realistic price data
-    close = 1.1000 + np.cumsum(np.random.randn(n) * 0.0005)
-    high = close + np.abs(np.random.randn(n) * 0.0003)
-    low = close - np.abs(np.random.randn(n) * 0.0003)
-    open_price = close + np.random.randn(n) * 0.0002
-    volume = np.random.randint(100, 1000, n)
+    close = 1.1000 + np.cumsum(rng.randn(n) * 0.0005)
+    high = close + np.abs(rng.randn(n) * 0.0003)
+    low = close - np.abs(rng.randn(n) * 0.0003)
+    open_price = close + rng.randn(n) * 0.0002
+    volume = rng.randint(100, 1000, n)
     
-    df = pd.DataFrame({
-        'timestamp': dates,
+    return _read_only_frame({
+        'timestamp': dates.to_numpy(),
         'open': open_price,
         'high': high,
         'low': low,
         'close': close,
         'volume': volume
     })
-    
-    return df
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def trending_ohlc():
-    """Generate trending OHLC data with clear structure."""
-    np.random.seed(42)
+    """Generate trending OHLC data with clear structure (read-only; copy before modifying)."""
+    # same stream as the original np.random.seed(42), without touching global state
+    rng = np.random.RandomState(42)
     n = 200
     dates = pd.date_range(start='2020-01-01', periods=n, freq='H')
     
     # Create uptrend with pullbacks
     trend = np.linspace(1.1000, 1.1200, n)
-    noise = np.random.randn(n) * 0.0002
+    noise = rng.randn(n) * 0.0002
     close = trend + noise
     
-    high = close + np.abs(np.random.randn(n) * 0.0003)
-    low = close - np.abs(np.random.randn(n) * 0.0003)
-    open_price = close + np.random.randn(n) * 0.0001
-    volume = np.random.randint(100, 1000, n)
+    high = close + np.abs(rng.randn(n) * 0.0003)
+    low = close - np.abs(rng.randn(n) * 0.0003)
+    open_price = close + rng.randn(n) * 0.0001
+    volume = rng.randint(100, 1000, n)
     
-    df = pd.DataFrame({
-        'timestamp': dates,
+    return _read_only_frame({
+        'timestamp': dates.to_numpy(),
         'open': open_price,
         'high': high,
         'low': low,
         'close': close,
         'volume': volume
     })
-    
-    return df
 
 
 @pytest.fixture
-def test_db():
-    """Create in-memory SQLite database for testing."""
-    engine = create_engine('sqlite:///:memory:')
+def indexed_ohlc():
+    """Random-walk OHLC with a UTC datetime index."""
+    rng = np.random.RandomState(7)
+    n = 600
+    close = 1.1 + np.cumsum(rng.randn(n) * 0.0008)
+    open_price = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_price, close) + np.abs(rng.randn(n) * 0.0006)
+    low = np.minimum(open_price, close) - np.abs(rng.randn(n) * 0.0006)
+    index = pd.date_range('2021-01-01', periods=n, freq='h', tz='UTC')
+    return pd.DataFrame({'open': open_price, 'high': high, 'low': low, 'close': close}, index=index)
+
+
+class SeededSignalStrategy(Strategy):
+    """Strategy stub drawing random signals from a seed parameter."""
+
+    def generate_signals(self, ohlc: pd.DataFrame) -> pd.DataFrame:
+        rng = np.random.RandomState(self.params['seed'])
+        bars = np.sort(rng.choice(np.arange(20, len(ohlc)), size=60, replace=False))
+        close = ohlc['close'].to_numpy()[bars]
+        sign = np.where(rng.rand(len(bars)) < 0.5, 1, -1)
+        dist = 0.002 * (0.5 + rng.rand(len(bars)))
+        return pd.DataFrame({
+            'ts': ohlc.index[bars],
+            'signal': np.where(sign > 0, 'buy', 'sell'),
+            'price': close,
+            'stop': close - sign * dist,
+            'tp': close + sign * 2 * dist,
+        })
+
+    def default_param_space(self):
+        return {}
+
+    def validate_params(self):
+        pass
+
+
+@pytest.fixture(scope="session")
+def seeded_signal_strategy():
+    """Strategy class whose signals depend only on its 'seed' parameter."""
+    return SeededSignalStrategy
+
+
+def _sqlite_test_connect(dbapi_connection, connection_record):
+    """App SQLite pragmas (WAL, synchronous=NORMAL, ...) plus driver autocommit."""
+    _set_sqlite_pragmas(dbapi_connection, connection_record)
+    # let SQLAlchemy emit BEGIN itself, so SAVEPOINTs nest inside the
+    # per-test transaction instead of pysqlite committing around them
+    dbapi_connection.isolation_level = None
+
+
+@pytest.fixture(scope="module")
+def db_engine(tmp_path_factory):
+    """File-backed SQLite engine with the schema, shared by a module's tests."""
+    db_path = tmp_path_factory.mktemp("db") / "test.db"
+    engine = create_engine(f"sqlite:///{db_path}")
+    event.listen(engine, "connect", _sqlite_test_connect)
+    event.listen(engine, "begin", lambda conn: conn.exec_driver_sql("BEGIN"))
     Base.metadata.create_all(engine)
-    SessionLocal = sessionmaker(bind=engine)
+    
+    yield engine
+    
+    engine.dispose()
+
+
+@pytest.fixture
+def test_db(db_engine):
+    """Session in a transaction rolled back after the test (commits become savepoints)."""
+    connection = db_engine.connect()
+    transaction = connection.begin()
+    SessionLocal = sessionmaker(bind=connection, join_transaction_mode="create_savepoint")
     session = SessionLocal()
     
     yield session
     
     session.close()
+    transaction.rollback()
+    connection.close()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_params():
-    """Sample strategy parameters."""
+    """Sample strategy parameters (shared; copy before modifying)."""
     return {
         'swing_lookback': 10,
         'bos_atr_margin': 0.5,
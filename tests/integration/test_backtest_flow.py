@@ -54,29 +54,21 @@ def test_full_backtest_flow(trending_ohlc, sample_params):
     assert equity.iloc[0] == 10000.0  # Initial balance
 
 
-def test_backtest_with_different_params(trending_ohlc):
-    """Test backtest with various parameter sets."""
-    param_sets = [
-        {'swing_lookback': 5, 'risk_per_trade': 0.01, 'atr_period': 10},
-        {'swing_lookback': 15, 'risk_per_trade': 0.02, 'atr_period': 20},
-        {'swing_lookback': 10, 'risk_per_trade': 0.015, 'atr_period': 14},
-    ]
-    
-    results = []
-    
-    for params in param_sets:
-        strategy = SMCStrategy(params)
-        backtester = Backtester(strategy=strategy, initial_balance=10000.0)
-        result = backtester.run(trending_ohlc)
-        results.append(result['metrics'])
-    
-    # All should complete without error
-    assert len(results) == 3
+@pytest.mark.parametrize('params', [
+    {'swing_lookback': 5, 'risk_per_trade': 0.01, 'atr_period': 10},
+    {'swing_lookback': 15, 'risk_per_trade': 0.02, 'atr_period': 20},
+    {'swing_lookback': 10, 'risk_per_trade': 0.015, 'atr_period': 14},
+])
+def test_backtest_with_different_params(trending_ohlc, params):
+    """Test backtest with various parameter sets (one case each, so xdist can spread them)."""
+    strategy = SMCStrategy(params)
+    backtester = Backtester(strategy=strategy, initial_balance=10000.0)
+    result = backtester.run(trending_ohlc)
     
-    # Each should have valid metrics
-    for metrics in results:
-        assert 'net_profit' in metrics
-        assert 'total_trades' in metrics
+    # Should complete without error and have valid metrics
+    metrics = result['metrics']
+    assert 'net_profit' in metrics
+    assert 'total_trades' in metrics
 
 
 def test_backtest_reproducibility(trending_ohlc, sample_params):
@@ -0,0 +1,118 @@
+"""Unit tests for the backtester simulation paths."""
+from dataclasses import asdict
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from smc_engine.core.strategy import Strategy
+from smc_engine.backtest.backtester import Backtester, Trade
+from smc_engine.backtest.parallel import run_many
+
+
+class FixedSignalStrategy(Strategy):
+    """Strategy stub that replays a precomputed signal frame."""
+
+    def __init__(self, signals: pd.DataFrame):
+        self.signals = signals
+        super().__init__({})
+
+    def generate_signals(self, ohlc: pd.DataFrame) -> pd.DataFrame:
+        return self.signals
+
+    def default_param_space(self):
+        return {}
+
+    def validate_params(self):
+        pass
+
+
+@pytest.fixture
+def random_signals(indexed_ohlc):
+    """Random buy/sell signals with 1:2 stop/target distances."""
+    rng = np.random.RandomState(11)
+    bars = np.sort(rng.choice(np.arange(20, len(indexed_ohlc)), size=150))
+    rows = []
+    for i in bars:
+        side = 'buy' if rng.rand() < 0.5 else 'sell'
+        price = float(indexed_ohlc['close'].iloc[i])
+        dist = 0.002 * (0.5 + rng.rand())
+        sign = 1 if side == 'buy' else -1
+        rows.append({
+            'ts': indexed_ohlc.index[i],
+            'signal': side,
+            'price': price,
+            'stop': price - sign * dist,
+            'tp': price + sign * 2 * dist,
+            'meta': {'bar': int(i)},
+        })
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize('max_positions,position_size', [(1, 0.01), (3, 0.05), (2, 2.0)])
+def test_numba_kernel_matches_python_loop(indexed_ohlc, random_signals, max_positions, position_size):
+    """Compiled and reference simulation paths produce identical results."""
+    results = []
+    for use_numba in (True, False):
+        backtester = Backtester(
+            strategy=FixedSignalStrategy(random_signals),
+            position_size=position_size,
+            max_positions=max_positions,
+            use_numba=use_numba,
+            rng=np.random.default_rng(0)
+        )
+        results.append(backtester.run(indexed_ohlc))
+
+    fast, reference = results
+    assert len(fast['trades']) == len(reference['trades']) > 0
+    for a, b in zip(fast['trades'], reference['trades']):
+        assert a.to_dict() == b.to_dict()
+    pd.testing.assert_frame_equal(fast['equity_curve'], reference['equity_curve'], check_freq=False)
+    assert fast['metrics'].to_dict() == reference['metrics'].to_dict()
+
+
+def test_run_many_matches_serial_runs(indexed_ohlc, seeded_signal_strategy):
+    """Worker processes over shared OHLC reproduce serial backtests."""
+    param_grid = [{'seed': seed} for seed in range(4)]
+    kwargs = {'slippage': 0.0, 'use_float32': False}
+
+    parallel = run_many(seeded_signal_strategy, param_grid, indexed_ohlc, max_workers=2, **kwargs)
+    serial = [
+        Backtester(strategy=seeded_signal_strategy(params), **kwargs).run(indexed_ohlc)['metrics']
+        for params in param_grid
+    ]
+
+    assert [m.to_dict() for m in parallel] == [m.to_dict() for m in serial]
+
+
+def test_trade_to_dict_is_shallow():
+    """to_dict covers every field and shares meta; to_json_dict copies it."""
+    ts = pd.Timestamp('2021-01-01', tz='UTC')
+    trade = Trade(
+        index=0, entry_ts=ts, exit_ts=ts, side='buy', entry_price=1.1, exit_price=1.2,
+        size=1.0, pnl=10.0, fees=0.1, cum_equity=10010.0, exit_reason='take_profit',
+        meta={'zone': {'top': 1.2}}
+    )
+
+    d = trade.to_dict()
+    expected = asdict(trade)
+    expected['entry_ts'] = expected['exit_ts'] = str(ts)
+    assert d == expected
+    assert d['meta'] is trade.meta
+    assert trade.to_json_dict()['meta']['zone'] is not trade.meta['zone']
+
+
+def test_read_only_ohlc_matches_writable(indexed_ohlc, random_signals):
+    """Memoized (read-only) OHLC arrays backtest like writable ones."""
+    columns = {}
+    for name in indexed_ohlc.columns:
+        values = indexed_ohlc[name].to_numpy().copy()
+        values.flags.writeable = False
+        columns[name] = values
+    frozen = pd.DataFrame(columns, index=indexed_ohlc.index, copy=False)
+
+    results = [
+        Backtester(strategy=FixedSignalStrategy(random_signals), rng=np.random.default_rng(0)).run(ohlc)
+        for ohlc in (indexed_ohlc, frozen)
+    ]
+    assert results[0]['metrics'].to_dict() == results[1]['metrics'].to_dict()
@@ -0,0 +1,72 @@
+"""Unit tests for the live loop's rolling bar window."""
+import numpy as np
+import pandas as pd
+import pytest
+
+# smc_engine.data imports the MetaTrader5 package on import
+pytest.importorskip("MetaTrader5")
+
+from smc_engine.data.bar_window import BarWindow
+
+
+def make_bars(start: int, n: int) -> pd.DataFrame:
+    """n hourly UTC bars whose close is their position in the stream."""
+    index = pd.date_range('2024-01-01', periods=start + n, freq='h', tz='UTC', name='time')[start:]
+    close = np.arange(start, start + n, dtype=float)
+    return pd.DataFrame({'open': close - 0.5, 'close': close, 'volume': np.arange(start, start + n)}, index=index)
+
+
+def test_fill_past_capacity_keeps_newest_bars():
+    """A window fed more bars than it holds keeps only the newest capacity."""
+    window = BarWindow(5)
+
+    assert window.update(make_bars(0, 3)) == 3
+    assert window.update(make_bars(3, 4)) == 4
+
+    frame = window.frame()
+    assert len(window) == len(frame) == 5
+    assert frame['close'].tolist() == [2.0, 3.0, 4.0, 5.0, 6.0]
+    assert window.last_ts == make_bars(6, 1).index[0]
+
+
+def test_order_after_wrap_matches_tail_of_stream():
+    """Bar by bar and batch updates past the buffer end stay in time order."""
+    window = BarWindow(4)
+    stream = make_bars(0, 40)
+
+    # single bars, then batches larger than the capacity, then small ones
+    for lo, hi in [(i, i + 1) for i in range(11)] + [(11, 17), (17, 30), (30, 33), (33, 40)]:
+        window.update(stream.iloc[lo:hi])
+        expected = stream.iloc[max(hi - 4, 0):hi]
+        pd.testing.assert_frame_equal(window.frame(), expected, check_freq=False)
+
+
+def test_refetched_newest_bar_is_replaced():
+    """A repeat of the newest bar overwrites it; older bars are ignored."""
+    window = BarWindow(3)
+    window.update(make_bars(0, 3))
+    refetched = make_bars(1, 2).copy()
+    refetched['close'] = [-1.0, 99.0]
+
+    assert window.update(refetched) == 0
+    assert window.frame()['close'].tolist() == [0.0, 1.0, 99.0]
+
+
+def test_frame_views_are_read_only():
+    """Writes through the frame raise instead of corrupting the buffers."""
+    window = BarWindow(3)
+    window.update(make_bars(0, 5))
+    frame = window.frame()
+
+    for name in frame.columns:
+        assert not frame[name].to_numpy().flags.writeable
+    with pytest.raises(ValueError):
+        frame['close'].to_numpy()[0] = 0.0
+
+    window.update(make_bars(5, 1))
+    assert window.frame()['close'].tolist() == [3.0, 4.0, 5.0]
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        BarWindow(0)
@@ -0,0 +1,66 @@
+"""Unit tests for the command-line interface."""
+import sys
+
+import orjson
+import pytest
+
+# the CLI imports the orchestrator, which needs the MetaTrader5 package
+pytest.importorskip("MetaTrader5")
+
+from smc_engine import main as cli
+
+
+class RecordingOrchestrator:
+    """Orchestrator stand-in recording run_optimization's arguments."""
+
+    calls = []
+
+    def run_optimization(self, **kwargs):
+        self.calls.append(kwargs)
+        return {'best_params': {}, 'best_value': 0.0, 'top_trials': []}
+
+
+@pytest.fixture
+def run_cli(tmp_path, monkeypatch):
+    """Run the CLI's optimize command with the orchestrator recorded."""
+    param_space = tmp_path / 'space.json'
+    param_space.write_bytes(orjson.dumps({'risk_reward': {'type': 'float', 'low': 1.5, 'high': 3.0}}))
+    RecordingOrchestrator.calls = []
+    monkeypatch.setattr(cli, 'Orchestrator', RecordingOrchestrator)
+    monkeypatch.setattr(cli, 'init_db', lambda: None)
+    monkeypatch.setattr(cli, 'setup_logging', lambda verbose: None)
+
+    def run(*extra):
+        monkeypatch.setattr(sys, 'argv', [
+            'smc_engine', 'optimize', '--symbol', 'EURUSD', '--timeframe', 'H1',
+            '--start', '2024-01-01', '--end', '2024-02-01', '--param_space', str(param_space), *extra
+        ])
+        cli.main()
+        return RecordingOrchestrator.calls
+
+    return run
+
+
+def test_optimize_forwards_constraints(run_cli):
+    """--constraints, including "pre" bounds, reach run_optimization parsed."""
+    constraints = {'max_drawdown_pct': 20, 'pre': {'risk_reward': {'min': 2.0}}}
+
+    calls = run_cli('--constraints', orjson.dumps(constraints).decode())
+
+    assert len(calls) == 1
+    assert calls[0]['constraints'] == constraints
+
+
+def test_optimize_without_constraints(run_cli):
+    """Omitting --constraints passes None."""
+    calls = run_cli()
+
+    assert calls[0]['constraints'] is None
+
+
+def test_optimize_rejects_invalid_constraints(run_cli):
+    """Malformed --constraints JSON exits before optimizing."""
+    with pytest.raises(SystemExit):
+        run_cli('--constraints', '{max_drawdown_pct: 20')
+
+    assert RecordingOrchestrator.calls == []
@@ -2,7 +2,7 @@
 import pytest
 import pandas as pd
 import numpy as np
-from smc_engine.backtest.metrics import calculate_metrics
+from smc_engine.backtest.metrics import calculate_metrics, ReturnStats
 
 
 def test_calculate_metrics_basic():
@@ -72,3 +72,17 @@ def test_calculate_metrics_empty_trades():
     assert metrics['total_trades'] == 0
     assert metrics['net_profit'] == 0
     assert metrics['win_rate'] == 0
+
+
+def test_return_stats_matches_pandas():
+    """Streaming daily-return stats agree with pct_change mean/std."""
+    closes = 10000 + np.cumsum(np.random.RandomState(3).randn(250) * 50)
+    stats = ReturnStats()
+    for close in closes:
+        stats.push_close(close)
+    
+    returns = pd.Series(closes).pct_change().dropna()
+    expected = returns.mean() / returns.std() * np.sqrt(252)
+    
+    assert stats.count == len(returns)
+    assert stats.sharpe() == pytest.approx(expected, rel=1e-9)
@@ -0,0 +1,53 @@
+"""Unit tests for the parameter optimizer."""
+import pytest
+
+from smc_engine.optimize.optimizer import Optimizer
+
+
+@pytest.fixture
+def make_optimizer(indexed_ohlc, seeded_signal_strategy):
+    """Build an Optimizer over seeded_signal_strategy and indexed_ohlc."""
+    def make(param_space, **kwargs):
+        return Optimizer(seeded_signal_strategy, param_space, indexed_ohlc, slippage=0.0, **kwargs)
+    return make
+
+
+def test_parallel_grid_search_matches_serial(make_optimizer):
+    """Grid search over worker processes scores trials like the serial loop."""
+    param_space = {'seed': {'type': 'categorical', 'choices': [0, 1, 2, 3]}}
+
+    results = [
+        make_optimizer(param_space, objective='net_profit').optimize(method='grid', n_jobs=n_jobs)
+        for n_jobs in (1, 2)
+    ]
+
+    serial, parallel = (r.all_trials.sort_values('trial') for r in results)
+    assert serial['score'].tolist() == parallel['score'].tolist()
+    assert results[0].best_params == results[1].best_params
+
+
+def test_repeated_trial_params_backtest_once(make_optimizer):
+    """Random search with repeats keeps every trial but scores each set once."""
+    optimizer = make_optimizer({'seed': {'type': 'int', 'low': 0, 'high': 3}})
+
+    result = optimizer.optimize(method='random', n_trials=20)
+
+    assert len(result.all_trials) == 20
+    assert len(optimizer._score_cache) == 4
+
+
+def test_pre_constraints_skip_backtest(make_optimizer, monkeypatch):
+    """Parameter sets failing a 'pre' constraint are penalized without a backtest."""
+    optimizer = make_optimizer(
+        {'seed': {'type': 'int', 'low': 0, 'high': 5}},
+        constraints={'pre': {'seed': {'max': 2}}}
+    )
+    backtested = []
+    run_params = optimizer._run_params
+    monkeypatch.setattr(optimizer, '_run_params', lambda p: backtested.append(p) or run_params(p))
+
+    result = optimizer.optimize(method='grid')
+
+    assert sorted(p['seed'] for p in backtested) == [0, 1, 2]
+    assert (result.all_trials['score'] == -1e10).sum() == 3
+    assert result.best_params['seed'] <= 2
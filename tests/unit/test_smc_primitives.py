@@ -9,12 +9,47 @@ from smc_engine.core.smc_primitives import (
     is_bos,
     detect_choch,
     find_order_blocks,
+    find_order_block_arrays,
     find_fvg,
+    find_fvg_arrays,
     detect_liquidity_grab,
-    calculate_atr
+    detect_liquidity_grab_arrays,
+    calculate_atr,
+    OrderBlockArray,
+    FairValueGapArray,
+    BULLISH,
+    BEARISH
 )
 
 
+def _read_only_atr(ohlc):
+    atr = calculate_atr(ohlc, period=14)
+    atr.to_numpy().flags.writeable = False
+    return atr
+
+
+# Session-scoped: pure functions of the shared read-only OHLC fixtures, so
+# computed once per run (or per pytest-xdist worker, even when a worker
+# interleaves tests from several modules) rather than per test
+
+@pytest.fixture(scope="session")
+def atr_sample(sample_ohlc):
+    """14-period ATR of sample_ohlc (read-only)."""
+    return _read_only_atr(sample_ohlc)
+
+
+@pytest.fixture(scope="session")
+def atr_trending(trending_ohlc):
+    """14-period ATR of trending_ohlc (read-only)."""
+    return _read_only_atr(trending_ohlc)
+
+
+@pytest.fixture(scope="session")
+def structure_trending(trending_ohlc):
+    """Market structure of trending_ohlc with a 10-bar lookback."""
+    return detect_market_structure(trending_ohlc, lookback=10)
+
+
 def test_calculate_atr(sample_ohlc):
     """Test ATR calculation."""
     atr = calculate_atr(sample_ohlc, period=14)
@@ -24,39 +59,32 @@ def test_calculate_atr(sample_ohlc):
     assert (atr >= 0).all()
 
 
-def test_detect_market_structure(trending_ohlc):
+def test_detect_market_structure(trending_ohlc, structure_trending):
     """Test market structure detection."""
-    structure = detect_market_structure(trending_ohlc, lookback=10)
-    
-    assert structure is not None
-    assert hasattr(structure, 'swing_highs')
-    assert hasattr(structure, 'swing_lows')
-    assert len(structure.swing_highs) > 0
-    assert len(structure.swing_lows) > 0
+    assert structure_trending is not None
+    assert hasattr(structure_trending, 'swing_highs')
+    assert hasattr(structure_trending, 'swing_lows')
+    assert len(structure_trending.swing_highs) > 0
+    assert len(structure_trending.swing_lows) > 0
     
-    # Check swing highs are actually local maxima
-    for idx, price in structure.swing_highs:
-        window_start = max(0, idx - 10)
-        window_end = min(len(trending_ohlc), idx + 11)
-        window_highs = trending_ohlc['high'].iloc[window_start:window_end]
-        assert price >= window_highs.max() * 0.9999  # Allow small floating point error
+    # Check swing highs are actually local maxima (of the centred 21-bar window)
+    window_max = trending_ohlc['high'].rolling(21, center=True, min_periods=1).max().to_numpy()
+    idx, price = np.array(structure_trending.swing_highs).T
+    assert (price >= window_max[idx.astype(int)] * 0.9999).all()  # Allow small floating point error
 
 
-def test_is_bos_bullish(trending_ohlc):
+def test_is_bos_bullish(trending_ohlc, structure_trending, atr_trending):
     """Test bullish Break of Structure detection."""
-    structure = detect_market_structure(trending_ohlc, lookback=10)
-    atr = calculate_atr(trending_ohlc, period=14)
-    
     # Find a point where price breaks above previous swing high
-    if len(structure.swing_highs) >= 2:
-        last_swing = structure.swing_highs[-2]
+    if len(structure_trending.swing_highs) >= 2:
+        last_swing = structure_trending.swing_highs[-2]
         
         # Check for BOS after the swing
         for i in range(last_swing[0] + 1, len(trending_ohlc)):
             bos = is_bos(
                 trending_ohlc.iloc[:i+1],
                 last_swing,
-                atr.iloc[i],
+                atr_trending.iloc[i],
                 direction='bullish',
                 atr_margin=0.5
             )
@@ -65,94 +93,86 @@ def test_is_bos_bullish(trending_ohlc):
                 break
 
 
-def test_find_order_blocks(trending_ohlc):
+def test_find_order_blocks(trending_ohlc, atr_trending):
     """Test order block detection."""
-    atr = calculate_atr(trending_ohlc, period=14)
-    
     params = {
         'min_impulse_bars': 3,
         'min_impulse_atr': 1.5,
         'ob_expansion_atr': 0.2
     }
     
-    order_blocks = find_order_blocks(trending_ohlc, atr, params)
+    order_blocks = find_order_block_arrays(trending_ohlc, params, atr=atr_trending.to_numpy())
     
-    assert isinstance(order_blocks, list)
+    assert isinstance(order_blocks, OrderBlockArray)
     
     # If order blocks found, validate structure
-    for ob in order_blocks:
-        assert ob.type in ['bullish', 'bearish']
-        assert ob.price_top >= ob.price_bottom
-        assert ob.start_idx < ob.end_idx
-        assert ob.strength > 0
+    assert np.isin(order_blocks.kind, (BULLISH, BEARISH)).all()
+    assert (order_blocks.price_top >= order_blocks.price_bottom).all()
+    assert (order_blocks.start_idx < order_blocks.end_idx).all()
+    assert (order_blocks.strength > 0).all()
 
 
-def test_find_fvg_imbalance(sample_ohlc):
+def test_find_fvg_imbalance(sample_ohlc, atr_sample):
     """Test Fair Value Gap detection using imbalance method."""
-    atr = calculate_atr(sample_ohlc, period=14)
-    
     params = {
         'method': 'imbalance',
         'min_gap_atr': 0.3,
         'expand_atr': 0.1
     }
     
-    fvgs = find_fvg(sample_ohlc, atr, params)
+    fvgs = find_fvg_arrays(sample_ohlc, params, atr=atr_sample.to_numpy())
     
-    assert isinstance(fvgs, list)
+    assert isinstance(fvgs, FairValueGapArray)
     
     # Validate FVG structure
-    for fvg in fvgs:
-        assert fvg.type in ['bullish', 'bearish']
-        assert fvg.top > fvg.bottom
-        assert 0 <= fvg.index < len(sample_ohlc)
+    assert np.isin(fvgs.kind, (BULLISH, BEARISH)).all()
+    assert (fvgs.gap_top > fvgs.gap_bottom).all()
+    assert ((fvgs.start_idx >= 0) & (fvgs.end_idx < len(sample_ohlc))).all()
 
 
-def test_find_fvg_wick(sample_ohlc):
+def test_find_fvg_wick(sample_ohlc, atr_sample):
     """Test Fair Value Gap detection using wick method."""
-    atr = calculate_atr(sample_ohlc, period=14)
-    
     params = {
         'method': 'wick',
         'min_gap_atr': 0.5,
         'expand_atr': 0.0
     }
     
-    fvgs = find_fvg(sample_ohlc, atr, params)
+    fvgs = find_fvg(sample_ohlc, atr_sample, params)
     
     assert isinstance(fvgs, list)
 
 
-def test_detect_liquidity_grab(trending_ohlc):
-    """Test liquidity grab detection."""
-    structure = detect_market_structure(trending_ohlc, lookback=10)
-    atr = calculate_atr(trending_ohlc, period=14)
-    
-    # Test at various points
-    for i in range(50, len(trending_ohlc)):
-        grab = detect_liquidity_grab(
-            trending_ohlc.iloc[:i+1],
-            structure.swing_highs + structure.swing_lows,
-            atr.iloc[i],
-            threshold_atr=1.0,
-            reclaim_bars=3
-        )
-        
-        # If grab detected, it should be boolean
-        assert isinstance(grab, bool)
+def test_detect_liquidity_grab(trending_ohlc, atr_trending):
+    """Test liquidity grab detection over the whole frame in one pass."""
+    # a shorter lookback than structure_trending, whose 10-bar swings are
+    # never swept by 1 ATR on this data
+    swings = detect_market_structure(trending_ohlc, lookback=5).swings
+    atr = atr_trending.to_numpy()
+    
+    grabs = detect_liquidity_grab_arrays(
+        trending_ohlc, swings, liquidity_grab_atr=1.0, grab_reclaim_bars=3, atr=atr
+    )
+    
+    # Each grab sweeps beyond an earlier swing and is reclaimed within 3 bars
+    assert len(grabs) > 0
+    assert np.all(grabs.grab_idx > grabs.swing_idx)
+    assert np.all((grabs.reclaim_bars >= 1) & (grabs.reclaim_bars <= 3))
+    swept_above = grabs.grab_price > grabs.swing_price
+    assert np.array_equal(swept_above, grabs.kind == BEARISH)
+    
+    assert grabs.to_dataclasses() == detect_liquidity_grab(trending_ohlc, swings, 1.0, 3, atr=atr)
 
 
-def test_order_block_serialization(trending_ohlc):
+def test_order_block_serialization(trending_ohlc, atr_trending):
     """Test order block to_dict serialization."""
-    atr = calculate_atr(trending_ohlc, period=14)
-    
     params = {
         'min_impulse_bars': 3,
         'min_impulse_atr': 1.5,
         'ob_expansion_atr': 0.2
     }
     
-    order_blocks = find_order_blocks(trending_ohlc, atr, params)
+    order_blocks = find_order_blocks(trending_ohlc, atr_trending, params)
     
     for ob in order_blocks:
         ob_dict = ob.to_dict()
@@ -163,17 +183,15 @@ def test_order_block_serialization(trending_ohlc):
         assert 'strength' in ob_dict
 
 
-def test_fvg_serialization(sample_ohlc):
+def test_fvg_serialization(sample_ohlc, atr_sample):
     """Test FVG to_dict serialization."""
-    atr = calculate_atr(sample_ohlc, period=14)
-    
     params = {
         'method': 'imbalance',
         'min_gap_atr': 0.3,
         'expand_atr': 0.1
     }
     
-    fvgs = find_fvg(sample_ohlc, atr, params)
+    fvgs = find_fvg(sample_ohlc, atr_sample, params)
     
     for fvg in fvgs:
         fvg_dict = fvg.to_dict()
@@ -181,3 +199,44 @@ def test_fvg_serialization(sample_ohlc):
         assert 'type' in fvg_dict
         assert 'top' in fvg_dict
         assert 'bottom' in fvg_dict
+
+
+def test_zone_arrays_match_dataclasses(trending_ohlc):
+    """Array containers hold the same zones as the dataclass lists."""
+    params = {'min_impulse_atr': 1.0, 'min_gap_atr': 0.1}
+
+    obs = find_order_block_arrays(trending_ohlc, params)
+    assert obs.to_dataclasses() == find_order_blocks(trending_ohlc, params)
+    assert np.all(np.diff(obs.end_idx) >= 0)
+
+    fvgs = find_fvg_arrays(trending_ohlc, params)
+    assert fvgs.to_dataclasses() == find_fvg(trending_ohlc, params)
+    assert len(fvgs) == len(fvgs.gap_top)
+
+
+@pytest.mark.parametrize('tz', [None, 'UTC'])
+def test_zone_arrays_to_dicts_match_to_dict(trending_ohlc, tz):
+    """Columnar to_dicts serializes like to_dict on each dataclass."""
+    ohlc = trending_ohlc.set_index('timestamp').tz_localize(tz)
+    params = {'min_impulse_atr': 1.0, 'min_gap_atr': 0.1}
+
+    for zones in (find_order_block_arrays(ohlc, params), find_fvg_arrays(ohlc, params)):
+        assert len(zones) > 0
+        assert zones.to_dicts() == [z.to_dict() for z in zones.to_dataclasses()]
+
+
+def test_calculate_atr_matches_pandas_ewm(sample_ohlc):
+    """Fused ATR pass reproduces the pandas TR + ewm reference, NaNs included."""
+    ohlc = sample_ohlc.copy()
+    ohlc.iloc[[3, 40], ohlc.columns.get_loc('high')] = np.nan
+    ohlc.iloc[41, ohlc.columns.get_loc('close')] = np.nan
+
+    prev_close = ohlc['close'].shift()
+    tr = pd.concat([
+        (ohlc['high'] - ohlc['low']).abs(),
+        (ohlc['high'] - prev_close).abs(),
+        (ohlc['low'] - prev_close).abs()
+    ], axis=1).max(axis=1)
+    expected = tr.ewm(span=14, adjust=False).mean()
+
+    pd.testing.assert_series_equal(calculate_atr(ohlc, period=14), expected, check_exact=True)
@@ -4,6 +4,12 @@ import pandas as pd
 from smc_engine.core.strategy import SMCStrategy
 
 
+@pytest.fixture(scope="session")
+def trending_signals(trending_ohlc, sample_params):
+    """SMC signals on trending_ohlc, generated once per run (per xdist worker)."""
+    return SMCStrategy(sample_params).generate_signals(trending_ohlc)
+
+
 def test_smc_strategy_initialization(sample_params):
     """Test SMC strategy initialization."""
     strategy = SMCStrategy(sample_params)
@@ -38,10 +44,9 @@ def test_smc_strategy_default_param_space():
     assert 'risk_per_trade' in param_space
 
 
-def test_generate_signals(trending_ohlc, sample_params):
+def test_generate_signals(trending_signals):
     """Test signal generation."""
-    strategy = SMCStrategy(sample_params)
-    signals = strategy.generate_signals(trending_ohlc)
+    signals = trending_signals
     
     assert isinstance(signals, pd.DataFrame)
     assert 'signal' in signals.columns
@@ -60,19 +65,32 @@ def test_generate_signals(trending_ohlc, sample_params):
         assert (buy_signals['tp'] > 0).all()
 
 
-def test_signal_logic_consistency(trending_ohlc, sample_params):
+def test_signal_logic_consistency(trending_signals):
     """Test that signals are logically consistent."""
-    strategy = SMCStrategy(sample_params)
-    signals = strategy.generate_signals(trending_ohlc)
+    signals = trending_signals
     
     # For buy signals, TP should be above entry and SL below
     buy_signals = signals[signals['signal'] == 'buy']
-    for _, signal in buy_signals.iterrows():
-        assert signal['tp'] > signal['price'], "TP should be above entry for buy"
-        assert signal['stop'] < signal['price'], "SL should be below entry for buy"
+    assert (buy_signals['tp'] > buy_signals['price']).all(), "TP should be above entry for buy"
+    assert (buy_signals['stop'] < buy_signals['price']).all(), "SL should be below entry for buy"
     
     # For sell signals, TP should be below entry and SL above
     sell_signals = signals[signals['signal'] == 'sell']
-    for _, signal in sell_signals.iterrows():
-        assert signal['tp'] < signal['price'], "TP should be below entry for sell"
-        assert signal['stop'] > signal['price'], "SL should be above entry for sell"
+    assert (sell_signals['tp'] < sell_signals['price']).all(), "TP should be below entry for sell"
+    assert (sell_signals['stop'] > sell_signals['price']).all(), "SL should be above entry for sell"
+
+
+def test_generate_signals_batch(sample_ohlc, sample_params):
+    """Batched generation matches one generate_signals call per parameter set."""
+    base = {**sample_params, 'lookback': 10, 'risk_reward': 2.0, 'atr_period': 14, 'min_gap_atr': 0.1}
+    params_list = [
+        {**base, 'liquidity_grab_atr': grab_atr, 'risk_reward': rr, 'use_fvg': use_fvg}
+        for grab_atr in (0.3, 1.0) for rr in (1.5, 3.0) for use_fvg in (True, False)
+    ]
+    
+    batch = SMCStrategy(base).generate_signals_batch(sample_ohlc, params_list)
+    
+    assert len(batch) == len(params_list)
+    assert sum(len(signals) for signals in batch) > 0
+    for params, signals in zip(params_list, batch):
+        pd.testing.assert_frame_equal(signals, SMCStrategy(params).generate_signals(sample_ohlc))